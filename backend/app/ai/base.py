@@ -2,14 +2,37 @@
 Base AI Client for GovConnect (Groq)
 
 Uses Groq for fast open-model inference with JSON validation.
+
+All calls go through the async Groq client so a slow completion never
+blocks the event loop. A semaphore bounds how many completions are in
+flight per worker and every call carries its own timeout.
+
+Parsed responses are cached by content hash (see app.services.llm_cache),
+so identical prompts are answered without a Groq round trip. Only replies
+that pass the caller's shape check are cached, so a malformed answer is
+asked again rather than replayed. Identical prompts that arrive while a
+call is already in flight share that call.
 """
 
+import asyncio
 import json
 import re
-from typing import Optional
-from groq import Groq
+from typing import Callable, Optional
+from groq import AsyncGroq
 
 from app.config import get_settings
+from app.services.llm_cache import get_llm_cache, get_ttl, make_cache_key
+from app.services.single_flight import SingleFlight
+
+
+SYSTEM_PROMPT = (
+    "You are a strict JSON generator. "
+    "You MUST return only valid JSON. "
+    "No markdown, no explanations, no extra text."
+)
+
+# Shared across client re-creation so coalescing survives key rotation
+_inflight = SingleFlight("llm")
 
 
 class AIClient:
@@ -20,46 +43,95 @@ class AIClient:
         self.api_key = getattr(settings, "groq_api_key", None)
 
         self.client = None
+        self.timeout = settings.llm_timeout_seconds
 
         if self.api_key:
-            self.client = Groq(api_key=self.api_key)
+            self.client = AsyncGroq(
+                api_key=self.api_key,
+                timeout=self.timeout,
+                max_retries=settings.llm_max_retries,
+            )
+
+        # Bounds concurrent upstream completions for this worker
+        self._semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
 
         # Default model (agent may upgrade after inspection)
         self.model_name = "llama-3.1-8b-instant"
+        self.temperature = 0.1
 
     @property
     def is_configured(self) -> bool:
         """Check if AI is properly configured."""
         return self.client is not None and bool(self.api_key)
 
-    async def generate(self, prompt: str) -> Optional[dict]:
+    async def generate(
+        self,
+        prompt: str,
+        timeout: Optional[float] = None,
+        cache_namespace: Optional[str] = None,
+        use_cache: bool = True,
+        validate: Optional[Callable[[dict], bool]] = None,
+    ) -> Optional[dict]:
         """
         Generate response from AI and parse as JSON.
 
-        Returns None if AI is not configured or fails.
+        Args:
+            prompt: Rendered user prompt
+            timeout: Per-call deadline in seconds (defaults to settings)
+            cache_namespace: Endpoint name, selects the cache TTL
+            use_cache: Set False to bypass the response cache
+            validate: Shape check the caller applies to the reply; only
+                JSON objects that pass it are cached
+
+        Returns None if AI is not configured, times out or fails.
+        Cancellation (e.g. the HTTP client disconnected) propagates
+        to the caller and aborts the upstream request.
         """
         if not self.is_configured:
             return None
 
+        cache = get_llm_cache() if use_cache else None
+        cache_key = make_cache_key(self.model_name, SYSTEM_PROMPT, prompt, self.temperature)
+
+        if cache is not None:
+            cached = await cache.get(cache_key)
+            if cached is not None and self._is_valid(cached, validate):
+                return cached
+
+        async def fetch() -> Optional[dict]:
+            result = await self._generate_uncached(prompt, timeout)
+
+            # Only replies the caller will accept are worth keeping
+            if cache is not None and self._is_valid(result, validate):
+                await cache.set(
+                    cache_key,
+                    result,
+                    ttl=get_ttl(cache_namespace),
+                    namespace=cache_namespace or "default",
+                )
+            return result
+
+        # Concurrent identical prompts share one upstream call
+        return await _inflight.do(cache_key, fetch)
+
+    @staticmethod
+    def _is_valid(result, validate: Optional[Callable[[dict], bool]]) -> bool:
+        """A JSON object that passes the caller's shape check (if any)."""
+        if not isinstance(result, dict):
+            return False
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a strict JSON generator. "
-                            "You MUST return only valid JSON. "
-                            "No markdown, no explanations, no extra text."
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                temperature=0.1,
-            )
+            return validate is None or bool(validate(result))
+        except Exception:
+            return False
+
+    async def _generate_uncached(self, prompt: str, timeout: Optional[float]) -> Optional[dict]:
+        """Call Groq under the concurrency limit and parse the JSON reply."""
+        try:
+            async with self._semaphore:
+                response = await asyncio.wait_for(
+                    self._complete(prompt),
+                    timeout=timeout or self.timeout,
+                )
 
             if response and response.choices:
                 text = response.choices[0].message.content
@@ -67,10 +139,31 @@ class AIClient:
 
             return None
 
+        except asyncio.TimeoutError:
+            print(f"[AI Error] Completion timed out after {timeout or self.timeout}s")
+            return None
+
         except Exception as e:
             print(f"[AI Error] {e}")
             return None
 
+    async def _complete(self, prompt: str):
+        """Send a single chat completion request to Groq."""
+        return await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT,
+                },
+                {
+                    "role": "user",
+                    "content": prompt,
+                },
+            ],
+            temperature=self.temperature,
+        )
+
     def _parse_json_response(self, text: str) -> Optional[dict]:
         """Extract and parse JSON from AI response."""
         try:
@@ -115,6 +208,11 @@ def get_ai_client() -> AIClient:
     return _ai_client
 
 
+def get_inflight_stats() -> dict:
+    """Single-flight counters for the health endpoint."""
+    return _inflight.stats()
+
+
 def reset_ai_client():
     """Reset the AI client to reinitialize with new settings."""
     global _ai_client
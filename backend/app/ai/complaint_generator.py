@@ -26,7 +26,10 @@ async def generate_complaint(
             description=description
         )
         
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="complaint",
+            validate=lambda r: isinstance(r.get("body"), str) and bool(r["body"].strip())
+        )
         
         if result:
             try:
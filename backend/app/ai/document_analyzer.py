@@ -2,14 +2,17 @@
 Smart Document Analyzer for GovConnect
 
 ORCHESTRATES:
-1. Cache lookup (for prebuilt documents)
+1. Cache lookup by content hash (prebuilt forms and uploads)
 2. Google Document AI (primary OCR)
-3. Local fallback (pdfplumber/PyPDF2)
+3. Local fallback (pdfplumber/PyPDF2 for PDFs, Tesseract for images)
+4. Field extraction (AcroForm, Document AI form fields, layout) so
+   callers get structured fields and paragraphs, not just text
 
-CRITICAL CACHING RULE:
-- ONLY Google Document AI results are cached
-- Local fallback results are NEVER cached
+CACHING RULE:
+- Google Document AI results are cached long-term
+- Local fallback results are cached only briefly (separate tier)
 """
+import asyncio
 from typing import Optional
 from pathlib import Path
 
@@ -18,8 +21,16 @@ from app.ai.ocr_cache_manager import (
     save_cached_ocr,
     get_document_id
 )
-from app.ai.google_document_ai import extract_text_from_document
-from app.ai.local_ocr_fallback import extract_text_locally
+from app.ai.google_document_ai import get_google_ai, process_document_with_google
+from app.ai.local_ocr_fallback import DocumentSource, extract_text_locally, read_document_bytes
+from app.ai.form_field_extractor import (
+    extract_form_structure,
+    extract_structure_from_text,
+    extract_structure_google,
+    merge_structures
+)
+from app.ai.image_ocr import extract_text_from_image, is_image, prepare_image
+from app.services.form_artifacts import split_paragraphs
 
 
 class DocumentAnalyzer:
@@ -38,90 +49,121 @@ class DocumentAnalyzer:
     
     async def analyze_document(
         self, 
-        file_bytes: bytes, 
+        file_bytes: DocumentSource, 
         file_type: str = "application/pdf",
         is_prebuilt: bool = False,
-        file_path: Optional[str] = None
+        file_path: Optional[str] = None,
+        document_id: Optional[str] = None
     ) -> dict:
         """
-        Analyze a document and extract text.
-        
-        FLOW FOR PREBUILT DOCUMENTS:
-        1. Check cache first
-        2. Try Google OCR (cache result)
-        3. Fallback to local (NO caching)
+        Analyze a document and extract text, fields and paragraphs.
         
-        FLOW FOR UPLOADS:
-        1. Try Google OCR (no permanent caching)
-        2. Fallback to local
+        FLOW (prebuilt forms and uploads alike):
+        1. Cache lookup by content hash - a Google result is returned as-is
+        2. Try Google OCR (cached long-term)
+        3. Reuse a cached local result if there is one
+        4. Fallback to local extraction (cached briefly)
         
         Args:
-            file_bytes: Document content
-            file_type: MIME type (currently only PDF supported)
-            is_prebuilt: Whether this is a prebuilt document (cacheable)
-            file_path: Path to prebuilt document (for cache ID)
+            file_bytes: Document content, or the path of a spooled upload
+            file_type: MIME type of the document
+            is_prebuilt: Whether this is a bundled form (kept in the OCR cache longer)
+            file_path: Path of the bundled form (for logging only)
+            document_id: SHA-256 of the content, if already computed while streaming
             
         Returns:
-            Dictionary with extracted text and metadata
+            Dictionary with extracted text, "fields", "paragraphs" and metadata
         """
-        # For prebuilt documents, try cache first
-        if is_prebuilt and file_path:
-            document_id = get_document_id(file_path)
-            
-            # Check cache
-            cached_text = get_cached_ocr(document_id)
-            if cached_text:
-                print(f"[Document Analyzer] Using cached text for {file_path}")
-                return {
-                    "success": True,
-                    "text": cached_text,
-                    "source": "cache",
-                    "page_count": len(cached_text.split('\n\n'))  # Rough estimate
-                }
+        if document_id is None:
+            document_id = get_document_id(read_document_bytes(file_bytes))
+        label = file_path or document_id[:12]
+        
+        # Check cache
+        cached = await get_cached_ocr(document_id)
+        if cached and cached["source"] == "google":
+            print(f"[Document Analyzer] Using cached text for {label}")
+            structure = cached["structure"] or await extract_form_structure(file_bytes, file_type)
+            return self._text_result(cached["text"], "cache", structure)
+        
+        # Photos are oriented and downscaled once, for Google and Tesseract alike
+        google_ai = get_google_ai()
+        image_bytes = None
+        if is_image(file_type) and (google_ai.is_configured or not cached):
+            try:
+                image_bytes, file_type = await prepare_image(file_bytes)
+            except Exception as e:
+                print(f"[Document Analyzer] Could not read image: {e}")
+                return self._failed_result("Unable to read image")
         
         # Try Google Document AI
-        google_text, google_success = await extract_text_from_document(file_bytes)
+        document = None
+        if google_ai.is_configured:
+            content = image_bytes if image_bytes is not None else read_document_bytes(file_bytes)
+            document = await process_document_with_google(content, file_type)
         
-        if google_success and google_text:
+        if document is not None:
             print("[Document Analyzer] Google OCR successful")
-            
-            # Cache ONLY if prebuilt document
-            if is_prebuilt and file_path:
-                document_id = get_document_id(file_path)
-                save_cached_ocr(document_id, google_text, source="google")
-            
-            return {
-                "success": True,
-                "text": google_text,
-                "source": "google",
-                "page_count": len(google_text.split('\n\n'))
-            }
-        
-        # Fallback to local extraction
-        print("[Document Analyzer] Falling back to local OCR")
-        local_text = await extract_text_locally(file_bytes)
+            structure = extract_structure_google(document)
+            if not structure["fields"]:
+                # Plain OCR processor (not the form parser): take fields from the PDF itself
+                structure = merge_structures(structure, await extract_form_structure(file_bytes, file_type))
+            await save_cached_ocr(
+                document_id, document.text, source="google", structure=structure, is_prebuilt=is_prebuilt
+            )
+            return self._text_result(document.text, "google", structure)
         
-        # CRITICAL: NEVER cache local results
-        # Even for prebuilt documents, local results are too low quality
+        # Local results are low quality: reuse a recent one, never keep it long
+        if cached:
+            print(f"[Document Analyzer] Using cached local text for {label}")
+            local_text = cached["text"]
+            structure = cached["structure"] or await extract_form_structure(file_bytes, file_type)
+        else:
+            print("[Document Analyzer] Falling back to local OCR")
+            if image_bytes is not None:
+                local_text = await extract_text_from_image(image_bytes)
+                structure = extract_structure_from_text(local_text)
+            else:
+                local_text, structure = await asyncio.gather(
+                    extract_text_locally(file_bytes),
+                    extract_form_structure(file_bytes, file_type)
+                )
+            if local_text:
+                await save_cached_ocr(
+                    document_id, local_text, source="local", structure=structure, is_prebuilt=is_prebuilt
+                )
         
         if local_text:
             print(f"[Document Analyzer] Local OCR extracted {len(local_text)} chars")
-            return {
-                "success": True,
-                "text": local_text,
-                "source": "local",
-                "warning": "Low confidence extraction - Google Document AI recommended",
-                "page_count": len(local_text.split('\n\n'))
-            }
+            result = self._text_result(local_text, "local", structure)
+            result["warning"] = "Low confidence extraction - Google Document AI recommended"
+            return result
         
         # No text extracted
         print("[Document Analyzer] No text could be extracted")
+        return self._failed_result("Unable to extract text from document")
+    
+    @staticmethod
+    def _failed_result(error: str) -> dict:
         return {
             "success": False,
             "text": "",
             "source": "none",
-            "error": "Unable to extract text from document",
-            "page_count": 0
+            "error": error,
+            "page_count": 0,
+            "fields": [],
+            "paragraphs": []
+        }
+    
+    @staticmethod
+    def _text_result(text: str, source: str, structure: dict) -> dict:
+        return {
+            "success": True,
+            "text": text,
+            "source": source,
+            "page_count": len(text.split('\n\n')),  # Rough estimate
+            "fields": structure["fields"],
+            # Scanned documents have no layout paragraphs; fall back to the text
+            "paragraphs": structure["paragraphs"] or split_paragraphs(text)
         }
     
     async def analyze_document_legacy(self, file_bytes: bytes) -> dict:
@@ -136,8 +178,8 @@ class DocumentAnalyzer:
         # Transform to legacy format
         return {
             "success": result["success"],
-            "fields": [],  # Legacy format had field extraction
-            "paragraphs": [result["text"]] if result["text"] else [],
+            "fields": result["fields"],
+            "paragraphs": result["paragraphs"],
             "tables": [],
             "page_count": result.get("page_count", 0)
         }
@@ -35,7 +35,9 @@ async def analyze_form(
             purpose=purpose
         ) + "\n\nIMPORTANT: Please provide at least 8 distinct fields to fill, ensuring a comprehensive guide."
         
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="form_analysis", validate=_has_fields_to_fill
+        )
         
         if result:
             try:
@@ -125,7 +127,9 @@ IMPORTANT:
 4. Ensure the guidance is specific to the user's purpose: "{purpose}".
 """
 
-    result = await ai_client.generate(prompt)
+    result = await ai_client.generate(
+        prompt, cache_namespace="form_analysis", validate=_has_fields_to_fill
+    )
     
     if result:
         try:
@@ -159,68 +163,77 @@ IMPORTANT:
     )
 
 
+def _has_fields_to_fill(result: dict) -> bool:
+    """A guidance reply with a list of fields (either key spelling)."""
+    return isinstance(result.get("fieldsToFill", result.get("fields_to_fill")), list)
+
+
+# Template guidance for common form types (also the source strings for the
+# offline translation glossary, see app/services/glossary.py)
+FORM_TEMPLATES = {
+    "income-certificate": {
+        "formType": "Income Certificate Application",
+        "fieldsToFill": [
+            {"fieldName": "Applicant Name", "instruction": "Enter full name as per Aadhaar card", "example": "Rajesh Kumar"},
+            {"fieldName": "Father's Name", "instruction": "Enter father's full name", "example": "Suresh Kumar"},
+            {"fieldName": "Address", "instruction": "Enter complete residential address with PIN code", "example": "123 Main Street, Delhi 110001"},
+            {"fieldName": "Annual Income", "instruction": "Enter total family income from all sources", "example": "₹2,50,000"},
+            {"fieldName": "Source of Income", "instruction": "Mention primary income source", "example": "Agriculture/Salary/Business"},
+        ],
+        "requiredDocuments": ["Aadhaar Card", "Ration Card", "Salary Slip or Income Proof", "Passport Size Photographs"],
+        "warnings": ["Income declared must match with ITR if filed", "Certificate validity is typically 6 months to 1 year"]
+    },
+    "caste-certificate": {
+        "formType": "Caste Certificate Application",
+        "fieldsToFill": [
+            {"fieldName": "Applicant Name", "instruction": "Enter full name as per school records", "example": "Priya Sharma"},
+            {"fieldName": "Caste", "instruction": "Enter your caste/community name", "example": "As per official list"},
+            {"fieldName": "Address", "instruction": "Enter permanent residential address", "example": "Village/Town, District, State"},
+        ],
+        "requiredDocuments": ["Aadhaar Card", "Father's Caste Certificate (if available)", "School Leaving Certificate", "Ration Card"],
+        "warnings": ["Self-declaration may require affidavit", "Verification may take 15-30 days"]
+    },
+    "birth-certificate": {
+        "formType": "Birth Certificate Application",
+        "fieldsToFill": [
+            {"fieldName": "Child's Name", "instruction": "Enter the name to be recorded", "example": "Baby's Full Name"},
+            {"fieldName": "Date of Birth", "instruction": "Enter in DD/MM/YYYY format", "example": "15/08/2024"},
+            {"fieldName": "Place of Birth", "instruction": "Hospital name or home address", "example": "Gandhi Hospital, Hyderabad"},
+            {"fieldName": "Father's Name", "instruction": "Enter father's full name", "example": "Father's Full Name"},
+            {"fieldName": "Mother's Name", "instruction": "Enter mother's full name", "example": "Mother's Full Name"},
+        ],
+        "requiredDocuments": ["Hospital Discharge Summary", "Parents' Aadhaar Cards", "Marriage Certificate"],
+        "warnings": ["Must be registered within 21 days of birth for free", "Late registration may require affidavit"]
+    },
+    "default": {
+        "formType": "Government Form",
+        "fieldsToFill": [
+            {"fieldName": "Full Name", "instruction": "Enter name as per government ID", "example": "John Doe"},
+            {"fieldName": "Date of Birth", "instruction": "Enter in DD/MM/YYYY format", "example": "15/08/1990"},
+            {"fieldName": "Address", "instruction": "Enter complete address with PIN code", "example": "Address, City, State - PIN"},
+        ],
+        "requiredDocuments": ["Identity Proof (Aadhaar/PAN/Voter ID)", "Address Proof", "Passport Size Photographs"],
+        "warnings": ["Ensure all documents are self-attested", "Check official website for latest form version"]
+    }
+}
+
+
 def _get_template_guidance(form_type: Optional[str], purpose: str) -> FormAnalysisResponse:
     """Provide template-based form guidance for common form types."""
-    
-    templates = {
-        "income-certificate": {
-            "formType": "Income Certificate Application",
-            "fieldsToFill": [
-                {"fieldName": "Applicant Name", "instruction": "Enter full name as per Aadhaar card", "example": "Rajesh Kumar"},
-                {"fieldName": "Father's Name", "instruction": "Enter father's full name", "example": "Suresh Kumar"},
-                {"fieldName": "Address", "instruction": "Enter complete residential address with PIN code", "example": "123 Main Street, Delhi 110001"},
-                {"fieldName": "Annual Income", "instruction": "Enter total family income from all sources", "example": "₹2,50,000"},
-                {"fieldName": "Source of Income", "instruction": "Mention primary income source", "example": "Agriculture/Salary/Business"},
-            ],
-            "requiredDocuments": ["Aadhaar Card", "Ration Card", "Salary Slip or Income Proof", "Passport Size Photographs"],
-            "warnings": ["Income declared must match with ITR if filed", "Certificate validity is typically 6 months to 1 year"]
-        },
-        "caste-certificate": {
-            "formType": "Caste Certificate Application",
-            "fieldsToFill": [
-                {"fieldName": "Applicant Name", "instruction": "Enter full name as per school records", "example": "Priya Sharma"},
-                {"fieldName": "Caste", "instruction": "Enter your caste/community name", "example": "As per official list"},
-                {"fieldName": "Address", "instruction": "Enter permanent residential address", "example": "Village/Town, District, State"},
-            ],
-            "requiredDocuments": ["Aadhaar Card", "Father's Caste Certificate (if available)", "School Leaving Certificate", "Ration Card"],
-            "warnings": ["Self-declaration may require affidavit", "Verification may take 15-30 days"]
-        },
-        "birth-certificate": {
-            "formType": "Birth Certificate Application",
-            "fieldsToFill": [
-                {"fieldName": "Child's Name", "instruction": "Enter the name to be recorded", "example": "Baby's Full Name"},
-                {"fieldName": "Date of Birth", "instruction": "Enter in DD/MM/YYYY format", "example": "15/08/2024"},
-                {"fieldName": "Place of Birth", "instruction": "Hospital name or home address", "example": "Gandhi Hospital, Hyderabad"},
-                {"fieldName": "Father's Name", "instruction": "Enter father's full name", "example": "Father's Full Name"},
-                {"fieldName": "Mother's Name", "instruction": "Enter mother's full name", "example": "Mother's Full Name"},
-            ],
-            "requiredDocuments": ["Hospital Discharge Summary", "Parents' Aadhaar Cards", "Marriage Certificate"],
-            "warnings": ["Must be registered within 21 days of birth for free", "Late registration may require affidavit"]
-        },
-        "default": {
-            "formType": form_type or "Government Form",
-            "fieldsToFill": [
-                {"fieldName": "Full Name", "instruction": "Enter name as per government ID", "example": "John Doe"},
-                {"fieldName": "Date of Birth", "instruction": "Enter in DD/MM/YYYY format", "example": "15/08/1990"},
-                {"fieldName": "Address", "instruction": "Enter complete address with PIN code", "example": "Address, City, State - PIN"},
-            ],
-            "requiredDocuments": ["Identity Proof (Aadhaar/PAN/Voter ID)", "Address Proof", "Passport Size Photographs"],
-            "warnings": ["Ensure all documents are self-attested", "Check official website for latest form version"]
-        }
-    }
-    
     # Get template or default
     form_key = form_type.lower().replace(" ", "-") if form_type else "default"
     # Try to find a matching template
-    template = templates.get(form_key)
+    template = FORM_TEMPLATES.get(form_key)
     if not template:
         # Try partial match
-        for key in templates.keys():
+        for key in FORM_TEMPLATES.keys():
             if key in form_key or form_key in key:
-                template = templates[key]
+                template = FORM_TEMPLATES[key]
                 break
     if not template:
-        template = templates["default"]
+        template = FORM_TEMPLATES["default"]
+    if template is FORM_TEMPLATES["default"]:
+        template = {**template, "formType": form_type or "Government Form"}
     
     return FormAnalysisResponse(
         formType=template["formType"],
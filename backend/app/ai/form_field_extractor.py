@@ -0,0 +1,265 @@
+"""
+Form Field Extractor for GovConnect
+
+Turns a document into the structured input analyze_with_extracted_fields
+expects, instead of handing the AI raw text:
+
+    {"fields": [{"name", "value", "type", "page", "source"}],
+     "paragraphs": ["instruction text", ...]}
+
+Sources, best first:
+1. AcroForm widgets (fillable PDFs) - exact names and current values
+2. Google Document AI form parser - key/value pairs from OCR
+3. pdfplumber word positions - "Label : value" lines and fill-in blanks
+   (----- / _____ / .....) in the text layer
+4. Plain OCR text of images (Tesseract) - the same line heuristics
+
+Local extraction is CPU-bound and runs in the shared OCR process pool.
+"""
+import asyncio
+import re
+from typing import Dict, List
+
+import pdfplumber
+import PyPDF2
+
+from app.config import get_settings
+from app.ai.local_ocr_fallback import DocumentSource, open_document, run_in_ocr_pool
+
+
+MAX_FIELDS = 60
+MAX_PARAGRAPHS = 30
+MAX_LABEL_WORDS = 12
+
+# Leading numbering such as "1.", "12.(a)", "b)", "(iii)"
+_NUMBERING_RE = re.compile(r"^\s*(?:\d+\s*[.)]\s*)?(?:\(?[a-zivx]{1,4}\)\s*)?", re.IGNORECASE)
+# Fill-in blanks: runs of dashes, underscores, dots or ellipses
+_BLANK_RE = re.compile(r"(?:[-_.…]\s?){5,}")
+_ACROFORM_TYPES = {"/Tx": "text", "/Btn": "checkbox", "/Ch": "choice", "/Sig": "signature"}
+
+
+def empty_structure() -> dict:
+    return {"fields": [], "paragraphs": []}
+
+
+async def extract_form_structure(file_bytes: DocumentSource, mime_type: str = "application/pdf") -> dict:
+    """Extract fields and paragraphs locally, in the OCR process pool."""
+    if mime_type != "application/pdf":
+        return empty_structure()
+
+    settings = get_settings()
+    try:
+        return await run_in_ocr_pool(
+            extract_structure_local, file_bytes, settings.local_ocr_max_pages,
+            timeout=settings.local_ocr_timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        print("[Field Extractor] Local extraction timed out")
+    except Exception as e:
+        print(f"[Field Extractor] Local extraction failed: {e}")
+    return empty_structure()
+
+
+def extract_structure_google(document) -> dict:
+    """Fields and paragraphs from a Document AI document (form parser output)."""
+    text = document.text or ""
+
+    def anchor_text(layout) -> str:
+        segments = layout.text_anchor.text_segments if layout and layout.text_anchor else []
+        return " ".join(
+            text[int(seg.start_index):int(seg.end_index)] for seg in segments
+        ).strip()
+
+    fields = []
+    paragraphs = []
+    for page_number, page in enumerate(document.pages, 1):
+        for form_field in page.form_fields:
+            name = _clean_label(anchor_text(form_field.field_name.layout))
+            if name:
+                fields.append({
+                    "name": name,
+                    "value": " ".join(anchor_text(form_field.field_value.layout).split()),
+                    "type": "checkbox" if "checkbox" in (form_field.value_type or "") else "text",
+                    "page": page_number,
+                    "source": "google",
+                })
+        for paragraph in page.paragraphs:
+            paragraphs.append(" ".join(anchor_text(paragraph.layout).split()))
+
+    return {
+        "fields": _dedupe_fields(fields),
+        "paragraphs": _clean_paragraphs(paragraphs),
+    }
+
+
+def extract_structure_from_text(text: str) -> dict:
+    """Fields and paragraphs from plain OCR text (no layout), e.g. Tesseract output."""
+    fields = []
+    paragraphs = []
+    current: List[str] = []
+
+    for line in text.splitlines() + [""]:
+        line = line.strip()
+        line_fields = _fields_in_line(line, 1) if line else []
+        if line_fields:
+            fields.extend(line_fields)
+        elif line:
+            current.append(line)
+            continue
+        # Blank lines and field lines end the current paragraph
+        if current:
+            paragraphs.append(" ".join(current))
+            current = []
+
+    return {
+        "fields": _dedupe_fields(fields),
+        "paragraphs": _clean_paragraphs(paragraphs),
+    }
+
+
+def merge_structures(primary: dict, secondary: dict) -> dict:
+    """Combine two extractions; fields from primary win on name clashes."""
+    return {
+        "fields": _dedupe_fields(primary.get("fields", []) + secondary.get("fields", [])),
+        "paragraphs": primary.get("paragraphs") or secondary.get("paragraphs", []),
+    }
+
+
+# -------------------------------------------------------------------
+# Worker function (runs in the process pool, must stay module-level)
+# -------------------------------------------------------------------
+
+def extract_structure_local(file_bytes: DocumentSource, max_pages: int = 50) -> dict:
+    """AcroForm widgets plus layout-based fields and paragraphs."""
+    fields = _acroform_fields(file_bytes)
+    layout_fields = []
+    paragraphs = []
+
+    with open_document(file_bytes) as file_obj, pdfplumber.open(file_obj) as pdf:
+        for page_number, page in enumerate(pdf.pages[:max_pages], 1):
+            page_fields, page_paragraphs = _layout_structure(page, page_number)
+            layout_fields.extend(page_fields)
+            paragraphs.extend(page_paragraphs)
+            page.flush_cache()
+
+    return {
+        "fields": _dedupe_fields(fields + layout_fields),
+        "paragraphs": _clean_paragraphs(paragraphs),
+    }
+
+
+def _acroform_fields(file_bytes: DocumentSource) -> List[dict]:
+    try:
+        with open_document(file_bytes) as file_obj:
+            raw_fields = PyPDF2.PdfReader(file_obj).get_fields() or {}
+    except Exception:
+        return []
+
+    fields = []
+    for name, spec in raw_fields.items():
+        value = spec.get("/V")
+        label = spec.get("/TU") or name  # /TU is the human-readable tooltip
+        fields.append({
+            "name": _clean_label(str(label)) or str(name),
+            "value": "" if value is None else str(value).lstrip("/"),
+            "type": _ACROFORM_TYPES.get(spec.get("/FT"), "text"),
+            "page": None,
+            "source": "acroform",
+        })
+    return fields
+
+
+def _layout_structure(page, page_number: int):
+    """Split one page's text lines into labelled fields and paragraph text."""
+    fields = []
+    paragraph_lines = []
+    previous_bottom = None
+    current: List[str] = []
+
+    for line in page.extract_text_lines(return_chars=False):
+        text = line["text"].strip()
+        if not text:
+            continue
+
+        line_fields = _fields_in_line(text, page_number)
+        if line_fields:
+            fields.extend(line_fields)
+        else:
+            # A vertical gap larger than a line height starts a new paragraph
+            height = line["bottom"] - line["top"]
+            if previous_bottom is not None and line["top"] - previous_bottom > height and current:
+                paragraph_lines.append(" ".join(current))
+                current = []
+            current.append(text)
+        previous_bottom = line["bottom"]
+
+    if current:
+        paragraph_lines.append(" ".join(current))
+    return fields, paragraph_lines
+
+
+def _fields_in_line(text: str, page_number: int) -> List[dict]:
+    """'Name : value', 'a) Father's Name : b) Mother's Name :' and 'S/o -------'."""
+    fields = []
+
+    if ":" in text:
+        parts = text.split(":")
+        for i, label in enumerate(parts[:-1]):
+            # The value of one label may carry the next label ("x b) Mother's Name")
+            if i + 1 < len(parts) - 1:
+                value = ""
+            else:
+                value = parts[-1]
+            name = _clean_label(label)
+            if name:
+                fields.append(_layout_field(name, value, page_number))
+        if fields:
+            return fields
+
+    for match in _BLANK_RE.finditer(text):
+        words = text[:match.start()].split()[-MAX_LABEL_WORDS:]
+        name = _clean_label(" ".join(words))
+        if name:
+            fields.append(_layout_field(name, "", page_number))
+    return fields
+
+
+def _layout_field(name: str, value: str, page_number: int) -> dict:
+    value = _BLANK_RE.sub("", value).strip(" -_.")
+    return {"name": name, "value": value, "type": "text", "page": page_number, "source": "layout"}
+
+
+def _clean_label(label: str) -> str:
+    """Strip numbering, blanks and punctuation; reject things that aren't labels."""
+    label = _BLANK_RE.sub(" ", label)
+    label = _NUMBERING_RE.sub("", label)
+    label = " ".join(label.split()).strip(" -_.,;:")
+    words = label.split()
+    if not words or len(words) > MAX_LABEL_WORDS or not re.search(r"[A-Za-z]{2,}", label):
+        return ""
+    return label
+
+
+def _dedupe_fields(fields: List[dict]) -> List[dict]:
+    seen: Dict[str, dict] = {}
+    for field in fields:
+        key = field["name"].lower()
+        if key not in seen:
+            seen[key] = field
+        if len(seen) >= MAX_FIELDS:
+            break
+    return list(seen.values())
+
+
+def _clean_paragraphs(paragraphs: List[str]) -> List[str]:
+    cleaned = []
+    seen = set()
+    for paragraph in paragraphs:
+        paragraph = " ".join(_BLANK_RE.sub(" ", paragraph).split())
+        if len(paragraph) < 3 or paragraph in seen:
+            continue
+        seen.add(paragraph)
+        cleaned.append(paragraph)
+        if len(cleaned) >= MAX_PARAGRAPHS:
+            break
+    return cleaned
@@ -3,7 +3,13 @@ Google Document AI Integration for GovConnect
 
 Primary OCR service with high-quality text extraction.
 Only Google results are cached permanently.
+
+One async client (gRPC channel + credentials) is created per worker
+process and reused for every request. Calls are bounded by a semaphore,
+have a deadline, and transient errors are retried with backoff.
 """
+import asyncio
+import random
 from typing import Optional, Tuple
 from app.config import get_settings
 
@@ -12,9 +18,19 @@ from app.config import get_settings
 try:
     from google.cloud import documentai_v1 as documentai
     from google.api_core.client_options import ClientOptions
+    from google.api_core import exceptions as google_exceptions
     GOOGLE_AVAILABLE = True
+    # Errors worth retrying: throttling, timeouts and server hiccups
+    RETRYABLE_ERRORS = (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.InternalServerError,
+        google_exceptions.Aborted,
+    )
 except ImportError:
     GOOGLE_AVAILABLE = False
+    RETRYABLE_ERRORS = ()
     print("[Google OCR] google-cloud-documentai not installed, Google OCR disabled")
 
 
@@ -25,13 +41,16 @@ class GoogleDocumentAI:
         self.settings = get_settings()
         self.client = None
         self.processor_name = None
+        self._semaphore = asyncio.Semaphore(self.settings.google_ocr_max_concurrency)
         
-        # Only initialize if configured
+        # Only resolve the processor if configured; the gRPC client itself
+        # is created on first use, inside the running event loop
         if self._is_configured():
-            try:
-                self._initialize_client()
-            except Exception as e:
-                print(f"[Google OCR] Initialization failed: {e}")
+            self.processor_name = documentai.DocumentProcessorServiceAsyncClient.processor_path(
+                self.settings.google_project_id,
+                self.settings.google_location,
+                self.settings.google_processor_id
+            )
     
     def _is_configured(self) -> bool:
         """Check if Google Document AI is configured."""
@@ -45,74 +64,108 @@ class GoogleDocumentAI:
         )
     
     def _initialize_client(self):
-        """Initialize Google Document AI client."""
+        """Initialize the async Google Document AI client (once per process)."""
         opts = ClientOptions(
             api_endpoint=f"{self.settings.google_location}-documentai.googleapis.com"
         )
         
-        self.client = documentai.DocumentProcessorServiceClient(client_options=opts)
-        
-        self.processor_name = self.client.processor_path(
-            self.settings.google_project_id,
-            self.settings.google_location,
-            self.settings.google_processor_id
-        )
+        self.client = documentai.DocumentProcessorServiceAsyncClient(client_options=opts)
         
         print(f"[Google OCR] Initialized for project {self.settings.google_project_id}")
     
     @property
     def is_configured(self) -> bool:
         """Check if client is ready."""
-        return self.client is not None and self.processor_name is not None
+        return self.processor_name is not None
+    
+    async def process(self, file_bytes: bytes, mime_type: str = "application/pdf"):
+        """
+        Run one ProcessDocument call with concurrency limit, deadline and
+        retries. Returns the Document AI document.
+        """
+        if self.client is None:
+            self._initialize_client()
+        
+        request = documentai.ProcessRequest(
+            name=self.processor_name,
+            raw_document=documentai.RawDocument(content=file_bytes, mime_type=mime_type)
+        )
+        
+        attempts = self.settings.google_ocr_max_retries + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                async with self._semaphore:
+                    result = await self.client.process_document(
+                        request=request,
+                        timeout=self.settings.google_ocr_timeout_seconds
+                    )
+                return result.document
+            except RETRYABLE_ERRORS as e:
+                if attempt == attempts:
+                    raise
+                # Exponential backoff with jitter: ~0.5s, 1s, 2s ...
+                delay = 0.5 * (2 ** (attempt - 1)) * (0.5 + random.random())
+                print(f"[Google OCR] {type(e).__name__}, retrying in {delay:.1f}s ({attempt}/{attempts - 1})")
+                await asyncio.sleep(delay)
+    
+    async def close(self):
+        """Close the gRPC channel (called at shutdown)."""
+        if self.client is not None:
+            await self.client.transport.close()
+            self.client = None
 
 
-async def extract_text_from_document(file_bytes: bytes) -> Tuple[str, bool]:
+async def process_document_with_google(
+    file_bytes: bytes,
+    mime_type: str = "application/pdf"
+):
     """
-    Extract text using Google Document AI.
-    
-    Args:
-        file_bytes: Document content as bytes
-        
-    Returns:
-        Tuple of (extracted_text, success_flag)
-        - If successful: (text, True)
-        - If failed: ("", False)
+    Run Google Document AI and return the full document (text, pages,
+    form fields, paragraphs), or None if it failed or found no text.
     """
-    google_ai = GoogleDocumentAI()
+    google_ai = get_google_ai()
     
     if not google_ai.is_configured:
         print("[Google OCR] Not configured, cannot extract")
-        return "", False
+        return None
     
     try:
-        # Prepare request
-        raw_document = documentai.RawDocument(
-            content=file_bytes,
-            mime_type="application/pdf"
-        )
-        
-        request = documentai.ProcessRequest(
-            name=google_ai.processor_name,
-            raw_document=raw_document
-        )
-        
         # Process document
         print("[Google OCR] Sending document to Google Document AI")
-        result = google_ai.client.process_document(request=request)
-        
-        # Extract text
-        text = result.document.text
+        document = await google_ai.process(file_bytes, mime_type)
         
-        if text and len(text.strip()) > 10:
-            print(f"[Google OCR] Successfully extracted {len(text)} chars")
-            return text, True
+        if document.text and len(document.text.strip()) > 10:
+            print(f"[Google OCR] Successfully extracted {len(document.text)} chars")
+            return document
         else:
             print("[Google OCR] No meaningful text extracted")
-            return "", False
+            return None
     
     except Exception as e:
         print(f"[Google OCR] Extraction failed: {e}")
+        return None
+
+
+async def extract_text_from_document(
+    file_bytes: bytes,
+    mime_type: str = "application/pdf"
+) -> Tuple[str, bool]:
+    """
+    Extract text using Google Document AI.
+    
+    Args:
+        file_bytes: Document content as bytes
+        mime_type: MIME type of the document
+        
+    Returns:
+        Tuple of (extracted_text, success_flag)
+        - If successful: (text, True)
+        - If failed: ("", False)
+    """
+    document = await process_document_with_google(file_bytes, mime_type)
+    if document is None:
         return "", False
+    return document.text, True
 
 
 # Global instance (lazy initialization)
@@ -125,3 +178,9 @@ def get_google_ai() -> GoogleDocumentAI:
     if _google_ai is None:
         _google_ai = GoogleDocumentAI()
     return _google_ai
+
+
+async def close_google_ai():
+    """Release the shared client, if one was created."""
+    if _google_ai is not None:
+        await _google_ai.close()
@@ -0,0 +1,130 @@
+"""
+Image OCR for GovConnect
+
+Photographed or scanned forms (JPG/PNG) go through their own pipeline
+instead of being treated as PDFs:
+1. Normalize: apply the EXIF orientation, convert to grayscale and
+   downscale to IMAGE_OCR_TARGET_DPI for an A4 page; phone photos are
+   usually far larger than OCR needs, so Document AI gets fewer bytes
+   and the local engine spends less CPU
+2. Google Document AI with the real image MIME type
+3. Local fallback: Tesseract (pytesseract), when installed
+
+Normalizing and Tesseract are CPU-bound and run in the shared OCR
+process pool.
+"""
+import asyncio
+import io
+from pathlib import Path
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+from app.config import get_settings
+from app.ai.local_ocr_fallback import (
+    DocumentSource,
+    open_document,
+    read_document_bytes,
+    run_in_ocr_pool
+)
+
+
+# Tesseract is optional: pytesseract plus the tesseract binary
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+    print("[Image OCR] pytesseract not installed, local image OCR disabled")
+
+
+MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+IMAGE_MIME_TYPES = ("image/jpeg", "image/png")
+
+# Long side of an A4 page, in inches
+A4_LONG_SIDE_INCHES = 11.69
+
+JPEG_QUALITY = 85
+EXIF_ORIENTATION = 0x0112
+
+# Refuse decompression bombs well before they exhaust memory
+Image.MAX_IMAGE_PIXELS = 80_000_000
+
+
+def guess_mime_type(filename: str) -> str:
+    """MIME type of an uploaded file from its extension (PDF when unknown)."""
+    return MIME_TYPES.get(Path(filename).suffix.lower(), "application/pdf")
+
+
+def is_image(mime_type: str) -> bool:
+    return mime_type in IMAGE_MIME_TYPES
+
+
+async def prepare_image(source: DocumentSource) -> Tuple[bytes, str]:
+    """Normalized image bytes and their MIME type, ready for OCR."""
+    settings = get_settings()
+    return await run_in_ocr_pool(
+        _prepare_image, source, settings.image_ocr_target_dpi,
+        timeout=settings.local_ocr_timeout_seconds
+    )
+
+
+async def extract_text_from_image(image_bytes: bytes) -> str:
+    """Local OCR of a normalized image; empty when Tesseract is unavailable."""
+    if not TESSERACT_AVAILABLE:
+        print("[Image OCR] No local OCR engine, cannot extract")
+        return ""
+
+    settings = get_settings()
+    try:
+        text = await run_in_ocr_pool(
+            _ocr_with_tesseract, image_bytes, settings.image_ocr_languages,
+            timeout=settings.local_ocr_timeout_seconds
+        )
+        print(f"[Image OCR] Tesseract extracted {len(text)} chars")
+        return text
+    except asyncio.TimeoutError:
+        print("[Image OCR] Tesseract timed out")
+    except Exception as e:
+        print(f"[Image OCR] Tesseract failed: {e}")
+    return ""
+
+
+# -------------------------------------------------------------------
+# Worker functions (run in the process pool, must stay module-level)
+# -------------------------------------------------------------------
+
+def _prepare_image(source: DocumentSource, target_dpi: int) -> Tuple[bytes, str]:
+    """Orient, grayscale and downscale an image; upright images small enough are kept as-is."""
+    max_side = int(target_dpi * A4_LONG_SIDE_INCHES)
+
+    with open_document(source) as file_obj:
+        image = Image.open(file_obj)
+        original_format, original_size = image.format, image.size
+        # JPEG can decode straight at a reduced scale, far cheaper than a full decode
+        if original_format == "JPEG" and max(original_size) > max_side:
+            scale = max_side / max(original_size)
+            image.draft("L", (int(original_size[0] * scale), int(original_size[1] * scale)))
+        image.load()
+
+    orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+    if orientation == 1 and max(original_size) <= max_side:
+        mime_type = "image/png" if original_format == "PNG" else "image/jpeg"
+        return read_document_bytes(source), mime_type
+
+    image = ImageOps.exif_transpose(image).convert("L")
+    image.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return output.getvalue(), "image/jpeg"
+
+
+def _ocr_with_tesseract(image_bytes: bytes, languages: str) -> str:
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        return pytesseract.image_to_string(image, lang=languages)
@@ -23,7 +23,10 @@ async def classify_intent(text: str) -> IntentResponse:
     # Try AI classification
     if ai_client.is_configured:
         prompt = INTENT_CLASSIFICATION_PROMPT.format(text=text)
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="intent",
+            validate=lambda r: r.get("intent", "scheme") in {t.value for t in IntentType}
+        )
         
         if result:
             try:
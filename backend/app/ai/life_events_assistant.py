@@ -29,7 +29,10 @@ async def analyze_life_event(
             details=details or "No additional details provided"
         )
         
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="life_event",
+            validate=lambda r: isinstance(r.get("checklist"), list)
+        )
         
         if result:
             try:
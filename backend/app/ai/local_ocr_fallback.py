@@ -3,76 +3,296 @@ Local OCR Fallback for GovConnect
 
 Provides best-effort text extraction from PDFs using local libraries.
 Results are LOW CONFIDENCE and must not be cached permanently.
+
+Extraction is CPU-bound, so it runs in a small process pool instead of
+the event loop:
+1. Fast path: PyPDF2 text layer, used as-is when it covers the pages well
+2. Otherwise pdfplumber, with the page range split into chunks that are
+   extracted in parallel
+Documents are capped by page count and by ONE wall-clock deadline
+shared by both stages. A cancelled future does not stop a task that is
+already running in a child process, so a timeout recycles the pool:
+the stuck workers are killed and a fresh pool is started on next use.
+Tasks of other documents caught in a recycled pool are retried once on
+the fresh pool; any other pool failure is an ordinary extraction error.
+
+A document is passed as bytes or, for large spooled uploads, as a file
+path; workers then memory-map the file instead of receiving a pickled
+copy of it.
 """
+import asyncio
+import concurrent.futures
 import io
-from typing import Optional
+import mmap
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Tuple, Union
 import pdfplumber
 import PyPDF2
 
+from app.config import get_settings
+
+
+# The PyPDF2 text layer is "sufficient" when most pages have real text
+FAST_PATH_MIN_CHARS_PER_PAGE = 80
+FAST_PATH_MIN_PAGE_COVERAGE = 0.8
+
+# Document content, or the path of a file holding it
+DocumentSource = Union[bytes, str]
+
+
+@contextmanager
+def open_document(source: DocumentSource):
+    """Seekable view of a document: BytesIO for bytes, a read-only mmap for a path."""
+    if isinstance(source, (bytes, bytearray)):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        yield view
+
+
+def read_document_bytes(source: DocumentSource) -> bytes:
+    """Whole document content (for APIs that need the bytes themselves)."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
 
-async def extract_text_locally(file_bytes: bytes) -> str:
+
+async def extract_text_locally(file_bytes: DocumentSource) -> str:
     """
     Extract text from PDF using local libraries.
-    
+
     Priority:
-    1. pdfplumber (best quality)
-    2. PyPDF2 (fallback)
-    3. Empty string (safe return)
-    
+    1. PyPDF2 text layer (fast path, when sufficient)
+    2. pdfplumber (best quality, parallel page ranges)
+    3. Whatever PyPDF2 found
+    4. Empty string (safe return)
+
     Args:
-        file_bytes: PDF file content as bytes
-        
+        file_bytes: PDF content as bytes, or the path of a PDF file
+
     Returns:
         Extracted text (may be empty or low quality)
     """
     print("[Local OCR] Attempting local text extraction")
-    
-    # Try pdfplumber first (better quality)
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    max_pages = settings.local_ocr_max_pages
+    deadline = loop.time() + settings.local_ocr_timeout_seconds
+
+    # Fast path: PyPDF2 text layer (also tells us the page count)
+    page_count = 0
+    fast_text = ""
     try:
-        text = _extract_with_pdfplumber(file_bytes)
-        if text and len(text.strip()) > 10:
-            print(f"[Local OCR] pdfplumber extracted {len(text)} chars")
-            return text
+        page_count, fast_text, sufficient = await run_in_ocr_pool(
+            _extract_with_pypdf2, file_bytes, max_pages, timeout=deadline - loop.time()
+        )
+        if sufficient:
+            print(f"[Local OCR] PyPDF2 text layer sufficient, {len(fast_text)} chars")
+            return fast_text
+    except asyncio.TimeoutError:
+        # The whole document deadline is spent
+        print("[Local OCR] PyPDF2 timed out")
+        return ""
     except Exception as e:
-        print(f"[Local OCR] pdfplumber failed: {e}")
-    
-    # Fallback to PyPDF2
+        print(f"[Local OCR] PyPDF2 failed: {e}")
+
+    # pdfplumber over page ranges in parallel
     try:
-        text = _extract_with_pypdf2(file_bytes)
+        text = await _extract_with_pdfplumber_parallel(
+            file_bytes, min(page_count, max_pages) if page_count else max_pages, deadline
+        )
         if text and len(text.strip()) > 10:
-            print(f"[Local OCR] PyPDF2 extracted {len(text)} chars")
+            print(f"[Local OCR] pdfplumber extracted {len(text)} chars")
             return text
     except Exception as e:
-        print(f"[Local OCR] PyPDF2 failed: {e}")
-    
+        print(f"[Local OCR] pdfplumber failed: {e}")
+
+    if fast_text and len(fast_text.strip()) > 10:
+        print(f"[Local OCR] PyPDF2 extracted {len(fast_text)} chars")
+        return fast_text
+
     # Safe empty return
     print("[Local OCR] No text extracted, returning empty")
     return ""
 
 
-def _extract_with_pdfplumber(file_bytes: bytes) -> str:
-    """Extract text using pdfplumber."""
-    file_obj = io.BytesIO(file_bytes)
+async def _extract_with_pdfplumber_parallel(file_bytes: DocumentSource, page_count: int, deadline: float) -> str:
+    """
+    Run pdfplumber on page ranges in the process pool.
+
+    Ranges that miss the document deadline (loop time) are dropped; the
+    text of the ranges that finished is still returned, in page order.
+    """
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+
+    step = max(1, settings.local_ocr_pages_per_task)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    results = await asyncio.gather(
+        *(
+            run_in_ocr_pool(_extract_with_pdfplumber, file_bytes, start, end, timeout=deadline - loop.time())
+            for start, end in ranges
+        ),
+        return_exceptions=True
+    )
+
+    timed_out = sum(isinstance(result, asyncio.TimeoutError) for result in results)
+    if timed_out:
+        print(f"[Local OCR] {timed_out}/{len(ranges)} page ranges timed out")
+
     text_parts = []
-    
-    with pdfplumber.open(file_obj) as pdf:
-        for page in pdf.pages:
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            if not isinstance(result, asyncio.TimeoutError):
+                print(f"[Local OCR] Page range failed: {result}")
+            continue
+        text_parts.extend(result)
+
+    return "\n\n".join(text_parts)
+
+
+# -------------------------------------------------------------------
+# Worker functions (run in the process pool, must stay module-level)
+# -------------------------------------------------------------------
+
+def _extract_with_pdfplumber(file_bytes: DocumentSource, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """Extract text of pages [start, end) using pdfplumber."""
+    text_parts = []
+
+    with open_document(file_bytes) as file_obj, pdfplumber.open(file_obj) as pdf:
+        for page in pdf.pages[start:end]:
             page_text = page.extract_text()
             if page_text:
                 text_parts.append(page_text)
-    
-    return "\n\n".join(text_parts)
+            # Free the parsed page objects as we go
+            page.flush_cache()
 
+    return text_parts
 
-def _extract_with_pypdf2(file_bytes: bytes) -> str:
-    """Extract text using PyPDF2."""
-    file_obj = io.BytesIO(file_bytes)
-    pdf_reader = PyPDF2.PdfReader(file_obj)
+
+def _extract_with_pypdf2(file_bytes: DocumentSource, max_pages: int) -> Tuple[int, str, bool]:
+    """
+    Extract the PyPDF2 text layer of the first max_pages pages.
+
+    Returns (page_count, text, sufficient).
+    """
     text_parts = []
-    
-    for page in pdf_reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text_parts.append(page_text)
-    
-    return "\n\n".join(text_parts)
+    pages_with_text = 0
+
+    with open_document(file_bytes) as file_obj:
+        pdf_reader = PyPDF2.PdfReader(file_obj)
+        page_count = len(pdf_reader.pages)
+        for page in pdf_reader.pages[:max_pages]:
+            page_text = page.extract_text()
+            if page_text and page_text.strip():
+                text_parts.append(page_text)
+                if len(page_text.strip()) >= FAST_PATH_MIN_CHARS_PER_PAGE:
+                    pages_with_text += 1
+
+    checked = min(page_count, max_pages)
+    sufficient = checked > 0 and pages_with_text / checked >= FAST_PATH_MIN_PAGE_COVERAGE
+    return page_count, "\n\n".join(text_parts), sufficient
+
+
+# -------------------------------------------------------------------
+# Process pool
+# -------------------------------------------------------------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+# Pools whose workers were killed after a timeout
+_recycled_pools: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """Get or create the shared extraction pool (one per worker process)."""
+    global _pool
+    if _pool is None:
+        workers = get_settings().local_ocr_workers or min(4, os.cpu_count() or 1)
+        # spawn: never fork a process that is running an event loop and threads
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        print(f"[Local OCR] Started extraction pool with {workers} processes")
+    return _pool
+
+
+async def run_in_ocr_pool(fn: Callable[..., Any], *args, timeout: float) -> Any:
+    """
+    Run fn(*args) in the extraction pool within timeout seconds.
+
+    Raises asyncio.TimeoutError (after recycling the pool the task ran
+    in) or BrokenProcessPool; CancelledError only when the calling task
+    itself is being cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    retried = False
+    while True:
+        pool = get_ocr_pool()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, fn, *args),
+                timeout=max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            recycle_ocr_pool(pool)
+            raise
+        except (BrokenProcessPool, asyncio.CancelledError, concurrent.futures.CancelledError) as e:
+            current = asyncio.current_task()
+            if isinstance(e, asyncio.CancelledError) and current is not None and current.cancelling():
+                raise
+            # Caught in a pool recycled because of another document's timeout
+            if pool in _recycled_pools and not retried:
+                retried = True
+                print("[Local OCR] Extraction pool was recycled, retrying on a fresh pool")
+                continue
+            _discard_pool(pool)
+            raise BrokenProcessPool(str(e) or "Extraction pool stopped") from None
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """A crashed child (e.g. out of memory) breaks the pool; start fresh next time."""
+    global _pool
+    if _pool is pool:
+        print("[Local OCR] Extraction pool broke, it will be recreated")
+        _pool = None
+        pool.shutdown(wait=False)
+
+
+def recycle_ocr_pool(pool: ProcessPoolExecutor):
+    """
+    Kill the workers of pool after a timeout; the next task starts a fresh pool.
+
+    Tasks of other documents in the same pool fail with BrokenProcessPool
+    and are retried by run_in_ocr_pool.
+    """
+    global _pool
+    if pool in _recycled_pools:
+        return
+    _recycled_pools.add(pool)
+    if _pool is pool:
+        _pool = None
+    # ProcessPoolExecutor has no public way to stop a running task
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+    print(f"[Local OCR] Killed {len(processes)} extraction processes after a timeout")
+
+
+def shutdown_ocr_pool():
+    """Stop the extraction pool (called at shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
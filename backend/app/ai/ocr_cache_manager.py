@@ -1,139 +1,173 @@
 """
 OCR Cache Manager for GovConnect
 
-CRITICAL RULE: Only Google Document AI results are cached.
-Local fallback results must NEVER be cached.
+Documents are identified by the SHA-256 of their bytes, so the same PDF
+hits the cache whether it is a prebuilt form or a user upload.
+
+Entries live in a TieredCache (data/ocr_cache.sqlite3): one SQLite file
+shared by every worker, with its disk I/O in worker threads.
+
+Retention tiers:
+- Bundled forms, Google Document AI results: OCR_CACHE_GOOGLE_DAYS
+  (0 = permanently)
+- Bundled forms, local fallback results: OCR_CACHE_LOCAL_HOURS, so a
+  low-quality extraction is never served for long and Google gets
+  another chance once it is available
+- User uploads: at most OCR_CACHE_UPLOAD_HOURS whatever the source,
+  since their text can hold personal data; expired uploads are purged
+  at least once an hour. An upload whose bytes match a bundled form
+  reads that form's entry and never rewrites it.
 """
-import json
-import os
-from datetime import datetime
+import hashlib
+import time
 from pathlib import Path
 from typing import Optional
-import hashlib
 
+from app.config import get_settings
+from app.services.cache import TieredCache
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "ocr_cache.sqlite3"
 
-# Cache directory
-CACHE_DIR = Path(__file__).parent.parent / "data" / "ocr_cache"
+CACHEABLE_SOURCES = ("google", "local")
 
+# "Permanent" bundled-form entries (TieredCache always needs a TTL)
+FOREVER_TTL = 100 * 365 * 86400
+PURGE_INTERVAL_SECONDS = 3600
 
-def _ensure_cache_dir():
-    """Create cache directory if it doesn't exist."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Global cache instance
+_ocr_cache: Optional[TieredCache] = None
+_last_purge = 0.0
 
 
-def _get_cache_path(document_id: str) -> Path:
-    """Get path to cache file for a document."""
-    return CACHE_DIR / f"{document_id}.json"
+def get_ocr_cache() -> TieredCache:
+    """Get or create the OCR cache."""
+    global _ocr_cache
+    if _ocr_cache is None:
+        settings = get_settings()
+        _ocr_cache = TieredCache(
+            name="ocr",
+            db_path=Path(settings.ocr_cache_path) if settings.ocr_cache_path else DEFAULT_DB_PATH,
+            # OCR text is large; keep few documents in memory
+            max_memory_entries=64,
+            max_disk_entries=20000,
+            default_ttl=settings.ocr_cache_local_hours * 3600,
+        )
+    return _ocr_cache
 
 
-def get_document_id(file_path: str) -> str:
+def _retention_seconds(source: str, is_prebuilt: bool) -> int:
+    """Lifetime of an entry from this source."""
+    settings = get_settings()
+    if source == "google":
+        days = settings.ocr_cache_google_days
+        retention = days * 86400 if days > 0 else FOREVER_TTL
+    else:
+        retention = settings.ocr_cache_local_hours * 3600
+    if not is_prebuilt:
+        retention = min(retention, settings.ocr_cache_upload_hours * 3600)
+    return retention
+
+
+def get_document_id(file_bytes: bytes) -> str:
     """
-    Generate stable document ID from file path.
-    
-    For prebuilt documents, this ensures consistent caching.
+    Generate stable document ID from file content.
+
+    Identical bytes give the same ID across uploads, workers and restarts.
     """
-    # Use filename as stable ID for prebuilt docs
-    filename = Path(file_path).name
-    return hashlib.md5(filename.encode()).hexdigest()
+    return hashlib.sha256(file_bytes).hexdigest()
 
 
-def get_cached_ocr(document_id: str) -> Optional[str]:
+async def get_cached_ocr(document_id: str) -> Optional[dict]:
     """
-    Retrieve cached OCR text if available.
-    
+    Retrieve cached OCR text if available and not expired.
+
     Args:
         document_id: Unique document identifier
-        
+
     Returns:
-        Extracted text if cached, None otherwise
+        {"text": ..., "source": "google" | "local", "structure": {...} | None}
+        if cached, None otherwise
     """
-    try:
-        cache_path = _get_cache_path(document_id)
-        
-        if not cache_path.exists():
-            return None
-        
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Validate cache structure
-        if not isinstance(data, dict) or 'extracted_text' not in data:
-            print(f"[OCR Cache] Invalid cache format for {document_id}, ignoring")
-            return None
-        
-        # Only return cached results from Google
-        if data.get('source') != 'google':
-            print(f"[OCR Cache] Cache source is not 'google', ignoring")
-            return None
-        
-        print(f"[OCR Cache] Cache hit for {document_id}")
-        return data['extracted_text']
-    
-    except Exception as e:
-        print(f"[OCR Cache] Error reading cache for {document_id}: {e}")
+    data = await get_ocr_cache().get(document_id)
+    if data is None:
         return None
 
+    if not isinstance(data, dict) or data.get("source") not in CACHEABLE_SOURCES:
+        print(f"[OCR Cache] Invalid cache entry for {document_id[:12]}, ignoring")
+        return None
+
+    print(f"[OCR Cache] Cache hit for {document_id[:12]} (source: {data['source']})")
+    return {
+        "text": data["text"],
+        "source": data["source"],
+        "structure": data.get("structure")
+    }
+
 
-def save_cached_ocr(document_id: str, text: str, source: str) -> bool:
+async def save_cached_ocr(
+    document_id: str,
+    text: str,
+    source: str,
+    structure: Optional[dict] = None,
+    is_prebuilt: bool = False
+) -> bool:
     """
-    Save OCR text to cache.
-    
-    CRITICAL: Only saves when source == "google"
-    
+    Save OCR text (and extracted fields/paragraphs) to cache with the
+    retention of its tier.
+
+    A local result never replaces a (longer-lived) Google result, and an
+    upload never replaces a bundled form's entry.
+
     Args:
         document_id: Unique document identifier
         text: Extracted text
         source: Source of extraction ("google" or "local")
-        
+        structure: {"fields": [...], "paragraphs": [...]} from the field extractor
+        is_prebuilt: Bundled form (long retention) rather than a user upload
+
     Returns:
         True if saved, False otherwise
     """
-    # CRITICAL ENFORCEMENT: Only cache Google results
-    if source != "google":
-        print(f"[OCR Cache] Skipping cache save - source is '{source}', not 'google'")
-        return False
-    
-    try:
-        _ensure_cache_dir()
-        
-        cache_data = {
-            "document_id": document_id,
-            "extracted_text": text,
-            "cached_at": datetime.utcnow().isoformat(),
-            "source": source
-        }
-        
-        cache_path = _get_cache_path(document_id)
-        
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"[OCR Cache] Saved cache for {document_id} (source: {source})")
-        return True
-    
-    except Exception as e:
-        print(f"[OCR Cache] Error saving cache for {document_id}: {e}")
+    global _last_purge
+    if source not in CACHEABLE_SOURCES:
+        print(f"[OCR Cache] Skipping cache save - unknown source '{source}'")
         return False
 
+    cache = get_ocr_cache()
+    existing = await cache.get(document_id)
+    if isinstance(existing, dict):
+        if source == "local" and existing.get("source") == "google":
+            return False
+        # Same bytes as a bundled form: keep its longer retention
+        if not is_prebuilt and existing.get("prebuilt"):
+            return False
+
+    await cache.set(
+        document_id,
+        {"text": text, "source": source, "structure": structure, "prebuilt": is_prebuilt},
+        ttl=_retention_seconds(source, is_prebuilt),
+        namespace="prebuilt" if is_prebuilt else "upload",
+    )
+    print(f"[OCR Cache] Saved cache for {document_id[:12]} (source: {source})")
+
+    now = time.time()
+    if now - _last_purge > PURGE_INTERVAL_SECONDS:
+        _last_purge = now
+        await cache.prune()
+    return True
 
-def clear_cache(document_id: Optional[str] = None):
+
+async def clear_cache(document_id: Optional[str] = None):
     """
     Clear cached OCR data.
-    
+
     Args:
         document_id: If provided, clear specific document. Otherwise clear all.
     """
-    try:
-        if document_id:
-            cache_path = _get_cache_path(document_id)
-            if cache_path.exists():
-                cache_path.unlink()
-                print(f"[OCR Cache] Cleared cache for {document_id}")
-        else:
-            if CACHE_DIR.exists():
-                for cache_file in CACHE_DIR.glob("*.json"):
-                    cache_file.unlink()
-                print("[OCR Cache] Cleared all cache")
-    
-    except Exception as e:
-        print(f"[OCR Cache] Error clearing cache: {e}")
+    cache = get_ocr_cache()
+    if document_id:
+        await cache.delete(document_id)
+        print(f"[OCR Cache] Cleared cache for {document_id}")
+    else:
+        await cache.invalidate()
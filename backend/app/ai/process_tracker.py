@@ -29,7 +29,10 @@ async def track_process(
             details=details or "Standard application"
         )
         
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="process",
+            validate=lambda r: isinstance(r.get("steps"), list)
+        )
         
         if result:
             try:
@@ -8,11 +8,13 @@ AI-powered scheme search with:
 - Eligibility reasoning with mandatory explanations
 - Structured JSON output only
 """
-import json
-from pathlib import Path
 from typing import Optional, List, Tuple
 
 from app.ai.base import get_ai_client
+from app.config import get_settings
+from app.services.eligibility_rules import UserProfile, build_local_response
+from app.services.scheme_catalog import get_scheme_catalog
+from app.services.scheme_retrieval import SearchHit
 from app.utils.prompts import (
     SCHEME_SEARCH_PROMPT,
     SCHEME_ELIGIBILITY_PROMPT,
@@ -21,13 +23,6 @@ from app.utils.prompts import (
 from app.models.schemas import Scheme, EligibilityResponse
 
 
-def load_schemes() -> List[dict]:
-    """Load schemes from JSON file."""
-    data_path = Path(__file__).parent.parent / "data" / "schemes.json"
-    with open(data_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 async def search_schemes_smart(
     query: Optional[str] = None,
     occupation: Optional[str] = None,
@@ -40,57 +35,39 @@ async def search_schemes_smart(
     AI-driven scheme search with deep reasoning.
     
     Flow:
-    1. Load all schemes
-    2. Send user situation + all schemes to AI
-    3. AI extracts entities, matches schemes, and explains WHY
-    4. Return ranked schemes with relevance reasons
+    1. Take schemes from the in-memory catalog
+    2. Shortlist the top-K candidates with the local BM25 index
+    3. Send user situation + shortlisted schemes to AI
+    4. AI extracts entities, matches schemes, and explains WHY
+    5. Return ranked schemes with relevance reasons
     
-    NO keyword fallback - pure AI reasoning.
+    If the AI is unavailable, the BM25 ranking is returned instead.
     """
-    all_schemes = load_schemes()
+    catalog = get_scheme_catalog()
     
     # Filter by category if explicitly provided (UI dropdown filter)
-    if category and category != "All":
-        all_schemes = [s for s in all_schemes if s["category"].lower() == category.lower()]
-
-    # Convert to Scheme objects with full details for AI context
-    scheme_objects = [
-        Scheme(
-            id=s["id"],
-            name=s["name"],
-            category=s["category"],
-            description=s["description"],
-            benefit=s["benefit"],
-            eligibility=s.get("eligibility", []),
-            documents=s.get("documents", []),
-            relevance_reason=None
-        )
-        for s in all_schemes
-    ]
+    scheme_objects = catalog.list(category)
     
     # If no query provided, return all schemes (browsing mode)
     if not query:
         return scheme_objects, len(scheme_objects)
 
+    # Local retrieval: rank candidates and keep a bounded shortlist
+    search_text = " ".join(p for p in [query, occupation, state] if p)
+    hits = catalog.search_index.search(
+        search_text,
+        candidate_ids=[s.id for s in scheme_objects],
+        top_k=get_settings().scheme_search_top_k
+    )
+
     # AI-powered search
     ai_client = get_ai_client()
     
     if not ai_client.is_configured:
-        # Return all schemes if AI not configured, with a note
-        for s in scheme_objects:
-            s.relevance_reason = "AI service not configured - showing all schemes"
-        return scheme_objects, len(scheme_objects)
+        return _keyword_results(scheme_objects, hits, "AI service not configured")
     
-    # Build rich context for AI with full scheme details
-    schemes_context = "\n".join([
-        f"ID: {s.id}\n"
-        f"  Name: {s.name}\n"
-        f"  Category: {s.category}\n"
-        f"  Description: {s.description}\n"
-        f"  Benefit: {s.benefit}\n"
-        f"  Eligibility: {', '.join(s.eligibility)}\n"
-        for s in scheme_objects
-    ])
+    # Rich context for the shortlist only (pre-rendered by the catalog)
+    schemes_context = catalog.context_for([h.scheme_id for h in hits])
     
     prompt = SCHEME_SEARCH_PROMPT.format(
         query=query,
@@ -101,9 +78,11 @@ async def search_schemes_smart(
         schemes_list=schemes_context
     )
     
-    result = await ai_client.generate(prompt)
+    result = await ai_client.generate(
+        prompt, cache_namespace="scheme_search", validate=_is_search_reply
+    )
     
-    if result:
+    if result and _is_search_reply(result):
         # Extract AI response
         matched_schemes_data = result.get("matched_schemes", [])
         extracted_profile = result.get("extracted_profile", {})
@@ -137,10 +116,36 @@ async def search_schemes_smart(
         # (User's situation doesn't match any schemes)
         return [], 0
     
-    # AI call failed - return all schemes with error note
-    for s in scheme_objects:
-        s.relevance_reason = "AI analysis unavailable - showing all schemes"
-    return scheme_objects, len(scheme_objects)
+    # AI call failed - fall back to the local keyword ranking
+    return _keyword_results(scheme_objects, hits, "AI analysis unavailable")
+
+
+def _is_search_reply(result: dict) -> bool:
+    """A search reply whose matches all name a scheme."""
+    matches = result.get("matched_schemes", [])
+    return isinstance(matches, list) and all(isinstance(m, dict) and "scheme_id" in m for m in matches)
+
+
+def _keyword_results(
+    scheme_objects: List[Scheme],
+    hits: List[SearchHit],
+    note: str
+) -> Tuple[List[Scheme], int]:
+    """Build search results from the BM25 ranking when AI can't be used."""
+    by_id = {s.id: s for s in scheme_objects}
+    results = []
+    
+    for hit in hits:
+        if hit.score <= 0:
+            break
+        scheme = by_id[hit.scheme_id]
+        scheme.relevance_reason = (
+            f"Matches your search for: {', '.join(hit.matched_terms)} "
+            f"({note} - keyword match, please verify eligibility)"
+        )
+        results.append(scheme)
+    
+    return results, len(results)
 
 
 async def check_eligibility_smart(
@@ -152,12 +157,15 @@ async def check_eligibility_smart(
     category: Optional[str] = None
 ) -> EligibilityResponse:
     """
-    Check eligibility using AI reasoning.
+    Check eligibility: compiled rules first, AI reasoning for the rest.
     Provides detailed explanation of why user is/isn't eligible.
+    
+    Clear-cut cases (a hard rule fails, or every rule passes) are answered
+    locally by the rule engine; ambiguous ones are escalated to the AI.
     """
     # Get scheme details
-    schemes = load_schemes()
-    scheme = next((s for s in schemes if s["id"] == scheme_id), None)
+    catalog = get_scheme_catalog()
+    scheme = catalog.get(scheme_id)
     
     if not scheme:
         return EligibilityResponse(
@@ -168,16 +176,19 @@ async def check_eligibility_smart(
             warnings=["Invalid scheme ID provided"],
             recommendations=["Browse available schemes at /api/schemes"]
         )
-        
-
-
+    
+    profile = UserProfile(age=age, income=income, occupation=occupation, state=state, category=category)
+    outcome = catalog.rules.evaluate(scheme_id, profile)
+    
+    if outcome and outcome.is_clear_cut:
+        return build_local_response(scheme, outcome)
     
     ai_client = get_ai_client()
     if ai_client.is_configured:
         prompt = SCHEME_ELIGIBILITY_PROMPT.format(
-            scheme_name=scheme["name"],
-            scheme_category=scheme["category"],
-            eligibility_criteria=", ".join(scheme.get("eligibility", [])),
+            scheme_name=scheme.name,
+            scheme_category=scheme.category,
+            eligibility_criteria=", ".join(scheme.eligibility),
             age=age or "Not provided",
             income=income or "Not provided",
             occupation=occupation or "Not provided",
@@ -185,7 +196,10 @@ async def check_eligibility_smart(
             category=category or "Not provided"
         )
         
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="eligibility",
+            validate=lambda r: isinstance(r.get("eligible"), bool)
+        )
         
         if result:
             return EligibilityResponse(
@@ -197,6 +211,8 @@ async def check_eligibility_smart(
                 recommendations=result.get("recommendations", [])
             )
             
-    # Fallback if AI unavailable
+    # Fallback if AI unavailable: partial rule-based answer when we have one
+    if outcome:
+        return build_local_response(scheme, outcome)
     fallback = get_fallback_response("eligibility")
     return EligibilityResponse(**fallback)
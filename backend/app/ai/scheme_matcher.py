@@ -3,11 +3,11 @@ Scheme Matcher using AI
 
 Matches users to relevant schemes and explains eligibility.
 """
-import json
-from pathlib import Path
 from typing import Optional
 
 from app.ai.base import get_ai_client
+from app.services.eligibility_rules import UserProfile, build_local_response
+from app.services.scheme_catalog import get_scheme_catalog
 from app.utils.prompts import (
     SCHEME_ELIGIBILITY_PROMPT, 
     SCHEME_SEARCH_PROMPT,
@@ -16,13 +16,6 @@ from app.utils.prompts import (
 from app.models.schemas import EligibilityResponse, Scheme
 
 
-def load_schemes() -> list[dict]:
-    """Load schemes from JSON file."""
-    data_path = Path(__file__).parent.parent / "data" / "schemes.json"
-    with open(data_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 async def check_eligibility(
     scheme_id: str,
     age: Optional[int] = None,
@@ -37,8 +30,7 @@ async def check_eligibility(
     Returns a response with human-readable explanation.
     """
     # Find the scheme
-    schemes = load_schemes()
-    scheme = next((s for s in schemes if s["id"] == scheme_id), None)
+    scheme = get_scheme_catalog().get(scheme_id)
     
     if not scheme:
         return EligibilityResponse(
@@ -53,9 +45,9 @@ async def check_eligibility(
     
     if ai_client.is_configured:
         prompt = SCHEME_ELIGIBILITY_PROMPT.format(
-            scheme_name=scheme["name"],
-            scheme_category=scheme["category"],
-            eligibility_criteria=", ".join(scheme.get("eligibility", [])),
+            scheme_name=scheme.name,
+            scheme_category=scheme.category,
+            eligibility_criteria=", ".join(scheme.eligibility),
             age=age or "Not provided",
             income=income or "Not provided",
             occupation=occupation or "Not provided",
@@ -63,7 +55,10 @@ async def check_eligibility(
             category=category or "Not provided"
         )
         
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="eligibility",
+            validate=lambda r: isinstance(r.get("eligible"), bool)
+        )
         
         if result:
             try:
@@ -78,50 +73,25 @@ async def check_eligibility(
                 pass
     
     # Fallback: Basic rule-based eligibility
-    return _rule_based_eligibility(scheme, age, income, occupation)
+    return _rule_based_eligibility(scheme, age, income, occupation, state, category)
 
 
 def _rule_based_eligibility(
-    scheme: dict,
+    scheme: Scheme,
     age: Optional[int],
     income: Optional[int],
-    occupation: Optional[str]
+    occupation: Optional[str],
+    state: Optional[str] = None,
+    category: Optional[str] = None
 ) -> EligibilityResponse:
-    """Fallback rule-based eligibility check."""
-    
-    scheme_name = scheme["name"]
-    eligibility = scheme.get("eligibility", [])
-    
-    # Basic matching logic
-    is_eligible = True
-    reasons = []
-    warnings = []
-    recommendations = []
+    """Fallback rule-based eligibility check using the compiled scheme rules."""
+    profile = UserProfile(age=age, income=income, occupation=occupation, state=state, category=category)
+    outcome = get_scheme_catalog().rules.evaluate(scheme.id, profile)
     
-    eligibility_text = " ".join(eligibility).lower()
+    if outcome:
+        return build_local_response(scheme, outcome)
     
-    # Check occupation relevance
-    if occupation:
-        if "farmer" in eligibility_text and occupation.lower() == "farmer":
-            reasons.append(f"Your occupation as a {occupation} matches the scheme requirements.")
-        elif "farmer" in eligibility_text and occupation.lower() != "farmer":
-            is_eligible = False
-            reasons.append(f"This scheme is primarily for farmers, but you indicated your occupation as {occupation}.")
-    
-    if not reasons:
-        reasons.append(f"Based on the available information, you may be eligible for {scheme_name}.")
-        warnings.append("Please verify all eligibility criteria on the official portal.")
-    
-    recommendations.append("Gather all required documents before applying")
-    recommendations.append(f"Check the official {scheme_name} website for latest updates")
-    
-    return EligibilityResponse(
-        eligible=is_eligible,
-        confidence=60 if is_eligible else 40,
-        reason=" ".join(reasons),
-        warnings=warnings,
-        recommendations=recommendations
-    )
+    return EligibilityResponse(**get_fallback_response("eligibility"))
 
 
 async def search_schemes(
@@ -135,25 +105,8 @@ async def search_schemes(
     Search and recommend schemes based on user profile.
     Uses AI to explain relevance of each scheme.
     """
-    schemes = load_schemes()
-    
     # Filter by category if provided
-    if category and category != "All":
-        schemes = [s for s in schemes if s["category"].lower() == category.lower()]
-    
-    # Convert to Scheme models
-    scheme_models = []
-    for s in schemes:
-        scheme_models.append(Scheme(
-            id=s["id"],
-            name=s["name"],
-            category=s["category"],
-            description=s["description"],
-            benefit=s["benefit"],
-            eligibility=s.get("eligibility", []),
-            documents=s.get("documents", []),
-            relevance_reason=None
-        ))
+    scheme_models = get_scheme_catalog().list(category)
     
     # If we have a query and AI is configured, get relevance reasons
     ai_client = get_ai_client()
@@ -169,7 +122,10 @@ async def search_schemes(
             schemes_list=schemes_list
         )
         
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="scheme_search",
+            validate=lambda r: isinstance(r.get("relevance_reasons"), dict)
+        )
         
         if result:
             relevance_reasons = result.get("relevance_reasons", {})
@@ -12,11 +12,94 @@ class Settings(BaseSettings):
     # Groq API (Primary AI)
     groq_api_key: Optional[str] = None
 
+    # LLM gateway
+    llm_max_concurrency: int = 200  # In-flight completions per worker
+    llm_timeout_seconds: float = 30.0  # Per-call deadline
+    llm_max_retries: int = 2  # Retries on transient Groq errors
+
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_path: Optional[str] = None  # Defaults to app/data/llm_cache.sqlite3
+    llm_cache_memory_entries: int = 2048
+    llm_cache_disk_entries: int = 50000
+
+    # Translation cache (shared by all workers through the SQLite file)
+    translation_cache_enabled: bool = True
+    translation_cache_path: Optional[str] = None  # Defaults to app/data/translation_cache.sqlite3
+    translation_cache_memory_entries: int = 4096
+    translation_cache_disk_entries: int = 200000
+    translation_batch_max_items: int = 25  # Strings per AI translation call
+    translation_batch_max_chars: int = 2000  # Characters per AI translation call
+
+    # OCR cache (shared by all workers through the SQLite file)
+    ocr_cache_path: Optional[str] = None  # Defaults to app/data/ocr_cache.sqlite3
+    ocr_cache_google_days: int = 0  # Bundled forms; 0 = keep Google results forever
+    ocr_cache_local_hours: int = 24  # Local results are low quality, keep briefly
+    ocr_cache_upload_hours: int = 24  # User uploads may hold personal data; upper bound for any source
+
+    # Local PDF extraction (fallback OCR)
+    local_ocr_workers: int = 0  # Process pool size, 0 = min(4, CPU count)
+    local_ocr_max_pages: int = 50  # Pages extracted per document
+    local_ocr_pages_per_task: int = 8  # Page range size handed to one process
+    local_ocr_timeout_seconds: float = 30.0  # Per-document deadline
+
+    # Image uploads (JPG/PNG)
+    image_ocr_target_dpi: int = 300  # Photos are downscaled to this DPI for an A4 page
+    image_ocr_languages: str = "eng"  # Tesseract languages for local OCR, e.g. "eng+hin+tel"
+
+    # Form uploads (POST /api/forms/upload)
+    upload_max_bytes: int = 20 * 1024 * 1024  # Larger uploads are rejected with 413
+    upload_memory_bytes: int = 2 * 1024 * 1024  # Larger uploads are spooled to a temp file
+
+    # Form analysis jobs (queue per worker, state shared through SQLite)
+    analysis_jobs_path: Optional[str] = None  # Defaults to app/data/analysis_jobs.sqlite3
+    analysis_job_workers: int = 2  # Concurrent analyses per worker
+    analysis_job_max_pending: int = 50  # Queued uploads beyond this get 503
+    analysis_job_timeout_seconds: float = 300.0  # A job silent this long is reported failed
+    analysis_job_retention_seconds: int = 3600  # Finished jobs are kept this long
+
+    # Service locator upstreams (OpenStreetMap)
+    nominatim_url: str = "https://nominatim.openstreetmap.org"
+    overpass_url: str = "https://overpass-api.de/api/interpreter"
+    osm_user_agent: str = "GovConnect/1.0 (govconnect-project-demo)"
+    nominatim_min_interval_seconds: float = 1.0  # Nominatim usage policy: 1 request/second
+    nominatim_max_wait_seconds: float = 3.0  # Beyond this wait for a free slot, fall back without Nominatim
+    http_pacing_path: Optional[str] = None  # Defaults to app/data/http_pacing.sqlite3 (shared by all workers)
+
+    # Geocode cache (Nominatim results, shared by all workers through the SQLite file)
+    geocode_cache_enabled: bool = True
+    geocode_cache_path: Optional[str] = None  # Defaults to app/data/geocode_cache.sqlite3
+    geocode_cache_memory_entries: int = 4096
+    geocode_cache_disk_entries: int = 100000
+
+    # Overpass tile cache (service locator)
+    overpass_cache_path: Optional[str] = None  # Defaults to app/data/overpass_cache.sqlite3
+    overpass_cache_memory_entries: int = 2048
+    overpass_cache_disk_entries: int = 50000
+    overpass_tile_zoom: int = 13  # ~4.5 km tiles at Indian latitudes
+    overpass_tile_fresh_seconds: int = 24 * 3600  # Older tiles are refreshed in the background
+    overpass_tile_max_age_seconds: int = 7 * 24 * 3600  # Tiles are never served past this age
+
+    # Offline OSM store (python -m app.services.osm_store); imported regions skip Overpass
+    osm_store_enabled: bool = True
+    osm_store_path: Optional[str] = None  # Defaults to app/data/osm_services.sqlite3
+
+    # Shared outbound HTTP clients
+    http2_enabled: bool = True  # Used when the h2 package is installed
+    http_connect_timeout_seconds: float = 5.0
+    http_keepalive_seconds: float = 60.0
+
+    # Scheme search
+    scheme_search_top_k: int = 15  # Schemes shortlisted locally before the AI call
+
     # Google Document AI (Primary OCR)
     google_project_id: Optional[str] = None
     google_location: Optional[str] = None
     google_processor_id: Optional[str] = None
     google_application_credentials: Optional[str] = None
+    google_ocr_max_concurrency: int = 8  # In-flight Document AI calls per worker
+    google_ocr_timeout_seconds: float = 60.0  # Per-call deadline
+    google_ocr_max_retries: int = 3  # Retries on throttling/transient errors
     
     # Application
     app_name: str = "GovConnect API"
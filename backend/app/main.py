@@ -1,20 +1,69 @@
 """
 GovConnect Backend - FastAPI Application Entry Point
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
+from app.utils.cancellation import CancelOnDisconnectMiddleware
+from app.utils.uploads import UploadSizeLimitMiddleware
 from app.routers import intent, schemes, forms, process, locator, life_events, complaints, translate
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build in-memory indexes at startup and run background refreshers."""
+    from app.services.analysis_jobs import get_job_queue
+    from app.services.form_artifacts import check_form_artifacts
+    from app.services.http_clients import close_http_clients, open_http_clients
+    from app.services.scheme_catalog import get_scheme_catalog, watch_scheme_catalog
+    from app.services.spatial_index import get_service_center_index
+
+    get_scheme_catalog()
+    # Read-only: artifacts are written by the build CLI, never by API workers
+    check_form_artifacts()
+    get_service_center_index()
+    open_http_clients()
+    job_queue = get_job_queue()
+    job_queue.start()
+    background_tasks = [
+        asyncio.create_task(watch_scheme_catalog()),
+    ]
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await job_queue.stop()
+
+    from app.ai.google_document_ai import close_google_ai
+    from app.ai.local_ocr_fallback import shutdown_ocr_pool
+    await close_google_ai()
+    await close_http_clients()
+    shutdown_ocr_pool()
+
+
 app = FastAPI(
     title=settings.app_name,
     version="1.0.1",
     description="AI-powered government services assistant API",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+)
+
+# Stop oversized uploads before the multipart parser buffers them
+# (added first so it sits inside CORS, whose headers its 413 needs,
+# and inside the disconnect watcher)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.upload_max_bytes,
+    paths=("/api/forms/upload",),
 )
 
 # CORS Configuration
@@ -26,6 +75,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Abort in-flight AI calls when the client goes away
+app.add_middleware(CancelOnDisconnectMiddleware)
+
 # Register Routers
 app.include_router(intent.router, prefix="/api", tags=["Intent"])
 app.include_router(schemes.router, prefix="/api/schemes", tags=["Schemes"])
@@ -51,13 +103,32 @@ async def root():
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Detailed health check."""
-    from app.ai.base import get_ai_client
+    from app.ai.base import get_ai_client, get_inflight_stats
+    from app.ai.ocr_cache_manager import get_ocr_cache
+    from app.services.geocode_cache import get_geocode_cache
+    from app.services.llm_cache import get_llm_cache
+    from app.services.osm_store import get_osm_store
+    from app.services.overpass_tiles import get_overpass_tile_cache
+    from app.services.translation_cache import get_translation_cache
     ai_client = get_ai_client()
+    llm_cache = get_llm_cache()
+    translation_cache = get_translation_cache()
+    geocode_cache = get_geocode_cache()
+    osm_store = get_osm_store()
     
     return {
         "status": "healthy",
         "services": {
             "api": "operational",
             "ai": "operational" if ai_client.is_configured else "not_configured",
-        }
+        },
+        "caches": {
+            "llm": llm_cache.stats() if llm_cache else "disabled",
+            "translation": translation_cache.stats() if translation_cache else "disabled",
+            "geocode": geocode_cache.stats() if geocode_cache else "disabled",
+            "ocr": get_ocr_cache().stats(),
+            "overpass_tiles": get_overpass_tile_cache().stats(),
+            "osm_store": osm_store.stats() if osm_store else "not_imported",
+        },
+        "llm_coalescing": get_inflight_stats(),
     }
@@ -86,6 +86,30 @@ class EligibilityResponse(BaseModel):
     recommendations: list[str] = Field(default_factory=list)
 
 
+class BatchEligibilityRequest(BaseModel):
+    """Request for checking one profile against many schemes."""
+    scheme_ids: Optional[list[str]] = Field(
+        default=None, alias="schemeIds", max_length=50,
+        description="Schemes to check, at most 50 (default: all schemes)"
+    )
+    age: Optional[int] = None
+    income: Optional[int] = None
+    category: Optional[str] = None
+    state: Optional[str] = None
+    occupation: Optional[str] = None
+    language: str = "en"  # Language code: en, te, hi, etc.
+    
+    class Config:
+        populate_by_name = True
+
+
+class BatchEligibilityItem(BaseModel):
+    """One streamed result of a batch eligibility check."""
+    scheme_id: str
+    scheme_name: Optional[str] = None
+    result: EligibilityResponse
+
+
 # ============ Forms ============
 
 class Form(BaseModel):
@@ -10,9 +10,27 @@ from fastapi import APIRouter, HTTPException
 
 from app.models.schemas import ComplaintRequest, ComplaintResponse
 from app.ai.complaint_generator import generate_complaint
+from app.services.glossary import translate_local
 
 router = APIRouter()
 
+COMPLAINT_SECTORS = [
+    {"name": "Electricity", "department": "Power Distribution Company"},
+    {"name": "Water Supply", "department": "Municipal Water Department"},
+    {"name": "Transport", "department": "Regional Transport Office"},
+    {"name": "Education", "department": "Department of Education"},
+    {"name": "Health", "department": "Department of Health"},
+    {"name": "Police", "department": "Police Department"},
+    {"name": "Municipal Services", "department": "Municipal Corporation"},
+    {"name": "Banking", "department": "Banking Ombudsman"},
+    {"name": "Telecom", "department": "TRAI"},
+    {"name": "Pension", "department": "Pension Department"},
+    {"name": "Railways", "department": "Indian Railways"},
+    {"name": "Post", "department": "India Post"},
+    {"name": "Income Tax", "department": "Income Tax Department"},
+    {"name": "Other", "department": "Relevant Department"}
+]
+
 
 @router.post("/generate", response_model=ComplaintResponse)
 async def generate_complaint_letter(request: ComplaintRequest):
@@ -43,23 +61,11 @@ async def generate_complaint_letter(request: ComplaintRequest):
 
 
 @router.get("/sectors")
-async def get_complaint_sectors():
-    """Get list of sectors for filing complaints."""
-    return {
-        "sectors": [
-            {"name": "Electricity", "department": "Power Distribution Company"},
-            {"name": "Water Supply", "department": "Municipal Water Department"},
-            {"name": "Transport", "department": "Regional Transport Office"},
-            {"name": "Education", "department": "Department of Education"},
-            {"name": "Health", "department": "Department of Health"},
-            {"name": "Police", "department": "Police Department"},
-            {"name": "Municipal Services", "department": "Municipal Corporation"},
-            {"name": "Banking", "department": "Banking Ombudsman"},
-            {"name": "Telecom", "department": "TRAI"},
-            {"name": "Pension", "department": "Pension Department"},
-            {"name": "Railways", "department": "Indian Railways"},
-            {"name": "Post", "department": "India Post"},
-            {"name": "Income Tax", "department": "Income Tax Department"},
-            {"name": "Other", "department": "Relevant Department"}
-        ]
-    }
+async def get_complaint_sectors(language: str = "en"):
+    """
+    Get list of sectors for filing complaints.
+    
+    Sector and department names are translated from the offline
+    glossary only, so this never waits on the AI.
+    """
+    return {"sectors": translate_local(COMPLAINT_SECTORS, language)}
@@ -4,18 +4,25 @@ Forms Router - Form Analysis & Guidance
 GET /api/forms - List available forms
 GET /api/forms/{form_id} - Get form details
 GET /api/forms/{form_id}/download - Download form PDF
-POST /api/forms/upload - Upload and analyze custom form
+POST /api/forms/upload - Upload a custom form, returns an analysis job id
+GET /api/forms/jobs/{job_id} - Analysis job status and result
+GET /api/forms/jobs/{job_id}/events - Analysis job progress (SSE)
 POST /api/forms/{form_id}/analyze - Analyze pre-configured form
 """
+import asyncio
 import json
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
-from typing import Optional
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import AsyncIterator, Optional
 
 from app.models.schemas import FormsListResponse, FormAnalysisResponse, Form as FormModel
 from app.ai.form_analyzer import analyze_form, analyze_with_extracted_fields
 from app.ai.document_analyzer import get_document_analyzer
+from app.services.analysis_jobs import get_job_queue
+from app.services.form_artifacts import get_form_artifact
+from app.utils.uploads import spool_upload
+from app.config import get_settings
 
 router = APIRouter()
 
@@ -93,7 +100,7 @@ async def download_form(form_id: str, inline: bool = True):
     )
 
 
-@router.post("/upload")
+@router.post("/upload", status_code=202)
 async def upload_and_analyze_form(
     file: UploadFile = File(..., description="PDF or image of the form"),
     purpose: str = Form(..., description="Purpose for filling this form"),
@@ -102,8 +109,13 @@ async def upload_and_analyze_form(
     """
     Upload a form and get AI-powered filling guidance.
     
-    1. Extracts text using document analyzer (Google or local)
-    2. Generates filling guidance using Groq AI
+    1. Streams the upload to memory or a temp file (size-capped, hashed)
+    2. Queues it for analysis and returns a job id right away
+    
+    The job then extracts text and fields (Google, local, or the OCR
+    cache when the same file was seen before) and generates guidance with
+    Groq AI. Follow it with GET /api/forms/jobs/{job_id} or the SSE stream
+    at /api/forms/jobs/{job_id}/events.
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
@@ -117,40 +129,61 @@ async def upload_and_analyze_form(
             detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}"
         )
     
-    # Read file content
-    file_bytes = await file.read()
-    
-    # Analyze with document analyzer
-    doc_analyzer = get_document_analyzer()
-    doc_result = await doc_analyzer.analyze_document(file_bytes)
-    
-    if not doc_result.get("success"):
-        # Fallback: use filename as hint for template-based guidance
-        form_type = Path(file.filename).stem.replace("_", " ").replace("-", " ")
-        result = await analyze_form(form_type=form_type, purpose=purpose)
-        return {
-            "analysis_method": "template",
-            "form_type": form_type,
-            "guidance": result.model_dump(),
-            "extracted_fields": []
-        }
-    
-    # Get AI guidance based on extracted fields
-    guidance = await analyze_with_extracted_fields(
-        extracted_fields=doc_result.get("fields", []),
-        paragraphs=doc_result.get("paragraphs", []),
-        purpose=purpose
-    )
+    # Stream the file out of the request, hashing it on the way
+    settings = get_settings()
+    upload = await spool_upload(file, settings.upload_max_bytes, settings.upload_memory_bytes)
+    
+    try:
+        job_id = await get_job_queue().submit(upload, filename=file.filename, purpose=purpose)
+    except asyncio.QueueFull:
+        upload.close()
+        raise HTTPException(
+            status_code=503,
+            detail="Too many forms are being analyzed, please try again shortly"
+        )
     
     return {
-        "analysis_method": "document_intelligence",
-        "page_count": doc_result.get("page_count", 0),
-        "extracted_fields": doc_result.get("fields", []),
-        "tables": doc_result.get("tables", []),
-        "guidance": guidance.model_dump(by_alias=True)
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/forms/jobs/{job_id}",
+        "events_url": f"/api/forms/jobs/{job_id}/events"
     }
 
 
+@router.get("/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    """
+    Status of an upload analysis job.
+    
+    `stage` is one of queued, ocr, fields, guidance, done; `result` holds
+    the analysis (with the FormAnalysisResponse under "guidance") once
+    `status` is "done".
+    """
+    job = await get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str):
+    """Server-sent events with the job state on every stage change."""
+    job_queue = get_job_queue()
+    if await job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events() -> AsyncIterator[str]:
+        async for job in job_queue.watch(job_id):
+            event = job["status"] if job["status"] in ("done", "failed") else "progress"
+            yield f"event: {event}\ndata: {json.dumps(job, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/{form_id}/analyze")
 async def analyze_preconfigured_form(
     form_id: str,
@@ -170,24 +203,33 @@ async def analyze_preconfigured_form(
     file_path = FORMS_DIR / form.get("file", "")
     
     if file_path.exists():
-        # Read and analyze with Document Intelligence
-        with open(file_path, "rb") as f:
-            file_bytes = f.read()
-        
-        doc_analyzer = get_document_analyzer()
-        doc_result = await doc_analyzer.analyze_document(file_bytes)
+        # Bundled forms are extracted ahead of time; OCR only if missing
+        artifact = get_form_artifact(form_id, file_path)
+        if artifact is None:
+            with open(file_path, "rb") as f:
+                file_bytes = f.read()
+            
+            doc_analyzer = get_document_analyzer()
+            doc_result = await doc_analyzer.analyze_document(
+                file_bytes, is_prebuilt=True, file_path=file_path.name
+            )
+            if doc_result.get("success"):
+                artifact = {
+                    "fields": doc_result["fields"],
+                    "paragraphs": doc_result["paragraphs"],
+                }
         
-        if doc_result.get("success"):
+        if artifact:
             guidance = await analyze_with_extracted_fields(
-                extracted_fields=doc_result.get("fields", []),
-                paragraphs=doc_result.get("paragraphs", []),
+                extracted_fields=artifact["fields"],
+                paragraphs=artifact["paragraphs"],
                 purpose=purpose
             )
             
             return {
                 "form": form,
                 "analysis_method": "document_intelligence",
-                "extracted_fields": doc_result.get("fields", []),
+                "extracted_fields": artifact["fields"],
                 "guidance": guidance.model_dump(by_alias=True)
             }
     
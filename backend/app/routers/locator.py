@@ -1,39 +1,29 @@
 """
 Service Locator Router
 
-GET /api/locator/nearby - Find nearby government service centers using OpenStreetMap.
-"""
-import math
-import httpx
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional, List
-
-from app.models.schemas import ServiceLocatorResponse, ServiceCenter
-
-router = APIRouter()
-
-"""
-Service Locator Router
-
 GET /api/locator/nearby - Find nearby government service centers using OpenStreetMap Overpass API.
 """
-import math
-import httpx
+import heapq
 from fastapi import APIRouter, Query, HTTPException
 from typing import Optional, List, Dict, Tuple
 
+from app.config import get_settings
 from app.models.schemas import ServiceLocatorResponse, ServiceCenter
+from app.services.geocode_cache import (
+    NOT_FOUND_TTL,
+    REVERSE_TTL,
+    get_geocode_cache,
+    make_reverse_key,
+    make_search_key
+)
+from app.services.http_clients import get_http_client
+from app.services.osm_store import get_osm_store
+from app.services.overpass_tiles import get_overpass_tile_cache
+from app.services.pincode_table import lookup_pincode
+from app.services.spatial_index import get_service_center_index, haversine_km
 
 router = APIRouter()
 
-# APIs
-NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
-OVERPASS_URL = "https://overpass-api.de/api/interpreter"
-
-HEADERS = {
-    "User-Agent": "GovConnect/1.0 (govconnect-project-demo)"
-}
-
 # Service Category Mapping to OSM Tags
 SERVICE_TAGS = {
     "Police": ['node["amenity"="police"]', 'way["amenity"="police"]'],
@@ -53,94 +43,112 @@ SERVICE_TAGS = {
     "Social Welfare": ['node["amenity"="social_facility"]'] # Orphanages, shelters, etc.
 }
 
+# Types in data/service_centers.json -> SERVICE_TAGS category (others are Administrative)
+LOCAL_TYPE_CATEGORIES = {
+    "Police": "Police",
+    "Fire": "Fire",
+    "Transport": "Transport",
+    "Banking": "Bank",
+    "Health": "Hospital",
+}
+
+# A bundled center this close to a same-named OSM element is the same place
+DUPLICATE_DISTANCE_KM = 0.1
+
+# Requested radii are clamped to this range (wider searches go to Overpass
+# as one `around:` query, see overpass_tiles.MAX_TILES)
+MIN_RADIUS_KM = 0.1
+MAX_RADIUS_KM = 50.0
+
 
 async def get_lat_lon_from_pincode(pincode: str) -> Tuple[Optional[float], Optional[float], str]:
     """
-    Geocode pincode to Lat/Lon using Nominatim.
+    Geocode pincode to Lat/Lon.
+
+    1. Bundled pincode centroid table (no network)
+    2. Geocode cache of earlier Nominatim answers
+    3. Nominatim (answer cached)
+
     Returns: (lat, lon, display_name)
     """
+    local = lookup_pincode(pincode)
+    if local:
+        return local
+
+    cache = get_geocode_cache()
+    cache_key = make_search_key(pincode)
+    if cache:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return cached["lat"], cached["lon"], cached["display_name"]
+
     params = {
         "q": f"{pincode}, India",
         "format": "json",
         "limit": 1
     }
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(NOMINATIM_URL, params=params, headers=HEADERS, timeout=10.0)
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    return float(data[0]["lat"]), float(data[0]["lon"]), data[0]["display_name"]
-        except Exception as e:
-            print(f"Nominatim Error: {e}")
-            
+    try:
+        response = await get_http_client("nominatim").get(
+            f"{get_settings().nominatim_url}/search", params=params
+        )
+        if response.status_code == 200:
+            data = response.json()
+            if data:
+                lat, lon, name = float(data[0]["lat"]), float(data[0]["lon"]), data[0]["display_name"]
+                if cache:
+                    await cache.set(cache_key, {"lat": lat, "lon": lon, "display_name": name})
+                return lat, lon, name
+            if cache:
+                # Unknown pincode: remember briefly
+                await cache.set(cache_key, {"lat": None, "lon": None, "display_name": ""}, ttl=NOT_FOUND_TTL)
+    except Exception as e:
+        print(f"Nominatim Error: {e}")
+        
     return None, None, ""
 
 
 async def fetch_overpass_services(lat: float, lon: float, radius: float, categories: Optional[List[str]] = None) -> List[dict]:
     """
-    Fetch services around a point using Overpass API with multi-category support.
+    Fetch services around a point with multi-category support.
+
+    Served from the offline OSM store when the area has been imported,
+    otherwise from the Overpass tile cache; only tiles nobody has
+    searched recently go upstream.
     """
-    # Convert Radius km to meters
-    radius_meters = int(radius * 1000)
-    
-    # Build query parts
-    query_parts = []
-    
-    # Determine which tags to fetch
-    target_tags = []
-    
-    if categories and len(categories) > 0:
+    if categories:
         # Fetch specific requested categories
-        for cat in categories:
-            if cat in SERVICE_TAGS:
-                target_tags.extend(SERVICE_TAGS[cat])
+        tags_by_category = {cat: SERVICE_TAGS[cat] for cat in categories if cat in SERVICE_TAGS}
     else:
         # Fetch ALL generic government related services if no specific category requested
-        for key, tags in SERVICE_TAGS.items():
-            target_tags.extend(tags)
-            
-    # Add each tag query
-    for tag in target_tags:
-        query_parts.append(f'{tag}(around:{radius_meters},{lat},{lon});')
-
-    # Construct full QL query
-    ql_query = f"""
-    [out:json][timeout:25];
-    (
-      {''.join(query_parts)}
-    );
-    out body;
-    >;
-    out skel qt;
-    """
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(OVERPASS_URL, params={"data": ql_query}, timeout=30.0)
-            if response.status_code == 200:
-                return response.json().get("elements", [])
-        except Exception as e:
-            print(f"Overpass Error: {e}")
-            
-    return []
+        tags_by_category = dict(SERVICE_TAGS)
 
+    if not tags_by_category:
+        return []
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate Haversine distance in km."""
-    if not (lat1 and lon1 and lat2 and lon2):
-        return 0.0
-    R = 6371
-    try:
-        lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        return round(R * c, 2)
-    except (ValueError, TypeError):
-        return 0.0
+    store = get_osm_store()
+    if store:
+        elements = await store.find(lat, lon, radius, tags_by_category)
+        if elements is not None:
+            return elements
+    return await get_overpass_tile_cache().find(lat, lon, radius, tags_by_category)
+
+
+def find_local_centers(
+    lat: float, lon: float, radius: float, categories: List[str], limit: Optional[int] = None
+) -> List[Tuple[dict, float]]:
+    """Bundled service centers within radius, nearest first (no network)."""
+    index = get_service_center_index()
+    if limit and not categories:
+        return index.nearest(lat, lon, limit, max_radius_km=radius)
+
+    hits = index.within(lat, lon, radius)
+    if categories:
+        hits = [
+            (center, dist) for center, dist in hits
+            if LOCAL_TYPE_CATEGORIES.get(center.get("type"), "Administrative") in categories
+        ]
+    return hits[:limit] if limit else hits
 
 
 @router.get("/nearby", response_model=ServiceLocatorResponse)
@@ -148,15 +156,21 @@ async def find_nearby_services(
     pincode: Optional[str] = Query(None, description="PIN code to search near"),
     lat: Optional[float] = Query(None, description="Latitude"),
     lng: Optional[float] = Query(None, description="Longitude"),
-    radius: Optional[float] = Query(5.0, description="Search radius in km"),
+    radius: Optional[float] = Query(5.0, description="Search radius in km (clamped to 0.1-50)"),
     service: Optional[str] = Query(None, description="Type of service"),
-    type: Optional[str] = Query(None, description="Type of center (comma separated)")
+    type: Optional[str] = Query(None, description="Type of center (comma separated)"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Return only the nearest N centers")
 ):
     """
     Find services using Overpass API (High Precision).
+
+    Bundled service centers come from the in-memory spatial index and are
+    merged with the OSM results, so warm areas (and an unreachable
+    Overpass) still get an answer without waiting on the network.
     """
     search_lat, search_lon = lat, lng
     location_name = "User Location"
+    radius = min(max(radius or 5.0, MIN_RADIUS_KM), MAX_RADIUS_KM)
     
     # Resolving Location
     if pincode and (not lat or not lng):
@@ -203,9 +217,24 @@ async def find_nearby_services(
     # Deduplicate
     search_categories = list(set(search_categories))
 
-    # Fetch Data with Multi-Category Support
+    # Fetch Data with Multi-Category Support (nearest first, with distances)
     raw_data = await fetch_overpass_services(search_lat, search_lon, radius, search_categories)
-    
+    local_centers = [
+        ServiceCenter(
+            name=center["name"],
+            type=center["type"],
+            address=center["address"],
+            pincode=center["pincode"],
+            latitude=center["latitude"],
+            longitude=center["longitude"],
+            distance=round(dist, 2),
+            phone=center.get("phone"),
+            timings=center.get("timings"),
+            services=center.get("services", [])
+        )
+        for center, dist in find_local_centers(search_lat, search_lon, radius, search_categories, limit)
+    ]
+
     # Process Results
     centers = []
     seen_ids = set()
@@ -213,10 +242,11 @@ async def find_nearby_services(
     for item in raw_data:
         # Only process nodes/ways with tags
         tags = item.get("tags", {})
-        if not tags or item["id"] in seen_ids:
+        element_key = (item.get("type"), item["id"])
+        if not tags or element_key in seen_ids:
             continue
             
-        seen_ids.add(item["id"])
+        seen_ids.add(element_key)
         
         name = tags.get("name") or tags.get("name:en")
         if not name:
@@ -235,7 +265,7 @@ async def find_nearby_services(
         if not ilat:
             continue
 
-        dist = calculate_distance(search_lat, search_lon, ilat, ilon)
+        dist = round(item["distance"], 2)
         
         # Infer Services
         services_offered = ["General Inquiry"]
@@ -258,9 +288,27 @@ async def find_nearby_services(
             )
         )
         
-    # Sort by distance
-    centers.sort(key=lambda x: x.distance or float('inf'))
-    
+    # A bundled center is dropped only when OSM has the same place (same name, close by);
+    # OSM elements are distinct by id and never merged with each other
+    osm_by_name: Dict[str, List[ServiceCenter]] = {}
+    for center in centers:
+        osm_by_name.setdefault(center.name.lower(), []).append(center)
+    local_centers = [
+        center for center in local_centers
+        if not any(
+            dist <= DUPLICATE_DISTANCE_KM
+            for dist in haversine_km(
+                center.latitude, center.longitude,
+                [c.latitude for c in osm_by_name.get(center.name.lower(), [])],
+                [c.longitude for c in osm_by_name.get(center.name.lower(), [])],
+            )
+        )
+    ]
+
+    # Both lists are already nearest first
+    merged = list(heapq.merge(local_centers, centers, key=lambda x: x.distance))
+    centers = merged[:limit] if limit else merged
+
     return ServiceLocatorResponse(services=centers, total=len(centers))
 
 
@@ -271,8 +319,15 @@ async def get_service_types():
 @router.get("/reverse")
 async def reverse_geocode(lat: float, lng: float):
     """
-    Reverse geocode Lat/Lng to Address via Nominatim
+    Reverse geocode Lat/Lng to Address via Nominatim (cached)
     """
+    cache = get_geocode_cache()
+    cache_key = make_reverse_key(lat, lng)
+    if cache:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     params = {
         "lat": lat,
         "lon": lng,
@@ -281,32 +336,40 @@ async def reverse_geocode(lat: float, lng: float):
         "addressdetails": 1
     }
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(NOMINATIM_URL.replace("search", "reverse"), params=params, headers=HEADERS, timeout=10.0)
-            if response.status_code == 200:
-                data = response.json()
-                address = data.get("address", {})
-                
-                # Construct a friendly area name
-                area_parts = [
-                    address.get("suburb"),
-                    address.get("neighbourhood"), 
-                    address.get("residential"),
-                    address.get("village"),
-                    address.get("hamlet"),
-                    address.get("road"),
-                    address.get("city") or address.get("town") or address.get("county") or address.get("district")
-                ]
-                area_name = ", ".join([p for p in area_parts if p])
-                
-                return {
-                    "display_name": data.get("display_name"),
-                    "area": area_name,
-                    "pincode": address.get("postcode", "")
-                }
-        except Exception as e:
-            print(f"Nominatim Reverse Error: {e}")
+    try:
+        response = await get_http_client("nominatim").get(
+            f"{get_settings().nominatim_url}/reverse", params=params
+        )
+        if response.status_code == 200:
+            data = response.json()
+            if "error" in data:
+                # e.g. {"error": "Unable to geocode"} for points at sea; not cached
+                print(f"Nominatim Reverse Error: {data['error']}")
+                return {"error": "Failed to resolve location"}
+            address = data.get("address", {})
+            
+            # Construct a friendly area name
+            area_parts = [
+                address.get("suburb"),
+                address.get("neighbourhood"), 
+                address.get("residential"),
+                address.get("village"),
+                address.get("hamlet"),
+                address.get("road"),
+                address.get("city") or address.get("town") or address.get("county") or address.get("district")
+            ]
+            area_name = ", ".join([p for p in area_parts if p])
             
+            result = {
+                "display_name": data.get("display_name"),
+                "area": area_name,
+                "pincode": address.get("postcode", "")
+            }
+            if cache:
+                await cache.set(cache_key, result, ttl=REVERSE_TTL)
+            return result
+    except Exception as e:
+        print(f"Nominatim Reverse Error: {e}")
+        
     return {"error": "Failed to resolve location"}
 
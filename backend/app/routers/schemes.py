@@ -4,17 +4,26 @@ Schemes Router - Scheme Discovery & Eligibility (AI-First + Multilingual)
 GET    /api/schemes           - Backward compatible (English only)
 POST   /api/schemes           - Multilingual support
 POST   /api/schemes/check-eligibility
+POST   /api/schemes/check-eligibility/batch - One profile vs many schemes (NDJSON stream)
 GET    /api/schemes/categories
+GET    /api/schemes/{scheme_id} - Single scheme (no AI for English, HTTP-cacheable)
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Dict, Optional
+import asyncio
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, Dict, Optional, Tuple
 
 from app.models.schemas import (
+    Scheme,
     SchemeSearchRequest,
     SchemeSearchResponse,
     EligibilityRequest,
-    EligibilityResponse
+    EligibilityResponse,
+    BatchEligibilityRequest,
+    BatchEligibilityItem
 )
 
 from app.ai.scheme_ai import (
@@ -22,10 +31,14 @@ from app.ai.scheme_ai import (
     check_eligibility_smart
 )
 
-from app.utils.translator import to_english, from_english
+from app.services.scheme_catalog import get_scheme_catalog
+from app.utils.translator import to_english, from_english, fields_to_english, translate_value_complete
 
 router = APIRouter()
 
+# Browsers may reuse a scheme page for 5 minutes, CDNs serve stale for a day
+SCHEME_DETAIL_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+
 
 # -------------------------------------------------------------------
 # 🔍 SCHEME SEARCH (GET - BACKWARD COMPATIBLE)
@@ -92,7 +105,7 @@ async def list_schemes(request: SchemeSearchRequest):
 
     # 3️⃣ Prepare structured response
     response_en: Dict = {
-        "schemes": schemes,
+        "schemes": [s.model_dump() for s in schemes],
         "total": total
     }
 
@@ -127,17 +140,8 @@ async def check_scheme_eligibility(request: EligibilityRequest):
         )
 
     # 1️⃣ Translate relevant text fields → English
-    try:
-        occupation_en = await to_english(request.occupation or "", request.language)
-        state_en = await to_english(request.state or "", request.language)
-        category_en = await to_english(request.category or "", request.language)
-    except Exception as e:
-        print(f"[Eligibility] Translation to English failed: {e}")
-        occupation_en = request.occupation or ""
-        state_en = request.state or ""
-        category_en = request.category or ""
+    occupation_en, state_en, category_en = await _profile_to_english(request)
 
-    # 2️⃣ AI eligibility reasoning (English)
     # 2️⃣ AI eligibility reasoning (English)
     result_en = await check_eligibility_smart(
         scheme_id=request.scheme_id,
@@ -158,6 +162,91 @@ async def check_scheme_eligibility(request: EligibilityRequest):
     return result_final
 
 
+@router.post("/check-eligibility/batch")
+async def check_scheme_eligibility_batch(request: BatchEligibilityRequest):
+    """
+    Check one citizen profile against many schemes in a single request.
+
+    - Profile is translated to English ONCE
+    - Rule engine answers clear-cut schemes instantly; the rest go to
+      the AI concurrently (bounded by the LLM gateway)
+    - Results stream back as newline-delimited JSON (one
+      BatchEligibilityItem per line) in completion order; a scheme that
+      fails yields {"scheme_id": ..., "error": ...} instead
+    """
+    catalog = get_scheme_catalog()
+    scheme_ids = request.scheme_ids or [s.id for s in catalog.schemes]
+
+    # 1️⃣ Translate the profile once for all schemes
+    occupation_en, state_en, category_en = await _profile_to_english(request)
+
+    async def evaluate(scheme_id: str) -> BatchEligibilityItem:
+        # 2️⃣ Rules / AI eligibility reasoning (English)
+        result_en = await check_eligibility_smart(
+            scheme_id=scheme_id,
+            age=request.age,
+            income=request.income,
+            occupation=occupation_en,
+            state=state_en,
+            category=category_en
+        )
+
+        # 3️⃣ Translate result → selected language
+        try:
+            result_final = EligibilityResponse(**await from_english(result_en.dict(), request.language))
+        except Exception as e:
+            print(f"[Eligibility Batch] Translation from English failed: {e}")
+            result_final = result_en  # Fallback to English
+
+        scheme = catalog.get(scheme_id)
+        return BatchEligibilityItem(
+            scheme_id=scheme_id,
+            scheme_name=scheme.name if scheme else None,
+            result=result_final
+        )
+
+    async def evaluate_line(scheme_id: str) -> str:
+        # One failing scheme becomes an error line instead of ending the stream
+        try:
+            return (await evaluate(scheme_id)).model_dump_json() + "\n"
+        except Exception as e:
+            print(f"[Eligibility Batch] Scheme {scheme_id} failed: {e}")
+            error = {"scheme_id": scheme_id, "error": "Eligibility check failed"}
+            return json.dumps(error, separators=(",", ":")) + "\n"
+
+    async def stream() -> AsyncIterator[str]:
+        tasks = [asyncio.ensure_future(evaluate_line(sid)) for sid in dict.fromkeys(scheme_ids)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away - stop the remaining work
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+async def _profile_to_english(request) -> Tuple[str, str, str]:
+    """
+    Translate occupation, state and category of a request to English.
+
+    Uses one batched translation (state names and categories usually
+    resolve from the local dictionary with no AI call at all).
+    """
+    fields = {
+        "occupation": request.occupation or "",
+        "state": request.state or "",
+        "category": request.category or "",
+    }
+    try:
+        fields = await fields_to_english(fields, request.language)
+    except Exception as e:
+        print(f"[Eligibility] Translation to English failed: {e}")
+
+    return fields["occupation"], fields["state"], fields["category"]
+
+
 # -------------------------------------------------------------------
 # 📂 SCHEME CATEGORIES (STATIC, NO AI NEEDED)
 # -------------------------------------------------------------------
@@ -180,3 +269,71 @@ async def get_categories():
             "Business"
         ]
     }
+
+
+# -------------------------------------------------------------------
+# 📄 SCHEME DETAIL (O(1) LOOKUP, HTTP-CACHEABLE)
+# -------------------------------------------------------------------
+# Registered last so "/categories" is not captured as a scheme id.
+
+@router.get("/{scheme_id}", response_model=Scheme)
+async def get_scheme(
+    scheme_id: str,
+    request: Request,
+    language: str = Query("en", description="Language code: en, te, hi, etc.")
+):
+    """
+    Return a single scheme by ID.
+
+    - Served straight from the in-memory catalog (no AI for English)
+    - ETag / Last-Modified follow schemes.json, so clients can revalidate
+      with If-None-Match / If-Modified-Since and get 304 Not Modified
+    - A translation that fell back to English is sent with no-store
+    """
+    catalog = get_scheme_catalog()
+    scheme = catalog.get(scheme_id)
+
+    if not scheme:
+        raise HTTPException(status_code=404, detail="Scheme not found")
+
+    etag = f'"{catalog.content_hash[:16]}-{scheme_id}-{language}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(catalog.mtime, usegmt=True),
+        "Cache-Control": SCHEME_DETAIL_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+
+    if _is_not_modified(request, etag, catalog.mtime):
+        return Response(status_code=304, headers=headers)
+
+    content = scheme.model_dump()
+
+    if language != "en":
+        try:
+            content, complete = await translate_value_complete(content, language)
+        except Exception as e:
+            print(f"[Schemes] Translation from English failed: {e}")
+            complete = False
+        if not complete:
+            # (Partly) English fallback: must not be stored under the localized ETag
+            headers = {"Cache-Control": "no-store", "Vary": "Accept-Encoding"}
+
+    return JSONResponse(content=content, headers=headers)
+
+
+def _is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate conditional request headers (If-None-Match wins over If-Modified-Since)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
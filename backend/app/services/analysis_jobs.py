@@ -0,0 +1,311 @@
+"""
+Form Analysis Jobs for GovConnect
+
+POST /api/forms/upload hands the spooled file to this queue and answers
+with a job id straight away; OCR and the LLM call no longer run inside
+the HTTP request.
+
+- Workers: a few asyncio tasks per uvicorn worker take jobs from an
+  in-process queue and run the stages
+      queued -> ocr (text and fields) -> guidance -> done
+- State: every stage change is written to a SQLite file shared by all
+  workers, so GET /api/forms/jobs/{id} and the SSE stream work whichever
+  worker the poll lands on
+- A job that stops making progress (its worker died or restarted) is
+  reported as failed once ANALYSIS_JOB_TIMEOUT_SECONDS pass; finished
+  jobs are dropped after ANALYSIS_JOB_RETENTION_SECONDS
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from app.config import get_settings
+from app.utils.uploads import SpooledUpload
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "analysis_jobs.sqlite3"
+
+# Progress (percent) reported when a stage starts
+STAGE_PROGRESS = {"queued": 0, "ocr": 10, "guidance": 70, "done": 100}
+FINISHED_STATUSES = ("done", "failed")
+
+
+class AnalysisJobQueue:
+    """In-process job queue with job state in SQLite."""
+
+    def __init__(self, db_path: Path, workers: int, max_pending: int):
+        self.db_path = db_path
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        # job_id -> one Event per local watcher, set on every state change
+        self._listeners: Dict[str, Set[asyncio.Event]] = {}
+        self._db_lock = threading.Lock()
+        self._conn = self._open_db()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the worker tasks (called from the app lifespan)."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            print(f"[Analysis Jobs] Started {self.workers} workers")
+
+    async def stop(self):
+        """Cancel the workers and drop the spooled files of queued jobs."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self._queue.empty():
+            _, upload, _ = self._queue.get_nowait()
+            upload.close()
+
+    async def submit(self, upload: SpooledUpload, filename: str, purpose: str) -> str:
+        """
+        Queue an uploaded form for analysis and return its job id.
+
+        Raises asyncio.QueueFull when too many jobs are waiting.
+        """
+        if self._queue.full():
+            raise asyncio.QueueFull()
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        await asyncio.to_thread(
+            self._db_execute,
+            "INSERT INTO jobs (id, status, stage, progress, message, filename, created_at, updated_at) "
+            "VALUES (?, 'queued', 'queued', 0, ?, ?, ?, ?)",
+            (job_id, "Waiting for a worker", filename, now, now),
+        )
+        try:
+            self._queue.put_nowait((job_id, upload, {"filename": filename, "purpose": purpose}))
+        except asyncio.QueueFull:
+            # Filled up while the row was being written
+            await self._update(job_id, status="failed", error="Too many forms are being analyzed")
+            raise
+        print(f"[Analysis Jobs] Queued {job_id[:8]} ({filename}, {self._queue.qsize()} waiting)")
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Current state of a job, or None if unknown or expired."""
+        row = await asyncio.to_thread(self._db_get, job_id)
+        if row is None:
+            return None
+
+        job = self._row_to_job(row)
+        timeout = get_settings().analysis_job_timeout_seconds
+        if job["status"] not in FINISHED_STATUSES and time.time() - row["updated_at"] > timeout:
+            job.update(status="failed", error="Analysis was interrupted, please upload again")
+        return job
+
+    async def watch(self, job_id: str) -> AsyncIterator[dict]:
+        """
+        Yield the job state every time it changes, until it finishes.
+
+        Jobs run by this process wake the watcher immediately; jobs of
+        other workers are picked up by polling the database.
+        """
+        event = asyncio.Event()
+        self._listeners.setdefault(job_id, set()).add(event)
+        last_seen = None
+        try:
+            while True:
+                job = await self.get(job_id)
+                if job is None:
+                    return
+                snapshot = (job["status"], job["stage"], job["progress"], job["message"])
+                if snapshot != last_seen:
+                    last_seen = snapshot
+                    yield job
+                if job["status"] in FINISHED_STATUSES:
+                    return
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        finally:
+            watchers = self._listeners.get(job_id, set())
+            watchers.discard(event)
+            if not watchers:
+                self._listeners.pop(job_id, None)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def _worker(self):
+        while True:
+            job_id, upload, params = await self._queue.get()
+            try:
+                result = await self._run(job_id, upload, params)
+                await self._update(job_id, status="done", stage="done", message="Analysis complete",
+                                   result=result)
+            except asyncio.CancelledError:
+                if self._stopping or asyncio.current_task().cancelling():
+                    await self._update(job_id, status="failed", message="Server is shutting down",
+                                       error="Analysis was interrupted, please upload again")
+                    raise
+                # A cancelled inner future (not this worker): fail the job, keep the worker
+                print(f"[Analysis Jobs] {job_id[:8]} failed: a step was cancelled")
+                await self._update(job_id, status="failed", message="Analysis failed",
+                                   error="Analysis was interrupted, please upload again")
+            except Exception as e:
+                print(f"[Analysis Jobs] {job_id[:8]} failed: {e}")
+                await self._update(job_id, status="failed", message="Analysis failed", error=str(e))
+            finally:
+                upload.close()
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, upload: SpooledUpload, params: dict) -> dict:
+        """OCR -> field extraction -> guidance; returns what the old synchronous endpoint returned."""
+        from app.ai.document_analyzer import get_document_analyzer
+        from app.ai.form_analyzer import analyze_form, analyze_with_extracted_fields
+        from app.ai.image_ocr import guess_mime_type
+
+        await self._update(job_id, status="running", stage="ocr", message="Reading the document")
+        doc_result = await get_document_analyzer().analyze_document(
+            upload.source, guess_mime_type(params["filename"]), document_id=upload.sha256
+        )
+        # The spooled file is not needed past OCR
+        upload.close()
+
+        if not doc_result.get("success"):
+            # Fallback: use filename as hint for template-based guidance
+            form_type = Path(params["filename"]).stem.replace("_", " ").replace("-", " ")
+            await self._update(job_id, stage="guidance",
+                               message="No text found, preparing guidance for this form type")
+            result = await analyze_form(form_type=form_type, purpose=params["purpose"])
+            return {
+                "analysis_method": "template",
+                "form_type": form_type,
+                "guidance": result.model_dump(),
+                "extracted_fields": []
+            }
+
+        # Fields come out of the OCR stage; guidance is the next real step
+        await self._update(job_id, stage="guidance",
+                           message=f"Found {len(doc_result['fields'])} fields, preparing filling guidance")
+        guidance = await analyze_with_extracted_fields(
+            extracted_fields=doc_result["fields"],
+            paragraphs=doc_result["paragraphs"],
+            purpose=params["purpose"]
+        )
+        return {
+            "analysis_method": "document_intelligence",
+            "page_count": doc_result.get("page_count", 0),
+            "extracted_fields": doc_result["fields"],
+            "tables": doc_result.get("tables", []),
+            "guidance": guidance.model_dump(by_alias=True)
+        }
+
+    async def _update(self, job_id: str, status: Optional[str] = None, stage: Optional[str] = None,
+                      message: Optional[str] = None, result: Optional[dict] = None,
+                      error: Optional[str] = None):
+        """Record a state change and wake local watchers."""
+        columns = {"updated_at": time.time()}
+        if status:
+            columns["status"] = status
+        if stage:
+            columns["stage"] = stage
+            columns["progress"] = STAGE_PROGRESS[stage]
+        if message:
+            columns["message"] = message
+        if result is not None:
+            columns["result"] = json.dumps(result, ensure_ascii=False)
+        if error:
+            columns["error"] = error
+
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        await asyncio.to_thread(
+            self._db_execute,
+            f"UPDATE jobs SET {assignments} WHERE id = ?",
+            (*columns.values(), job_id),
+        )
+        for event in self._listeners.get(job_id, ()):
+            event.set()
+
+    # ------------------------------------------------------------------
+    # SQLite (runs in worker threads)
+    # ------------------------------------------------------------------
+
+    def _open_db(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        # WAL lets several uvicorn workers read while one writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                progress INTEGER NOT NULL,
+                message TEXT,
+                filename TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs(updated_at)")
+        conn.commit()
+        return conn
+
+    def _db_execute(self, sql: str, params: tuple):
+        retention = get_settings().analysis_job_retention_seconds
+        with self._db_lock:
+            self._conn.execute(sql, params)
+            if sql.startswith("INSERT"):
+                # Forget jobs nobody has looked at for a while
+                self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - retention,))
+            self._conn.commit()
+
+    def _db_get(self, job_id: str) -> Optional[sqlite3.Row]:
+        with self._db_lock:
+            return self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> dict:
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "stage": row["stage"],
+            "progress": row["progress"],
+            "message": row["message"],
+            "filename": row["filename"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+        }
+
+
+# Global instance
+_job_queue: Optional[AnalysisJobQueue] = None
+
+
+def get_job_queue() -> AnalysisJobQueue:
+    """Get or create the analysis job queue."""
+    global _job_queue
+    if _job_queue is None:
+        settings = get_settings()
+        db_path = Path(settings.analysis_jobs_path) if settings.analysis_jobs_path else DEFAULT_DB_PATH
+        _job_queue = AnalysisJobQueue(
+            db_path=db_path,
+            workers=settings.analysis_job_workers,
+            max_pending=settings.analysis_job_max_pending,
+        )
+    return _job_queue
@@ -0,0 +1,245 @@
+"""
+Tiered Cache for GovConnect
+
+Two tiers behind one interface:
+1. In-memory LRU (per worker, microsecond hits)
+2. SQLite file on disk (shared by all workers, survives restarts)
+
+Values must be JSON-serializable. Keys are stable content hashes,
+so the same input maps to the same entry in every process.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+
+def stable_hash(*parts: Any) -> str:
+    """
+    Build a process-independent cache key from arbitrary JSON-able parts.
+
+    Unlike Python's hash(), BLAKE2 digests are identical across workers
+    and restarts.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional SQLite store, with TTLs."""
+
+    def __init__(
+        self,
+        name: str,
+        db_path: Optional[Path] = None,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 10000,
+        default_ttl: int = 3600,
+    ):
+        self.name = name
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.default_ttl = default_ttl
+
+        # key -> (expires_at, namespace, serialized value)
+        self._memory: "OrderedDict[str, tuple[float, str, str]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+
+        if db_path:
+            try:
+                self._open_db()
+            except Exception as e:
+                print(f"[Cache:{name}] Disk tier disabled: {e}")
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return cached value or None if missing/expired."""
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry:
+            expires_at, _, raw = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return json.loads(raw)
+            del self._memory[key]
+
+        if self._conn is not None:
+            row = await asyncio.to_thread(self._db_get, key, now)
+            if row:
+                expires_at, namespace, raw = row
+                self._remember(key, expires_at, namespace, raw)
+                self.hits_disk += 1
+                return json.loads(raw)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, namespace: str = "default"):
+        """Store a value in both tiers. A TTL of 0 disables caching."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        raw = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, namespace, raw)
+        self.sets += 1
+
+        if self._conn is not None:
+            await asyncio.to_thread(self._db_set, key, namespace, raw, expires_at)
+
+    async def delete(self, key: str):
+        """Remove a single entry from both tiers."""
+        self._memory.pop(key, None)
+        if self._conn is not None:
+            await asyncio.to_thread(self._db_execute, "DELETE FROM entries WHERE key = ?", (key,))
+
+    async def invalidate(self, namespace: Optional[str] = None):
+        """Drop every entry, or only the entries of one namespace."""
+        if namespace is None:
+            self._memory.clear()
+            if self._conn is not None:
+                await asyncio.to_thread(self._db_execute, "DELETE FROM entries", ())
+        else:
+            for key in [k for k, v in self._memory.items() if v[1] == namespace]:
+                del self._memory[key]
+            if self._conn is not None:
+                await asyncio.to_thread(
+                    self._db_execute, "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                )
+        print(f"[Cache:{self.name}] Invalidated {namespace or 'all entries'}")
+
+    async def prune(self):
+        """Drop expired entries now instead of waiting for the periodic prune."""
+        now = time.time()
+        for key in [k for k, v in self._memory.items() if v[0] <= now]:
+            del self._memory[key]
+        if self._conn is not None:
+            await asyncio.to_thread(self._db_execute, "DELETE FROM entries WHERE expires_at <= ?", (now,))
+
+    def stats(self) -> dict:
+        """Hit/miss counters and tier sizes for health reporting."""
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "disk_enabled": self._conn is not None,
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits_memory + self.hits_disk) / lookups, 3) if lookups else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, expires_at: float, namespace: str, raw: str):
+        self._memory[key] = (expires_at, namespace, raw)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Disk tier (runs in worker threads)
+    # ------------------------------------------------------------------
+
+    def _open_db(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=5.0)
+        # WAL lets several uvicorn workers read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_namespace ON entries(namespace)")
+        self._conn.commit()
+
+    def _db_get(self, key: str, now: float) -> Optional[tuple]:
+        try:
+            with self._db_lock:
+                row = self._conn.execute(
+                    "SELECT expires_at, namespace, value FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if not row:
+                    return None
+                if row[0] <= now:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                    return None
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                return row
+        except sqlite3.Error as e:
+            print(f"[Cache:{self.name}] Read error: {e}")
+            return None
+
+    def _db_set(self, key: str, namespace: str, raw: str, expires_at: float):
+        try:
+            with self._db_lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, namespace, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, namespace, raw, expires_at, time.time()),
+                )
+                self._conn.commit()
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= 100:
+                    self._writes_since_prune = 0
+                    self._prune()
+        except sqlite3.Error as e:
+            print(f"[Cache:{self.name}] Write error: {e}")
+
+    def _db_execute(self, sql: str, params: tuple):
+        try:
+            with self._db_lock:
+                self._conn.execute(sql, params)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"[Cache:{self.name}] Error: {e}")
+
+    def _prune(self):
+        """Drop expired rows, then least-recently-used rows over the size limit."""
+        self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += overflow
+        self._conn.commit()
@@ -0,0 +1,304 @@
+"""
+Eligibility Rule Engine for GovConnect
+
+Compiles the structured rules in data/scheme_rules.json (age ranges,
+income ceilings, occupation and category sets, state lists) into
+per-scheme check lists that evaluate in microseconds.
+
+Outcomes:
+- "ineligible"   : a hard rule failed -> answered locally
+- "eligible"     : at least one rule was checked, every checkable rule
+                   passed and nothing is ambiguous -> answered locally
+                   (documents still need verification)
+- "undetermined" : missing profile data or criteria that need reasoning
+                   -> escalated to the AI
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.models.schemas import EligibilityResponse, Scheme
+
+
+RULES_PATH = Path(__file__).parent.parent / "data" / "scheme_rules.json"
+
+ELIGIBLE = "eligible"
+INELIGIBLE = "ineligible"
+UNDETERMINED = "undetermined"
+
+# Free text that fits more than one alias group (e.g. "agricultural labourer")
+AMBIGUOUS_GROUP = "ambiguous"
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class UserProfile:
+    """Applicant details as provided (already translated to English)."""
+    age: Optional[int] = None
+    income: Optional[int] = None
+    occupation: Optional[str] = None
+    state: Optional[str] = None
+    category: Optional[str] = None
+
+
+@dataclass
+class RuleOutcome:
+    """Result of evaluating one scheme's rules against a profile."""
+    scheme_id: str
+    decision: str
+    passed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    verify: List[str] = field(default_factory=list)
+    ambiguous: List[str] = field(default_factory=list)
+
+    @property
+    def is_clear_cut(self) -> bool:
+        """True when the outcome can be returned without AI reasoning."""
+        return self.decision != UNDETERMINED
+
+
+# A compiled check returns (status, message) where status is
+# "pass", "fail", "missing" or "unknown"
+Check = Callable[[UserProfile], tuple]
+
+
+def _words_match(alias: List[str], words: List[str], start: int) -> bool:
+    """alias words at words[start:]; short codes whole, longer ones as word prefixes."""
+    if start + len(alias) > len(words):
+        return False
+    for expected, word in zip(alias, words[start:]):
+        # Short codes like 'sc', 'bc' must match whole words
+        matched = word == expected if len(expected) <= 3 else word.startswith(expected)
+        if not matched:
+            return False
+    return True
+
+
+def _match_alias(value: str, aliases: Dict[str, List[str]]) -> Optional[str]:
+    """
+    Map free text (e.g. 'Small farmer') to a canonical group (e.g. 'farmer').
+
+    Aliases match at word boundaries ('agricultur' matches 'agricultural',
+    'shop' matches 'shopkeeper'). Text that fits several groups returns
+    AMBIGUOUS_GROUP so the decision goes to the AI.
+    """
+    words = _WORD_RE.findall(value.lower())
+    groups = {
+        group
+        for group, names in aliases.items()
+        for name in names
+        if any(_words_match(_WORD_RE.findall(name), words, i) for i in range(len(words)))
+    }
+    if len(groups) > 1:
+        return AMBIGUOUS_GROUP
+    return groups.pop() if groups else None
+
+
+def _compile_range(attr: str, label: str, spec: dict, fmt: Callable[[int], str] = str) -> Check:
+    low = spec.get("min")
+    high = spec.get("max")
+    desc = f"{label} " + (
+        f"between {fmt(low)} and {fmt(high)}" if low is not None and high is not None
+        else f"at most {fmt(high)}" if high is not None
+        else f"at least {fmt(low)}"
+    )
+
+    def check(profile: UserProfile) -> tuple:
+        value = getattr(profile, attr)
+        # 0 is what the frontend sends for "not filled in"
+        if not value:
+            return "missing", desc
+        if low is not None and value < low:
+            return "fail", f"{desc} (yours: {fmt(value)})"
+        if high is not None and value > high:
+            return "fail", f"{desc} (yours: {fmt(value)})"
+        return "pass", f"{desc} (yours: {fmt(value)})"
+
+    return check
+
+
+def _compile_set(attr: str, label: str, spec: dict, aliases: Dict[str, List[str]]) -> Check:
+    include = set(spec.get("include", []))
+    exclude = set(spec.get("exclude", []))
+    readable = ", ".join(sorted(include)) if include else "any"
+    desc = f"{label} must be one of: {readable}".replace("_", " ")
+
+    def check(profile: UserProfile) -> tuple:
+        value = getattr(profile, attr)
+        if not value or not value.strip():
+            return "missing", desc
+        group = _match_alias(value, aliases)
+        if group is None or group == AMBIGUOUS_GROUP:
+            # Unrecognised or mixed wording - let the AI interpret it
+            return "unknown", f"{desc} (yours: {value})"
+        if group in exclude:
+            return "fail", f"{desc} (yours: {value})"
+        if include and group not in include:
+            # With an explicit exclude list, anything not listed needs judgement
+            if exclude:
+                return "unknown", f"{desc} (yours: {value})"
+            return "fail", f"{desc} (yours: {value})"
+        return "pass", f"{desc} (yours: {value})"
+
+    return check
+
+
+def _compile_states(spec: dict) -> Check:
+    include = {s.lower() for s in spec.get("include", [])}
+    desc = f"Resident of: {', '.join(spec.get('include', []))}"
+
+    def check(profile: UserProfile) -> tuple:
+        if not profile.state:
+            return "missing", desc
+        if profile.state.strip().lower() in include:
+            return "pass", desc
+        return "fail", f"{desc} (yours: {profile.state})"
+
+    return check
+
+
+@dataclass
+class CompiledRule:
+    """All checks for one scheme."""
+    scheme_id: str
+    checks: List[Check]
+    verify: List[str]
+    ambiguous: List[str]
+
+    def evaluate(self, profile: UserProfile) -> RuleOutcome:
+        outcome = RuleOutcome(
+            scheme_id=self.scheme_id,
+            decision=UNDETERMINED,
+            verify=list(self.verify),
+            ambiguous=list(self.ambiguous),
+        )
+
+        for check in self.checks:
+            status, message = check(profile)
+            if status == "pass":
+                outcome.passed.append(message)
+            elif status == "fail":
+                outcome.failed.append(message)
+            elif status == "missing":
+                outcome.missing.append(message)
+            else:
+                outcome.ambiguous.append(message)
+
+        if outcome.failed:
+            outcome.decision = INELIGIBLE
+        elif outcome.passed and not outcome.missing and not outcome.ambiguous:
+            # A scheme with nothing checkable (verify-only) is never approved locally
+            outcome.decision = ELIGIBLE
+        return outcome
+
+
+class EligibilityRuleEngine:
+    """Compiled rules for every scheme that has structured criteria."""
+
+    def __init__(self, rules: Dict[str, CompiledRule]):
+        self.rules = rules
+
+    @classmethod
+    def from_file(cls, path: Path = RULES_PATH) -> "EligibilityRuleEngine":
+        if not path.exists():
+            print(f"[Eligibility Rules] {path.name} not found, all checks go to AI")
+            return cls({})
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        aliases = data.get("aliases", {})
+        occupation_aliases = aliases.get("occupation", {})
+        category_aliases = aliases.get("category", {})
+
+        rules = {}
+        for scheme_id, spec in data.get("schemes", {}).items():
+            checks: List[Check] = []
+            if "age" in spec:
+                checks.append(_compile_range("age", "Age", spec["age"], lambda v: f"{v} years"))
+            if "income" in spec:
+                checks.append(_compile_range("income", "Annual family income", spec["income"], lambda v: f"₹{v:,}"))
+            if "occupation" in spec:
+                checks.append(_compile_set("occupation", "Occupation", spec["occupation"], occupation_aliases))
+            if "category" in spec:
+                checks.append(_compile_set("category", "Social category", spec["category"], category_aliases))
+            if "states" in spec:
+                checks.append(_compile_states(spec["states"]))
+
+            rules[scheme_id] = CompiledRule(
+                scheme_id=scheme_id,
+                checks=checks,
+                verify=spec.get("verify", []),
+                ambiguous=spec.get("ambiguous", []),
+            )
+
+        print(f"[Eligibility Rules] Compiled rules for {len(rules)} schemes")
+        return cls(rules)
+
+    def evaluate(self, scheme_id: str, profile: UserProfile) -> Optional[RuleOutcome]:
+        """Evaluate one scheme. None if the scheme has no structured rules."""
+        rule = self.rules.get(scheme_id)
+        return rule.evaluate(profile) if rule else None
+
+    def evaluate_all(
+        self,
+        profile: UserProfile,
+        scheme_ids: Optional[List[str]] = None
+    ) -> Dict[str, RuleOutcome]:
+        """Evaluate one profile against many (default: all) schemes at once."""
+        ids = scheme_ids if scheme_ids is not None else list(self.rules)
+        return {sid: self.rules[sid].evaluate(profile) for sid in ids if sid in self.rules}
+
+
+def build_local_response(scheme: Scheme, outcome: RuleOutcome) -> EligibilityResponse:
+    """Turn a rule outcome into the same response shape the AI produces."""
+    if outcome.decision == INELIGIBLE:
+        explanation = (
+            f"Based on the details provided, you do not appear to meet the criteria for "
+            f"{scheme.name}: " + "; ".join(outcome.failed) + "."
+        )
+        return EligibilityResponse(
+            eligible=False,
+            confidence=95,
+            explanation=explanation,
+            missing_requirements=outcome.missing,
+            warnings=["Criteria may change; confirm on the official portal."],
+            recommendations=["Browse other schemes that match your profile at /api/schemes"]
+        )
+
+    if outcome.decision == ELIGIBLE:
+        met = "; ".join(outcome.passed) if outcome.passed else "the general criteria"
+        explanation = (
+            f"Based on the details provided, you appear to meet the criteria for "
+            f"{scheme.name} ({met})."
+        )
+        if outcome.verify:
+            explanation += " A few conditions still need to be confirmed with your documents."
+        return EligibilityResponse(
+            eligible=True,
+            confidence=85 if outcome.verify else 95,
+            explanation=explanation,
+            missing_requirements=outcome.verify,
+            warnings=["Application subject to document verification"],
+            recommendations=[
+                "Gather all required documents before applying",
+                *[f"Keep ready: {doc}" for doc in scheme.documents[:3]]
+            ]
+        )
+
+    # Undetermined - only used when the AI could not be reached
+    explanation = f"We could not fully determine your eligibility for {scheme.name} from the details provided."
+    if outcome.passed:
+        explanation += " Criteria you meet: " + "; ".join(outcome.passed) + "."
+    return EligibilityResponse(
+        eligible=False,
+        confidence=40,
+        explanation=explanation,
+        missing_requirements=outcome.missing + outcome.ambiguous + outcome.verify,
+        warnings=["AI analysis unavailable - partial rule-based check only"],
+        recommendations=["Provide the missing details and check again", "Contact the scheme's helpline or local office"]
+    )
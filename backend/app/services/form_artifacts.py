@@ -0,0 +1,227 @@
+"""
+Prebuilt Form Artifacts for GovConnect
+
+The PDFs listed in data/forms.json never change between deploys, so their
+OCR text, paragraphs and fields are extracted once and stored in
+data/form_artifacts.json, keyed by the SHA-256 of each file.
+POST /api/forms/{form_id}/analyze then skips OCR entirely.
+
+Built offline, and the CLI is the only writer:
+    python -m app.services.form_artifacts build [--force]
+It rebuilds any form whose file changed, whose artifact is missing, or
+that can now be upgraded from local to Google OCR. The API only reads
+the file; at startup it reports forms that need a build, and until then
+those forms are analyzed live.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+ARTIFACTS_PATH = Path(__file__).parent.parent / "data" / "form_artifacts.json"
+
+# Bump when the artifact layout or extraction logic changes
+ARTIFACT_VERSION = 2
+
+# Global instance
+_artifacts: Optional[Dict[str, dict]] = None
+
+
+def _load_artifacts() -> Dict[str, dict]:
+    """Load data/form_artifacts.json once (artifacts of other versions are dropped)."""
+    global _artifacts
+    if _artifacts is None:
+        try:
+            with open(ARTIFACTS_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _artifacts = data.get("forms", {}) if data.get("version") == ARTIFACT_VERSION else {}
+        except FileNotFoundError:
+            _artifacts = {}
+        except Exception as e:
+            print(f"[Form Artifacts] Could not read {ARTIFACTS_PATH.name}: {e}")
+            _artifacts = {}
+    return _artifacts
+
+
+def _save_artifacts(artifacts: Dict[str, dict]):
+    """Atomically write the artifact file (compact JSON)."""
+    tmp_path = ARTIFACTS_PATH.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": ARTIFACT_VERSION, "forms": artifacts}, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, ARTIFACTS_PATH)
+
+
+def get_form_artifact(form_id: str, file_path: Path) -> Optional[dict]:
+    """
+    Return the precomputed artifact for a bundled form, or None.
+
+    Only a stat() of the PDF is needed: the artifact is used when the
+    file's size and mtime still match what was hashed at build time.
+    """
+    artifact = _load_artifacts().get(form_id)
+    if artifact is None:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    if artifact.get("file") != file_path.name or artifact.get("size") != stat.st_size:
+        return None
+    if artifact.get("mtime") != stat.st_mtime and not _same_hash(file_path, artifact):
+        return None
+    return artifact
+
+
+def _same_hash(file_path: Path, artifact: dict) -> bool:
+    """Fallback when only the mtime changed (e.g. fresh checkout): compare content."""
+    with open(file_path, "rb") as f:
+        if hashlib.sha256(f.read()).hexdigest() != artifact.get("sha256"):
+            return False
+    artifact["mtime"] = os.stat(file_path).st_mtime
+    return True
+
+
+def split_paragraphs(text: str, max_paragraphs: int = 40) -> List[str]:
+    """Split extracted text into short, de-duplicated paragraphs."""
+    blocks = [b for b in re.split(r"\n\s*\n", text) if b.strip()]
+    if len(blocks) <= 1:
+        blocks = text.splitlines()
+
+    paragraphs = []
+    seen = set()
+    for block in blocks:
+        paragraph = " ".join(block.split())
+        if len(paragraph) < 3 or paragraph in seen:
+            continue
+        seen.add(paragraph)
+        paragraphs.append(paragraph)
+        if len(paragraphs) >= max_paragraphs:
+            break
+    return paragraphs
+
+
+async def build_form_artifact(form: dict, file_path: Path) -> Optional[dict]:
+    """Run the document analyzer once for a bundled form and describe the result."""
+    from app.ai.document_analyzer import get_document_analyzer
+
+    with open(file_path, "rb") as f:
+        file_bytes = f.read()
+    stat = os.stat(file_path)
+
+    doc_result = await get_document_analyzer().analyze_document(
+        file_bytes, is_prebuilt=True, file_path=file_path.name
+    )
+    if not doc_result.get("success"):
+        return None
+
+    source = doc_result.get("source")
+    return {
+        "form_id": form["id"],
+        "file": file_path.name,
+        "sha256": hashlib.sha256(file_bytes).hexdigest(),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        # A cache hit is only ever a Google result
+        "source": "google" if source == "cache" else source,
+        "page_count": doc_result.get("page_count", 0),
+        "paragraphs": doc_result["paragraphs"],
+        "fields": doc_result["fields"],
+        "built_at": datetime.utcnow().isoformat(),
+    }
+
+
+def _needs_build(artifact: Optional[dict], google_ready: bool) -> bool:
+    if artifact is None:
+        return True
+    # Local extractions are upgraded as soon as Google OCR is configured
+    return google_ready and artifact.get("source") != "google"
+
+
+def check_form_artifacts() -> int:
+    """
+    Report bundled forms without a current artifact (read-only, for startup).
+
+    Returns the number of forms that need `form_artifacts build`.
+    """
+    from app.ai.google_document_ai import get_google_ai
+    from app.routers.forms import FORMS_DIR, load_forms
+
+    google_ready = get_google_ai().is_configured
+    stale = []
+    for form in load_forms():
+        file_path = FORMS_DIR / form.get("file", "")
+        if form.get("file") and file_path.exists():
+            if _needs_build(get_form_artifact(form["id"], file_path), google_ready):
+                stale.append(form["id"])
+
+    if stale:
+        print(f"[Form Artifacts] {len(stale)} forms need a build ({', '.join(stale)}), analyzed live until "
+              "`python -m app.services.form_artifacts build` runs")
+    else:
+        print(f"[Form Artifacts] {len(_load_artifacts())} forms ready")
+    return len(stale)
+
+
+async def warm_form_artifacts(force: bool = False) -> int:
+    """
+    Build artifacts for every form in data/forms.json that needs one.
+
+    Returns the number of artifacts (re)built.
+    """
+    global _artifacts
+    from app.ai.google_document_ai import get_google_ai
+    from app.routers.forms import FORMS_DIR, load_forms
+
+    artifacts = dict(_load_artifacts())
+    google_ready = get_google_ai().is_configured
+    built = 0
+
+    for form in load_forms():
+        file_path = FORMS_DIR / form.get("file", "")
+        if not form.get("file") or not file_path.exists():
+            continue
+
+        current = None if force else get_form_artifact(form["id"], file_path)
+        if not _needs_build(current, google_ready):
+            continue
+
+        try:
+            artifact = await build_form_artifact(form, file_path)
+        except Exception as e:
+            print(f"[Form Artifacts] {form['id']} failed: {e}")
+            continue
+        if artifact:
+            artifacts[form["id"]] = artifact
+            built += 1
+
+    if built:
+        _artifacts = artifacts
+        _save_artifacts(artifacts)
+    print(f"[Form Artifacts] {len(artifacts)} forms ready, {built} rebuilt")
+    return built
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Precompute OCR artifacts for the bundled forms")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--force", action="store_true", help="Rebuild every artifact")
+    args = parser.parse_args()
+
+    async def run():
+        from app.ai.local_ocr_fallback import shutdown_ocr_pool
+        try:
+            await warm_form_artifacts(force=args.force)
+        finally:
+            shutdown_ocr_pool()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    _main()
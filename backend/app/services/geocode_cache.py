@@ -0,0 +1,59 @@
+"""
+Geocode Cache for GovConnect
+
+Nominatim answers (pincode search and reverse lookups) barely change and
+Nominatim allows one request per second, so they are kept in a
+TieredCache: in-memory LRU per worker in front of a SQLite file shared by
+all workers that survives restarts.
+
+Pincodes in the bundled centroid table (app/services/pincode_table.py)
+never reach Nominatim; this cache covers the rest and reverse lookups.
+Misses ("no such pincode") are cached briefly so a typo is not re-sent
+on every keystroke.
+"""
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+from app.services.cache import TieredCache, stable_hash
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "geocode_cache.sqlite3"
+
+SEARCH_TTL = 180 * 24 * 3600
+REVERSE_TTL = 90 * 24 * 3600
+NOT_FOUND_TTL = 24 * 3600
+
+# ~11 m: nearby taps share a reverse-geocoding entry
+REVERSE_PRECISION = 4
+
+
+def make_search_key(pincode: str) -> str:
+    return stable_hash("geocode", "search", pincode.strip())
+
+
+def make_reverse_key(lat: float, lon: float) -> str:
+    return stable_hash("geocode", "reverse", round(lat, REVERSE_PRECISION), round(lon, REVERSE_PRECISION))
+
+
+# Global cache instance
+_geocode_cache: Optional[TieredCache] = None
+
+
+def get_geocode_cache() -> Optional[TieredCache]:
+    """Get or create the geocode cache. Returns None when disabled."""
+    global _geocode_cache
+    settings = get_settings()
+    if not settings.geocode_cache_enabled:
+        return None
+
+    if _geocode_cache is None:
+        db_path = Path(settings.geocode_cache_path) if settings.geocode_cache_path else DEFAULT_DB_PATH
+        _geocode_cache = TieredCache(
+            name="geocode",
+            db_path=db_path,
+            max_memory_entries=settings.geocode_cache_memory_entries,
+            max_disk_entries=settings.geocode_cache_disk_entries,
+            default_ttl=SEARCH_TTL,
+        )
+    return _geocode_cache
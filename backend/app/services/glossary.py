@@ -0,0 +1,235 @@
+"""
+Translation Glossary for GovConnect
+
+Per-language translation memory for the fixed English strings the app
+sends back to users: scheme names and categories, complaint sectors,
+form template guidance and the standard warnings/recommendations.
+
+Glossaries live in data/glossary/<lang>.json and are generated offline:
+
+    python -m app.services.glossary build --lang te hi
+
+Lookups are exact (whitespace/case-insensitive) or per sentence segment,
+so a response made of known sentences is translated with no AI call and
+only the unknown segments are sent to the AI.
+"""
+import argparse
+import asyncio
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+GLOSSARY_DIR = Path(__file__).parent.parent / "data" / "glossary"
+
+# Fixed response strings that are not part of any data file
+STATIC_STRINGS = [
+    "Application subject to document verification",
+    "Criteria may change; confirm on the official portal.",
+    "Gather all required documents before applying",
+    "Browse other schemes that match your profile at /api/schemes",
+    "Browse available schemes at /api/schemes",
+    "Invalid scheme ID provided",
+    "AI analysis unavailable - partial rule-based check only",
+    "Provide the missing details and check again",
+    "Contact the scheme's helpline or local office",
+    "A few conditions still need to be confirmed with your documents.",
+    "AI guidance not available. Please fill fields carefully.",
+    "Could not generate detailed guidance. Please fill fields carefully.",
+    "Fill this field appropriately",
+    "Fill this field based on your documents",
+    "Identity Proof",
+    "Address Proof",
+    "Uploaded Form",
+]
+
+# Sentence boundaries; the separator is kept so text can be reassembled
+_SEGMENT_RE = re.compile(r"((?<=[.!?;])\s+|\n+)")
+_TRAILING_PUNCT = ".!?;:"
+_HAS_LETTER_RE = re.compile(r"[^\W\d_]")
+
+
+def _key(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def needs_translation(text: str) -> bool:
+    """False for numbers, dates, amounts and other strings without letters."""
+    return bool(_HAS_LETTER_RE.search(text))
+
+
+class Glossary:
+    """English -> target language translation memory for one language."""
+
+    def __init__(self, lang: str, entries: Dict[str, str]):
+        self.lang = lang
+        self.entries = entries
+        self._index = {_key(src): dst for src, dst in entries.items()}
+
+    def lookup(self, text: str) -> Optional[str]:
+        """Exact match, ignoring case, spacing and trailing punctuation."""
+        hit = self._index.get(_key(text))
+        if hit is not None:
+            return hit
+
+        stripped = text.rstrip(_TRAILING_PUNCT + " ")
+        if stripped and stripped != text.rstrip():
+            hit = self._index.get(_key(stripped))
+            if hit is not None:
+                return hit + text.rstrip()[len(stripped):]
+        return None
+
+    def segment(self, text: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        Split text into sentence segments paired with their translation.
+
+        Separators (whitespace/newlines) are returned paired with
+        themselves; segments without a glossary entry get None.
+        """
+        parts = []
+        for i, piece in enumerate(_SEGMENT_RE.split(text)):
+            if i % 2 == 1 or not piece:
+                parts.append((piece, piece))
+            elif not needs_translation(piece):
+                parts.append((piece, piece))
+            else:
+                parts.append((piece, self.lookup(piece)))
+        return parts
+
+    def translate(self, text: str) -> Optional[str]:
+        """Full translation from exact or segment matches, else None."""
+        hit = self.lookup(text)
+        if hit is not None:
+            return hit
+        parts = self.segment(text)
+        if any(dst is None for _, dst in parts):
+            return None
+        return "".join(dst for _, dst in parts)
+
+
+@lru_cache(maxsize=None)
+def get_glossary(lang: str) -> Optional[Glossary]:
+    """Load data/glossary/<lang>.json once. None if there is no glossary."""
+    path = GLOSSARY_DIR / f"{lang}.json"
+    if lang == "en" or not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        glossary = Glossary(lang, data.get("entries", {}))
+        print(f"[Glossary] Loaded {len(glossary.entries)} {lang} entries")
+        return glossary
+    except Exception as e:
+        print(f"[Glossary] Failed to load {path.name}: {e}")
+        return None
+
+
+def translate_local(value, lang: str):
+    """
+    Translate a str/dict/list using only the glossary.
+
+    Strings without an entry are left in English. Used for small fixed
+    payloads (e.g. complaint sectors) that should never wait on the AI.
+    """
+    glossary = get_glossary(lang)
+    if glossary is None:
+        return value
+    if isinstance(value, str):
+        return glossary.translate(value) or value
+    if isinstance(value, dict):
+        return {k: translate_local(v, lang) for k, v in value.items()}
+    if isinstance(value, list):
+        return [translate_local(v, lang) for v in value]
+    return value
+
+
+# -------------------------------------------------------------------
+# Offline generation
+# -------------------------------------------------------------------
+
+def collect_source_strings() -> List[str]:
+    """Every fixed English string worth keeping in the glossary."""
+    from app.ai.form_analyzer import FORM_TEMPLATES
+    from app.routers.complaints import COMPLAINT_SECTORS
+    from app.services.scheme_catalog import get_scheme_catalog
+
+    strings: List[str] = list(STATIC_STRINGS)
+
+    for scheme in get_scheme_catalog().schemes:
+        strings += [scheme.name, scheme.category, scheme.benefit]
+        # Descriptions are stored per sentence so edits only re-translate what changed
+        strings += [p for p in _SEGMENT_RE.split(scheme.description) if p.strip()]
+        strings += scheme.eligibility + scheme.documents
+
+    for sector in COMPLAINT_SECTORS:
+        strings += [sector["name"], sector["department"]]
+
+    for template in FORM_TEMPLATES.values():
+        strings.append(template["formType"])
+        for field in template["fieldsToFill"]:
+            strings += [field["fieldName"], field["instruction"]]
+        strings += template["requiredDocuments"] + template["warnings"]
+
+    seen = set()
+    unique = []
+    for s in strings:
+        if s and needs_translation(s) and _key(s) not in seen:
+            seen.add(_key(s))
+            unique.append(s)
+    return unique
+
+
+async def build_glossary(lang: str, force: bool = False) -> int:
+    """Translate missing source strings and write data/glossary/<lang>.json."""
+    from app.ai.base import get_ai_client
+    from app.utils.translator import translate_strings
+
+    path = GLOSSARY_DIR / f"{lang}.json"
+    existing: Dict[str, str] = {}
+    if path.exists() and not force:
+        with open(path, "r", encoding="utf-8") as f:
+            existing = json.load(f).get("entries", {})
+
+    known = {_key(s) for s in existing}
+    missing = [s for s in collect_source_strings() if _key(s) not in known]
+    print(f"[Glossary] {lang}: {len(existing)} existing, {len(missing)} to translate")
+
+    if missing and not get_ai_client().is_configured:
+        print("[Glossary] AI not configured, keeping existing entries only")
+        missing = []
+
+    if missing:
+        existing.update(await translate_strings(missing, lang))
+
+    GLOSSARY_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"language": lang, "entries": dict(sorted(existing.items()))}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return len(existing)
+
+
+def _main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="GovConnect translation glossary")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Translate missing strings into data/glossary/<lang>.json")
+    build.add_argument("--lang", nargs="+", default=["te", "hi"])
+    build.add_argument("--force", action="store_true", help="Re-translate every entry")
+
+    sub.add_parser("sources", help="Print the English source strings")
+
+    args = parser.parse_args(argv)
+    if args.command == "sources":
+        for s in collect_source_strings():
+            print(s)
+        return
+
+    for lang in args.lang:
+        total = asyncio.run(build_glossary(lang, force=args.force))
+        print(f"[Glossary] {lang}: wrote {total} entries")
+
+
+if __name__ == "__main__":
+    _main()
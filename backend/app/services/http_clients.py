@@ -0,0 +1,185 @@
+"""
+Shared HTTP Clients for GovConnect
+
+One pooled httpx.AsyncClient per upstream service, opened in the app
+lifespan and reused by every request, so DNS lookups and TCP/TLS
+handshakes happen once per worker instead of once per call.
+
+Each service gets limits that respect its usage policy:
+- Nominatim: at most one request per second and a single connection
+  (https://operations.osmfoundation.org/policies/nominatim/)
+- Overpass: two concurrent slots per client IP
+
+Request pacing is shared by every uvicorn worker through a small SQLite
+file (data/http_pacing.sqlite3): each request reserves the next free
+slot in one transaction. A request whose slot is more than
+NOMINATIM_MAX_WAIT_SECONDS away fails at once with UpstreamBusy, and the
+caller falls back to its cached or local answer instead of queueing.
+
+HTTP/2 is used when the optional `h2` package is installed.
+URLs are configurable (NOMINATIM_URL / OVERPASS_URL), which is also how
+tests point the locator at the local stand-in server:
+    python -m app.services.osm_stub
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import get_settings
+
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+DEFAULT_PACING_PATH = Path(__file__).parent.parent / "data" / "http_pacing.sqlite3"
+
+
+class UpstreamBusy(Exception):
+    """The service's next free request slot is further away than the caller may wait."""
+
+
+class RequestPacer:
+    """Spaces requests to one service min_interval apart across all worker processes."""
+
+    def __init__(self, name: str, min_interval: float, max_wait: float, db_path: Path):
+        self.name = name
+        self.min_interval = min_interval
+        self.max_wait = max_wait
+        self.rejected = 0
+        self._db_lock = threading.Lock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; each reservation is its own BEGIN IMMEDIATE transaction
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pacing (service TEXT PRIMARY KEY, next_slot REAL NOT NULL)"
+        )
+
+    async def wait_for_slot(self):
+        """Sleep until this process's reserved slot; raises UpstreamBusy if it is too far away."""
+        delay = await asyncio.to_thread(self._reserve)
+        if delay is None:
+            self.rejected += 1
+            raise UpstreamBusy(f"{self.name} is busy, next request slot is over {self.max_wait:g}s away")
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def close(self):
+        self._conn.close()
+
+    def _reserve(self) -> Optional[float]:
+        """Seconds until the reserved slot, or None when none is free within max_wait."""
+        with self._db_lock:
+            # Wall-clock time, so every process agrees on the slots
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT next_slot FROM pacing WHERE service = ?", (self.name,)
+                ).fetchone()
+                slot = max(now, row[0] if row else 0.0)
+                if slot - now > self.max_wait:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                self._conn.execute(
+                    "INSERT INTO pacing (service, next_slot) VALUES (?, ?) "
+                    "ON CONFLICT (service) DO UPDATE SET next_slot = excluded.next_slot",
+                    (self.name, slot + self.min_interval)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return slot - now
+
+
+class ServiceClient:
+    """A pooled client for one upstream service, with its own connection cap and pacing."""
+
+    def __init__(
+        self,
+        name: str,
+        max_connections: int,
+        pacer: Optional[RequestPacer] = None,
+        read_timeout: float = 10.0,
+    ):
+        settings = get_settings()
+        self.name = name
+        self.pacer = pacer
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE and settings.http2_enabled,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=settings.http_keepalive_seconds,
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=settings.http_connect_timeout_seconds),
+            headers={"User-Agent": settings.osm_user_agent},
+        )
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET through the shared pool, waiting for this service's next free slot.
+
+        Raises UpstreamBusy when that slot is too far away.
+        """
+        if self.pacer is not None:
+            await self.pacer.wait_for_slot()
+        return await self.client.get(url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+        if self.pacer is not None:
+            self.pacer.close()
+
+
+# Global instances
+_clients: Dict[str, ServiceClient] = {}
+
+
+def _create_client(name: str) -> ServiceClient:
+    settings = get_settings()
+    if name == "nominatim":
+        pacer = RequestPacer(
+            "nominatim",
+            min_interval=settings.nominatim_min_interval_seconds,
+            max_wait=settings.nominatim_max_wait_seconds,
+            db_path=Path(settings.http_pacing_path) if settings.http_pacing_path else DEFAULT_PACING_PATH,
+        )
+        return ServiceClient("nominatim", max_connections=1, pacer=pacer, read_timeout=10.0)
+    if name == "overpass":
+        # The Overpass query itself allows 25s; leave room for the transfer
+        return ServiceClient("overpass", max_connections=2, read_timeout=30.0)
+    raise KeyError(f"Unknown HTTP client: {name}")
+
+
+def get_http_client(name: str) -> ServiceClient:
+    """Get or create the shared client for "nominatim" or "overpass"."""
+    client = _clients.get(name)
+    if client is None:
+        client = _clients[name] = _create_client(name)
+    return client
+
+
+def open_http_clients():
+    """Create every client up front (called from the app lifespan)."""
+    for name in ("nominatim", "overpass"):
+        get_http_client(name)
+    print(f"[HTTP] Opened shared clients (HTTP/2: {'on' if HTTP2_AVAILABLE and get_settings().http2_enabled else 'off'})")
+
+
+async def close_http_clients():
+    """Close every pooled connection (called at shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
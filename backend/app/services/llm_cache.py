@@ -0,0 +1,84 @@
+"""
+LLM Response Cache for GovConnect
+
+Content-addressed cache for parsed AIClient.generate results.
+Key = hash(model, system prompt, rendered prompt, temperature), so any
+change to a prompt template or model naturally misses the cache.
+
+Invalidate from the command line:
+    python -m app.services.llm_cache --clear [namespace]
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+from app.services.cache import TieredCache, stable_hash
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "llm_cache.sqlite3"
+
+# Per-endpoint TTLs in seconds (0 = never cache)
+LLM_CACHE_TTLS = {
+    "intent": 24 * 3600,
+    "scheme_search": 6 * 3600,
+    "eligibility": 6 * 3600,
+    "process": 7 * 24 * 3600,
+    "life_event": 7 * 24 * 3600,
+    "form_analysis": 7 * 24 * 3600,
+    "complaint": 3600,
+    "translation": 30 * 24 * 3600,
+    "default": 3600,
+}
+
+
+def get_ttl(namespace: Optional[str]) -> int:
+    """Resolve the TTL for a cache namespace."""
+    return LLM_CACHE_TTLS.get(namespace or "default", LLM_CACHE_TTLS["default"])
+
+
+def make_cache_key(model: str, system_prompt: str, prompt: str, temperature: float) -> str:
+    """Stable key for one completion request."""
+    return stable_hash(model, system_prompt, prompt, temperature)
+
+
+# Global cache instance
+_llm_cache: Optional[TieredCache] = None
+
+
+def get_llm_cache() -> Optional[TieredCache]:
+    """Get or create the LLM cache. Returns None when caching is disabled."""
+    global _llm_cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+
+    if _llm_cache is None:
+        db_path = Path(settings.llm_cache_path) if settings.llm_cache_path else DEFAULT_DB_PATH
+        _llm_cache = TieredCache(
+            name="llm",
+            db_path=db_path,
+            max_memory_entries=settings.llm_cache_memory_entries,
+            max_disk_entries=settings.llm_cache_disk_entries,
+            default_ttl=LLM_CACHE_TTLS["default"],
+        )
+    return _llm_cache
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Clear the LLM response cache")
+    parser.add_argument("--clear", nargs="?", const="*", metavar="NAMESPACE", required=True,
+                        help="Clear all entries, or only one namespace")
+    args = parser.parse_args()
+
+    cache = get_llm_cache()
+    if cache is None:
+        print("[LLM Cache] Caching is disabled (LLM_CACHE_ENABLED=false)")
+        return
+
+    asyncio.run(cache.invalidate(None if args.clear == "*" else args.clear))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,441 @@
+"""
+Offline OSM Service Store for GovConnect
+
+Government service points (the SERVICE_TAGS categories of the locator)
+imported from a regional OpenStreetMap extract into a SQLite file with an
+R*Tree index. Searches inside an imported region are answered from this
+file, so the locator only goes to Overpass for areas that were never
+imported:
+
+    # Geofabrik-style extract (needs the optional osmium package)
+    python -m app.services.osm_store import telangana-latest.osm.pbf --bbox 16.80,78.00,17.80,79.00
+    # Overpass JSON dump ("out center;" gives ways a point)
+    python -m app.services.osm_store import delhi.json --bbox 28.40,76.84,28.88,77.35
+    # Download a region from Overpass, or re-download every imported region
+    python -m app.services.osm_store fetch --bbox 28.40,76.84,28.88,77.35
+    python -m app.services.osm_store fetch
+    python -m app.services.osm_store stats
+
+Schema:
+    places        one row per (element, category): point and compact tags
+    places_index  R*Tree over the points
+    coverage      imported bounding boxes and the categories they hold
+
+The --bbox of an import is recorded as covered: searches inside it are
+answered from the store alone, with no Overpass fallback. It must lie
+entirely inside the region the file holds. Neither the bounds of the
+imported points nor an extract's header box qualify: both are rectangles
+around a state or zone polygon and take in neighbouring areas the file
+does not contain.
+
+An import replaces everything inside its bounding box in one transaction,
+so the API keeps serving the previous data until the new data commits.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from app.config import get_settings
+from app.services.overpass_tiles import matches_selectors, parse_selectors, with_coordinates
+from app.services.spatial_index import KM_PER_DEGREE, haversine_km
+
+# pyosmium is optional (only needed to import .osm.pbf extracts)
+try:
+    import osmium
+    OSMIUM_AVAILABLE = True
+except ImportError:
+    OSMIUM_AVAILABLE = False
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "osm_services.sqlite3"
+
+# Tags the locator reads; everything else is dropped to keep the file small
+KEEP_TAGS = (
+    "name", "name:en", "amenity", "office", "building", "railway",
+    "addr:postcode", "phone", "contact:phone", "opening_hours",
+)
+
+OVERPASS_TIMEOUT_SECONDS = 180
+
+BBox = Tuple[float, float, float, float]  # south, west, north, east
+
+
+class OsmServiceStore:
+    """Read side of the store, shared by every request of a worker."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=5.0)
+        self._db_lock = threading.Lock()
+        self.searches_served = 0
+        self.searches_uncovered = 0
+
+    async def find(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        categories: Iterable[str],
+    ) -> Optional[List[dict]]:
+        """
+        Elements within radius_km, nearest first, shaped like Overpass
+        elements plus "distance"; None when no imported region covers the
+        whole search circle for every category.
+        """
+        categories = sorted(categories)
+        rows = await asyncio.to_thread(self._db_find, _circle_bbox(lat, lon, radius_km), categories)
+        if rows is None:
+            self.searches_uncovered += 1
+            return None
+        self.searches_served += 1
+
+        elements = {}
+        for osm_type, osm_id, element_lat, element_lon, tags in rows:
+            elements.setdefault((osm_type, osm_id), (element_lat, element_lon, tags))
+        candidates = list(elements.items())
+        distances = haversine_km(lat, lon, [c[1][0] for c in candidates], [c[1][1] for c in candidates])
+
+        results = [
+            {"type": osm_type, "id": osm_id, "lat": point[0], "lon": point[1],
+             "tags": json.loads(point[2]), "distance": distance}
+            for ((osm_type, osm_id), point), distance in zip(candidates, distances)
+            if distance <= radius_km
+        ]
+        results.sort(key=lambda element: element["distance"])
+        return results
+
+    def stats(self) -> dict:
+        try:
+            with self._db_lock:
+                places = self._conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+                regions = self._conn.execute("SELECT COUNT(*), MAX(imported_at) FROM coverage").fetchone()
+        except sqlite3.Error as e:
+            return {"error": str(e)}
+        return {
+            "places": places,
+            "regions": regions[0],
+            "imported_at": regions[1],
+            "searches_served": self.searches_served,
+            "searches_uncovered": self.searches_uncovered,
+        }
+
+    def close(self):
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Database (runs in worker threads)
+    # ------------------------------------------------------------------
+
+    def _db_find(self, bbox: BBox, categories: List[str]) -> Optional[list]:
+        south, west, north, east = bbox
+        try:
+            with self._db_lock:
+                covering = self._conn.execute(
+                    "SELECT categories FROM coverage WHERE south <= ? AND west <= ? AND north >= ? AND east >= ?",
+                    (south, west, north, east)
+                ).fetchall()
+                if not any(set(categories) <= set(json.loads(row[0])) for row in covering):
+                    return None
+
+                placeholders = ",".join("?" * len(categories))
+                return self._conn.execute(
+                    "SELECT p.osm_type, p.osm_id, p.lat, p.lon, p.tags "
+                    "FROM places_index i JOIN places p ON p.id = i.id "
+                    "WHERE i.max_lat >= ? AND i.min_lat <= ? AND i.max_lon >= ? AND i.min_lon <= ? "
+                    f"AND p.category IN ({placeholders})",
+                    (south, north, west, east, *categories)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[OSM Store] Read error: {e}")
+            return None
+
+
+def _circle_bbox(lat: float, lon: float, radius_km: float) -> BBox:
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+# Global instance (None until the store file exists)
+_store: Optional[OsmServiceStore] = None
+
+
+def get_osm_store() -> Optional[OsmServiceStore]:
+    """The shared store, or None when disabled or nothing has been imported yet."""
+    global _store
+    if _store is None:
+        settings = get_settings()
+        db_path = Path(settings.osm_store_path) if settings.osm_store_path else DEFAULT_DB_PATH
+        if not settings.osm_store_enabled or not db_path.exists():
+            return None
+        _store = OsmServiceStore(db_path)
+        print(f"[OSM Store] Serving imported regions from {db_path.name}")
+    return _store
+
+
+# -------------------------------------------------------------------
+# Importing
+# -------------------------------------------------------------------
+
+def _open_for_writing(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30.0)
+    # WAL lets the API keep reading while an import runs
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS places (
+            id INTEGER PRIMARY KEY,
+            osm_type TEXT NOT NULL,
+            osm_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            lat REAL NOT NULL,
+            lon REAL NOT NULL,
+            tags TEXT NOT NULL,
+            UNIQUE (osm_type, osm_id, category)
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS places_index USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+        CREATE TABLE IF NOT EXISTS coverage (
+            id INTEGER PRIMARY KEY,
+            south REAL NOT NULL,
+            west REAL NOT NULL,
+            north REAL NOT NULL,
+            east REAL NOT NULL,
+            categories TEXT NOT NULL,
+            source TEXT NOT NULL,
+            imported_at REAL NOT NULL
+        );
+        """
+    )
+    return conn
+
+
+def categorize(
+    elements: Iterable[dict],
+    tags_by_category: Dict[str, List[str]],
+) -> List[Tuple[str, dict]]:
+    """(category, element) for every element with a point matching a category."""
+    matchers = {category: parse_selectors(selectors) for category, selectors in tags_by_category.items()}
+    matched = []
+    for element in elements:
+        element = with_coordinates(element)
+        if element is None:
+            continue
+        for category, matcher in matchers.items():
+            if matches_selectors(element, matcher):
+                matched.append((category, element))
+    return matched
+
+
+def import_elements(
+    elements: Iterable[dict],
+    tags_by_category: Dict[str, List[str]],
+    source: str,
+    bbox: BBox,
+    db_path: Path = DEFAULT_DB_PATH,
+) -> int:
+    """
+    Replace the places inside bbox with the matched elements and record
+    bbox as covered. bbox must lie entirely inside the area the elements
+    were taken from.
+    """
+    south, west, north, east = bbox
+    matched = [
+        (category, element) for category, element in categorize(elements, tags_by_category)
+        if south <= element["lat"] <= north and west <= element["lon"] <= east
+    ]
+
+    conn = _open_for_writing(db_path)
+    try:
+        with conn:
+            # The R*Tree stores float32 bounds, so overlap is checked against the exact points
+            stale_ids = [row[0] for row in conn.execute(
+                "SELECT p.id FROM places_index i JOIN places p ON p.id = i.id "
+                "WHERE i.max_lat >= ? AND i.min_lat <= ? AND i.max_lon >= ? AND i.min_lon <= ? "
+                "AND p.lat BETWEEN ? AND ? AND p.lon BETWEEN ? AND ?",
+                (south, north, west, east, south, north, west, east)
+            )]
+            conn.executemany("DELETE FROM places WHERE id = ?", ((i,) for i in stale_ids))
+            conn.executemany("DELETE FROM places_index WHERE id = ?", ((i,) for i in stale_ids))
+            conn.execute(
+                "DELETE FROM coverage WHERE south >= ? AND west >= ? AND north <= ? AND east <= ?",
+                (south, west, north, east)
+            )
+
+            for category, element in matched:
+                tags = {key: value for key, value in element.get("tags", {}).items() if key in KEEP_TAGS}
+                # Upsert keeps the row id, so its R*Tree entry is replaced rather than orphaned
+                place_id = conn.execute(
+                    "INSERT INTO places (osm_type, osm_id, category, lat, lon, tags) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (osm_type, osm_id, category) DO UPDATE SET "
+                    "lat = excluded.lat, lon = excluded.lon, tags = excluded.tags RETURNING id",
+                    (element["type"], element["id"], category, element["lat"], element["lon"],
+                     json.dumps(tags, ensure_ascii=False, separators=(",", ":")))
+                ).fetchone()[0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO places_index (id, min_lat, max_lat, min_lon, max_lon) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (place_id, element["lat"], element["lat"], element["lon"], element["lon"])
+                )
+
+            conn.execute(
+                "INSERT INTO coverage (south, west, north, east, categories, source, imported_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (south, west, north, east, json.dumps(sorted(tags_by_category)), source, time.time())
+            )
+    finally:
+        conn.close()
+
+    print(f"[OSM Store] Imported {len(matched)} service points from {source} "
+          f"(bbox {south:.4f},{west:.4f},{north:.4f},{east:.4f})")
+    return len(matched)
+
+
+def read_overpass_json(path: Path) -> List[dict]:
+    """Elements of an Overpass JSON dump."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("elements", [])
+
+
+def read_osm_pbf(path: Path, tags_by_category: Dict[str, List[str]]) -> List[dict]:
+    """Matching nodes and ways (at the centroid of their nodes) of an .osm.pbf extract."""
+    if not OSMIUM_AVAILABLE:
+        raise RuntimeError("Importing .osm.pbf needs the osmium package (pip install osmium)")
+
+    # Exact (key, value) pairs per element type, so only service points are kept in memory
+    wanted: Dict[str, set] = {"node": set(), "way": set()}
+    for selectors in tags_by_category.values():
+        for osm_type, key, value in parse_selectors(selectors):
+            if osm_type in wanted:
+                wanted[osm_type].add((key, value))
+
+    def is_wanted(osm_type: str, tags) -> bool:
+        return any(tags.get(key) == value for key, value in wanted[osm_type])
+
+    class ServiceHandler(osmium.SimpleHandler):
+        def __init__(self):
+            super().__init__()
+            self.elements: List[dict] = []
+
+        def node(self, node):
+            if is_wanted("node", node.tags) and node.location.valid():
+                self._add("node", node.id, node.tags, node.location.lat, node.location.lon)
+
+        def way(self, way):
+            if not is_wanted("way", way.tags):
+                return
+            points = [(n.location.lat, n.location.lon) for n in way.nodes if n.location.valid()]
+            if points:
+                self._add("way", way.id, way.tags,
+                          sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points))
+
+        def _add(self, osm_type: str, osm_id: int, tags, lat: float, lon: float):
+            self.elements.append({
+                "type": osm_type, "id": osm_id, "lat": lat, "lon": lon,
+                "tags": {tag.k: tag.v for tag in tags},
+            })
+
+    handler = ServiceHandler()
+    # Way centroids need node locations; "flex_mem" adapts to the extract size
+    handler.apply_file(str(path), locations=True, idx="flex_mem")
+    return handler.elements
+
+
+def fetch_overpass(bbox: BBox, tags_by_category: Dict[str, List[str]]) -> List[dict]:
+    """Download every service point in bbox with one Overpass query."""
+    settings = get_settings()
+    selectors = [selector for category in sorted(tags_by_category) for selector in tags_by_category[category]]
+    ql_query = (
+        f"[out:json][timeout:{OVERPASS_TIMEOUT_SECONDS}]"
+        f"[bbox:{bbox[0]:.6f},{bbox[1]:.6f},{bbox[2]:.6f},{bbox[3]:.6f}];"
+        f"({''.join(f'{selector};' for selector in selectors)});"
+        "out center;"
+    )
+    response = httpx.post(
+        settings.overpass_url,
+        data={"data": ql_query},
+        headers={"User-Agent": settings.osm_user_agent},
+        timeout=OVERPASS_TIMEOUT_SECONDS + 30,
+    )
+    response.raise_for_status()
+    return response.json().get("elements", [])
+
+
+def _covered_regions(db_path: Path) -> List[BBox]:
+    if not db_path.exists():
+        return []
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return [tuple(row) for row in conn.execute("SELECT south, west, north, east FROM coverage")]
+    except sqlite3.Error:
+        return []
+    finally:
+        conn.close()
+
+
+def _parse_bbox(value: str) -> BBox:
+    try:
+        south, west, north, east = (float(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected south,west,north,east")
+    if not (south < north and west < east):
+        raise argparse.ArgumentTypeError("south/west must be below north/east")
+    return south, west, north, east
+
+
+def _main():
+    # SERVICE_TAGS lives with the locator; imported here to keep the API import graph one-way
+    from app.routers.locator import SERVICE_TAGS
+
+    parser = argparse.ArgumentParser(description="Import government service points from OpenStreetMap")
+    parser.add_argument("--db", type=Path, help="Store file (default: OSM_STORE_PATH or data/osm_services.sqlite3)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Import an .osm.pbf extract or Overpass JSON dump")
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument(
+        "--bbox", type=_parse_bbox, required=True,
+        help="Region to serve from the file, entirely inside it: south,west,north,east"
+    )
+    fetch_parser = subparsers.add_parser("fetch", help="Download a region from Overpass (default: every imported region)")
+    fetch_parser.add_argument("--bbox", type=_parse_bbox, help="south,west,north,east")
+    subparsers.add_parser("stats", help="Show what has been imported")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    db_path = args.db or (Path(settings.osm_store_path) if settings.osm_store_path else DEFAULT_DB_PATH)
+
+    if args.command == "import":
+        if args.path.name.endswith(".pbf"):
+            elements = read_osm_pbf(args.path, SERVICE_TAGS)
+        else:
+            elements = read_overpass_json(args.path)
+        import_elements(elements, SERVICE_TAGS, source=args.path.name, bbox=args.bbox, db_path=db_path)
+    elif args.command == "fetch":
+        regions = [args.bbox] if args.bbox else _covered_regions(db_path)
+        if not regions:
+            parser.error("nothing imported yet, pass --bbox")
+        for bbox in regions:
+            try:
+                elements = fetch_overpass(bbox, SERVICE_TAGS)
+            except httpx.HTTPError as e:
+                # The region keeps its previous data
+                print(f"[OSM Store] Overpass download for {bbox} failed: {e}")
+                continue
+            import_elements(elements, SERVICE_TAGS, source="overpass", bbox=bbox, db_path=db_path)
+    else:
+        if not db_path.exists():
+            print(f"{db_path} does not exist")
+            return
+        print(json.dumps(OsmServiceStore(db_path).stats(), indent=2))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,135 @@
+"""
+OpenStreetMap Stand-in Server for GovConnect
+
+A tiny local imitation of the three upstream endpoints the service
+locator calls, answering from data/service_centers.json:
+- GET /search?q=<pincode>, India     (Nominatim search)
+- GET /reverse?lat=..&lon=..         (Nominatim reverse)
+- GET /api/interpreter?data=<QL>     (Overpass, [bbox:s,w,n,e] or around:r,lat,lon)
+
+Use it to develop or test the locator offline and without touching the
+public OSM services:
+    python -m app.services.osm_stub [--port 8090]
+    NOMINATIM_URL=http://127.0.0.1:8090 \\
+    OVERPASS_URL=http://127.0.0.1:8090/api/interpreter uvicorn app.main:app
+"""
+import argparse
+import json
+import math
+import re
+from pathlib import Path
+
+from fastapi import FastAPI, Query
+
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "service_centers.json"
+
+# service_centers.json "type" -> OSM tags the Overpass query selects on
+# (anything else is treated as a government office)
+TYPE_TAGS = {
+    "Police": {"amenity": "police"},
+    "Post Office": {"amenity": "post_office"},
+    "Health": {"amenity": "hospital"},
+    "Banking": {"amenity": "bank"},
+    "Transport": {"amenity": "bus_station"},
+    "Fire": {"amenity": "fire_station"},
+}
+
+_AROUND_RE = re.compile(r"around:(\d+),(-?[\d.]+),(-?[\d.]+)")
+_BBOX_RE = re.compile(r"\[bbox:(-?[\d.]+),(-?[\d.]+),(-?[\d.]+),(-?[\d.]+)\]")
+
+app = FastAPI(title="OSM stand-in")
+
+
+def _load_centers() -> list[dict]:
+    with open(DATA_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 6371000 * 2 * math.asin(math.sqrt(a))
+
+
+@app.get("/search")
+async def search(q: str = Query(...)):
+    pincode = q.split(",")[0].strip()
+    for center in _load_centers():
+        if center["pincode"] == pincode:
+            return [{
+                "lat": str(center["latitude"]),
+                "lon": str(center["longitude"]),
+                "display_name": f"{pincode}, {center['address'].split(',')[-1].strip()}, India",
+            }]
+    return []
+
+
+@app.get("/reverse")
+async def reverse(lat: float, lon: float):
+    centers = _load_centers()
+    if not centers:
+        return {"error": "Unable to geocode"}
+    nearest = min(centers, key=lambda c: _distance_m(lat, lon, c["latitude"], c["longitude"]))
+    city = nearest["address"].split(",")[-1].strip()
+    return {
+        "display_name": nearest["address"],
+        "address": {"suburb": nearest["address"].split(",")[-2].strip(), "city": city,
+                    "postcode": nearest["pincode"]},
+    }
+
+
+@app.get("/api/interpreter")
+async def interpreter(data: str = Query(...)):
+    around = _AROUND_RE.search(data)
+    bbox = _BBOX_RE.search(data)
+    if around:
+        radius, lat, lon = float(around.group(1)), float(around.group(2)), float(around.group(3))
+
+        def inside(c: dict) -> bool:
+            return _distance_m(lat, lon, c["latitude"], c["longitude"]) <= radius
+    elif bbox:
+        south, west, north, east = (float(v) for v in bbox.groups())
+
+        def inside(c: dict) -> bool:
+            return south <= c["latitude"] <= north and west <= c["longitude"] <= east
+    else:
+        return {"elements": []}
+
+    elements = []
+    for index, center in enumerate(_load_centers(), 1):
+        tags = TYPE_TAGS.get(center["type"], {"office": "government"})
+        selector = "".join(f'["{key}"="{value}"]' for key, value in tags.items())
+        if selector not in data:
+            continue
+        if not inside(center):
+            continue
+        elements.append({
+            "type": "node",
+            "id": index,
+            "lat": center["latitude"],
+            "lon": center["longitude"],
+            "tags": {
+                "name": center["name"],
+                **tags,
+                "addr:postcode": center["pincode"],
+                "phone": center.get("phone"),
+                "opening_hours": center.get("timings"),
+            },
+        })
+    return {"elements": elements}
+
+
+def _main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local stand-in for Nominatim and Overpass")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    _main()
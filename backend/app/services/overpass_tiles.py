@@ -0,0 +1,336 @@
+"""
+Overpass Tile Cache for GovConnect
+
+Overpass answers are cached per (slippy-map tile, service category)
+instead of per (lat, lon, radius) query, so two users a few streets
+apart share the same upstream result:
+
+1. The search circle is covered with tiles at OVERPASS_TILE_ZOOM
+   (zoom 13 is ~4.5 km across at Indian latitudes)
+2. Tiles and categories already cached are read locally; everything
+   missing is fetched with ONE Overpass query over the bounding box of
+   the missing tiles and split back into tiles
+3. Results are filtered to the requested radius locally and returned
+   nearest first, with their distances
+
+Searches wider than MAX_TILES tiles skip the cache and go upstream as a
+plain `around:` query, so one huge radius cannot probe millions of keys.
+
+Entries are fresh for OVERPASS_TILE_FRESH_SECONDS; after that they are
+still served (up to OVERPASS_TILE_MAX_AGE_SECONDS) while a background
+task refreshes them, so users never wait on a 30-second Overpass call
+for an area someone has already searched.
+"""
+import asyncio
+import math
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config import get_settings
+from app.services.cache import TieredCache, stable_hash
+from app.services.http_clients import get_http_client
+from app.services.single_flight import SingleFlight
+from app.services.spatial_index import haversine_km
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "overpass_cache.sqlite3"
+
+# 'node["amenity"="police"]' -> ("node", "amenity", "police")
+_TAG_RE = re.compile(r'^(node|way|relation)\["([^"]+)"="([^"]+)"\]$')
+
+Tile = Tuple[int, int]
+
+# ~25 km radius at zoom 13; wider searches are not worth caching per tile
+MAX_TILES = 144
+
+
+# -------------------------------------------------------------------
+# Tile math (Web Mercator slippy tiles)
+# -------------------------------------------------------------------
+
+def tile_for(lat: float, lon: float, zoom: int) -> Tile:
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(tile: Tile, zoom: int) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) of a tile."""
+    n = 2 ** zoom
+    x, y = tile
+
+    def lat_of(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat_of(y + 1), x / n * 360.0 - 180.0, lat_of(y), (x + 1) / n * 360.0 - 180.0
+
+
+def _tile_range(lat: float, lon: float, radius_km: float, zoom: int) -> Tuple[int, int, int, int]:
+    dlat = radius_km / 111.32
+    dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 0.01))
+    x_min, y_min = tile_for(lat + dlat, lon - dlon, zoom)
+    x_max, y_max = tile_for(lat - dlat, lon + dlon, zoom)
+    return x_min, y_min, x_max, y_max
+
+
+def tile_count(lat: float, lon: float, radius_km: float, zoom: int) -> int:
+    """Number of tiles tiles_covering() would return, without building them."""
+    x_min, y_min, x_max, y_max = _tile_range(lat, lon, radius_km, zoom)
+    return (x_max - x_min + 1) * (y_max - y_min + 1)
+
+
+def tiles_covering(lat: float, lon: float, radius_km: float, zoom: int) -> List[Tile]:
+    """Every tile touching the bounding box of the search circle."""
+    x_min, y_min, x_max, y_max = _tile_range(lat, lon, radius_km, zoom)
+    return [(x, y) for x in range(x_min, x_max + 1) for y in range(y_min, y_max + 1)]
+
+
+# -------------------------------------------------------------------
+# Cache
+# -------------------------------------------------------------------
+
+class OverpassTileCache:
+    """Stale-while-revalidate cache of Overpass elements per tile and category."""
+
+    def __init__(self, cache: TieredCache, zoom: int, fresh_seconds: int, max_age_seconds: int):
+        self.cache = cache
+        self.zoom = zoom
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self._inflight = SingleFlight("overpass")
+        # Background refreshes, keyed like the upstream query
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+        self.tiles_served = 0
+        self.tiles_fetched = 0
+        self.background_refreshes = 0
+        self.around_queries = 0
+
+    async def find(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        tags_by_category: Dict[str, List[str]],
+    ) -> List[dict]:
+        """Elements of the given categories within radius_km of (lat, lon), nearest first.
+
+        Each returned element carries its "distance" in km.
+        """
+        if tile_count(lat, lon, radius_km, self.zoom) > MAX_TILES:
+            return await self._find_around(lat, lon, radius_km, tags_by_category)
+
+        tiles = tiles_covering(lat, lon, radius_km, self.zoom)
+        categories = sorted(tags_by_category)
+
+        entries = await asyncio.gather(*(
+            self.cache.get(self._key(tile, category)) for tile in tiles for category in categories
+        ))
+        cached = dict(zip([(tile, category) for tile in tiles for category in categories], entries))
+
+        now = time.time()
+        missing = [pair for pair, entry in cached.items() if entry is None]
+        stale = [pair for pair, entry in cached.items()
+                 if entry is not None and now - entry["fetched_at"] > self.fresh_seconds]
+        self.tiles_served += len(cached) - len(missing)
+
+        if missing:
+            fetched = await self._fetch(missing, tags_by_category)
+            cached.update(fetched)
+        if stale:
+            self._refresh_in_background(stale, tags_by_category)
+
+        elements = {}
+        for entry in cached.values():
+            for element in entry["elements"] if entry else ():
+                elements.setdefault((element["type"], element["id"]), element)
+        return _rank(lat, lon, radius_km, list(elements.values()))
+
+    def stats(self) -> dict:
+        return {
+            "zoom": self.zoom,
+            "around_queries": self.around_queries,
+            "tiles_served": self.tiles_served,
+            "tiles_fetched": self.tiles_fetched,
+            "background_refreshes": self.background_refreshes,
+            "upstream": self._inflight.stats(),
+        }
+
+    # ------------------------------------------------------------------
+    # Upstream
+    # ------------------------------------------------------------------
+
+    def _key(self, tile: Tile, category: str) -> str:
+        return stable_hash("overpass", self.zoom, tile[0], tile[1], category)
+
+    async def _fetch(
+        self,
+        pairs: List[Tuple[Tile, str]],
+        tags_by_category: Dict[str, List[str]],
+    ) -> Dict[Tuple[Tile, str], Optional[dict]]:
+        """Fetch (tile, category) pairs with one Overpass query; concurrent identical misses share it."""
+        query_key = stable_hash(self.zoom, sorted(pairs))
+        return await self._inflight.do(query_key, lambda: self._fetch_upstream(pairs, tags_by_category))
+
+    async def _fetch_upstream(
+        self,
+        pairs: List[Tuple[Tile, str]],
+        tags_by_category: Dict[str, List[str]],
+    ) -> Dict[Tuple[Tile, str], Optional[dict]]:
+        tiles = {tile for tile, _ in pairs}
+        categories = {category for _, category in pairs}
+        bounds = [tile_bounds(tile, self.zoom) for tile in tiles]
+        bbox = (min(b[0] for b in bounds), min(b[1] for b in bounds),
+                max(b[2] for b in bounds), max(b[3] for b in bounds))
+
+        selectors = [tag for category in sorted(categories) for tag in tags_by_category[category]]
+        ql_query = (
+            f"[out:json][timeout:25][bbox:{bbox[0]:.6f},{bbox[1]:.6f},{bbox[2]:.6f},{bbox[3]:.6f}];"
+            f"({''.join(f'{selector};' for selector in selectors)});"
+            "out center;"
+        )
+
+        try:
+            response = await get_http_client("overpass").get(
+                get_settings().overpass_url, params={"data": ql_query}
+            )
+            response.raise_for_status()
+            elements = response.json().get("elements", [])
+        except Exception as e:
+            print(f"[Overpass Tiles] Query for {len(tiles)} tiles failed: {e}")
+            # Nothing is cached, so the next request retries
+            return {pair: None for pair in pairs}
+
+        # Split the answer back into (tile, category) buckets
+        buckets: Dict[Tuple[Tile, str], List[dict]] = {pair: [] for pair in pairs}
+        matchers = {category: parse_selectors(tags_by_category[category]) for category in categories}
+        for element in elements:
+            element = with_coordinates(element)
+            if element is None:
+                continue
+            tile = tile_for(element["lat"], element["lon"], self.zoom)
+            for category, matcher in matchers.items():
+                if (tile, category) in buckets and matches_selectors(element, matcher):
+                    buckets[(tile, category)].append(element)
+
+        fetched_at = time.time()
+        results = {}
+        for pair, bucket in buckets.items():
+            entry = {"elements": bucket, "fetched_at": fetched_at}
+            await self.cache.set(self._key(*pair), entry, ttl=self.max_age_seconds, namespace=pair[1])
+            results[pair] = entry
+        self.tiles_fetched += len(tiles)
+        print(f"[Overpass Tiles] Fetched {len(tiles)} tiles x {len(categories)} categories, {len(elements)} elements")
+        return results
+
+    async def _find_around(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        tags_by_category: Dict[str, List[str]],
+    ) -> List[dict]:
+        """Uncached `around:` query for searches too wide for the tile cache."""
+        selectors = [tag for category in sorted(tags_by_category) for tag in tags_by_category[category]]
+        around = f"(around:{radius_km * 1000:.0f},{lat:.6f},{lon:.6f})"
+        ql_query = (
+            "[out:json][timeout:25];"
+            f"({''.join(f'{selector}{around};' for selector in selectors)});"
+            "out center;"
+        )
+
+        async def query() -> List[dict]:
+            self.around_queries += 1
+            try:
+                response = await get_http_client("overpass").get(
+                    get_settings().overpass_url, params={"data": ql_query}
+                )
+                response.raise_for_status()
+                elements = response.json().get("elements", [])
+            except Exception as e:
+                print(f"[Overpass Tiles] Around query ({radius_km:.0f} km) failed: {e}")
+                return []
+            return [element for element in map(with_coordinates, elements) if element is not None]
+
+        elements = await self._inflight.do(stable_hash("around", ql_query), query)
+        return _rank(lat, lon, radius_km, elements)
+
+    def _refresh_in_background(self, pairs: List[Tuple[Tile, str]], tags_by_category: Dict[str, List[str]]):
+        query_key = stable_hash(self.zoom, sorted(pairs))
+        if query_key in self._refreshing:
+            return
+        self.background_refreshes += 1
+        task = asyncio.create_task(self._fetch(pairs, tags_by_category))
+        self._refreshing[query_key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(query_key, None))
+
+
+def _rank(lat: float, lon: float, radius_km: float, candidates: List[dict]) -> List[dict]:
+    """Candidates within radius_km, nearest first, each with its "distance"."""
+    # One vectorized haversine pass over every candidate
+    distances = haversine_km(
+        lat, lon, [e["lat"] for e in candidates], [e["lon"] for e in candidates]
+    )
+    results = [
+        {**element, "distance": distance}
+        for element, distance in zip(candidates, distances)
+        if distance <= radius_km
+    ]
+    results.sort(key=lambda element: element["distance"])
+    return results
+
+
+def with_coordinates(element: dict) -> Optional[dict]:
+    """Nodes carry lat/lon; ways and relations get their `out center` point."""
+    if "lat" in element and "lon" in element:
+        return element
+    center = element.get("center")
+    if center:
+        return {**element, "lat": center["lat"], "lon": center["lon"]}
+    return None
+
+
+def parse_selectors(selectors: Iterable[str]) -> Set[Tuple[str, str, str]]:
+    parsed = set()
+    for selector in selectors:
+        match = _TAG_RE.match(selector)
+        if match:
+            parsed.add(match.groups())
+    return parsed
+
+
+def matches_selectors(element: dict, matcher: Set[Tuple[str, str, str]]) -> bool:
+    tags = element.get("tags", {})
+    return any(
+        element.get("type") == osm_type and tags.get(key) == value
+        for osm_type, key, value in matcher
+    )
+
+
+# Global instance
+_tile_cache: Optional[OverpassTileCache] = None
+
+
+def get_overpass_tile_cache() -> OverpassTileCache:
+    """Get or create the Overpass tile cache."""
+    global _tile_cache
+    if _tile_cache is None:
+        settings = get_settings()
+        db_path = Path(settings.overpass_cache_path) if settings.overpass_cache_path else DEFAULT_DB_PATH
+        _tile_cache = OverpassTileCache(
+            cache=TieredCache(
+                name="overpass",
+                db_path=db_path,
+                max_memory_entries=settings.overpass_cache_memory_entries,
+                max_disk_entries=settings.overpass_cache_disk_entries,
+                default_ttl=settings.overpass_tile_max_age_seconds,
+            ),
+            zoom=settings.overpass_tile_zoom,
+            fresh_seconds=settings.overpass_tile_fresh_seconds,
+            max_age_seconds=settings.overpass_tile_max_age_seconds,
+        )
+    return _tile_cache
@@ -0,0 +1,224 @@
+"""
+Pincode Centroid Table for GovConnect
+
+India's ~19k pincodes and their centroids practically never change, so
+the locator resolves them from a local binary table instead of asking
+Nominatim (which allows one request per second). Pincodes missing from
+the table still go to Nominatim.
+
+The repository only ships a development seed (the few pincodes of
+data/service_centers.json); deployments build the full table from the
+India Post directory before starting the API (see below). A seed-sized
+table is reported at startup.
+
+data/pincode_centroids.bin layout (little-endian):
+    header   8s magic, u32 record count, u32 offset of the names block
+    records  u32 pincode, i32 lat*1e6, i32 lon*1e6, u32 name index
+             (16 bytes each, sorted by pincode)
+    names    UTF-8 "District, State" strings separated by newlines
+
+The file is memory-mapped on first use and searched by bisection, so a
+lookup touches a handful of pages and no parsing happens at startup.
+
+Built from the India Post "All India Pincode Directory" CSV (data.gov.in),
+one centroid per pincode averaged over its post offices:
+    python -m app.services.pincode_table build --csv pincode_directory.csv
+Without --csv the development seed is rebuilt from data/service_centers.json.
+    python -m app.services.pincode_table lookup 110001
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+TABLE_PATH = Path(__file__).parent.parent / "data" / "pincode_centroids.bin"
+SERVICE_CENTERS_PATH = Path(__file__).parent.parent / "data" / "service_centers.json"
+
+MAGIC = b"GCPINC01"
+
+# Fewer entries than this means the development seed, not the directory
+FULL_TABLE_MIN_PINCODES = 10000
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<IiiI")
+COORD_SCALE = 1_000_000
+
+# Directory rows outside India's bounding box are data-entry errors
+INDIA_BOUNDS = (6.0, 38.0, 68.0, 98.0)  # lat min, lat max, lon min, lon max
+
+
+class PincodeTable:
+    """Read-only, memory-mapped view of data/pincode_centroids.bin."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._names_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path.name} is not a pincode table")
+        self._names: Optional[List[str]] = None
+
+    def lookup(self, pincode: str) -> Optional[Tuple[float, float, str]]:
+        """(lat, lon, display name) for a 6-digit pincode, or None."""
+        if not (len(pincode) == 6 and pincode.isdigit()):
+            return None
+        target = int(pincode)
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            code = RECORD.unpack_from(self._mmap, HEADER.size + middle * RECORD.size)[0]
+            if code < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count:
+            return None
+
+        code, lat, lon, name_index = RECORD.unpack_from(self._mmap, HEADER.size + low * RECORD.size)
+        if code != target:
+            return None
+        return lat / COORD_SCALE, lon / COORD_SCALE, f"{pincode}, {self._name(name_index)}, India"
+
+    def _name(self, index: int) -> str:
+        if self._names is None:
+            self._names = self._mmap[self._names_offset:].decode("utf-8").split("\n")
+        return self._names[index]
+
+
+# Global instance (None when the table is missing or unreadable)
+_table: Optional[PincodeTable] = None
+_table_loaded = False
+
+
+def get_pincode_table() -> Optional[PincodeTable]:
+    """Get the shared pincode table, mapping the file on first use."""
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        try:
+            _table = PincodeTable(TABLE_PATH)
+            print(f"[Pincode Table] Mapped {_table.count} pincodes")
+            if _table.count < FULL_TABLE_MIN_PINCODES:
+                print("[Pincode Table] This is the development seed; most pincodes will go to Nominatim. "
+                      "Build the full table with: python -m app.services.pincode_table build --csv <directory.csv>")
+        except FileNotFoundError:
+            print(f"[Pincode Table] {TABLE_PATH.name} not found, geocoding pincodes online")
+        except Exception as e:
+            print(f"[Pincode Table] Could not read {TABLE_PATH.name}: {e}")
+    return _table
+
+
+def lookup_pincode(pincode: str) -> Optional[Tuple[float, float, str]]:
+    """(lat, lon, display name) from the bundled table, or None."""
+    table = get_pincode_table()
+    return table.lookup(pincode) if table else None
+
+
+# -------------------------------------------------------------------
+# Building
+# -------------------------------------------------------------------
+
+def _read_directory_csv(path: Path) -> Dict[int, dict]:
+    """Average the post-office coordinates of each pincode in the India Post CSV."""
+    points: Dict[int, list] = defaultdict(list)
+    names: Dict[int, str] = {}
+    lat_min, lat_max, lon_min, lon_max = INDIA_BOUNDS
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            row = {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+            try:
+                pincode = int(row["pincode"])
+                lat, lon = float(row["latitude"]), float(row["longitude"])
+            except (KeyError, ValueError):
+                continue  # "NA" coordinates are common in the directory
+            if not (100000 <= pincode <= 999999 and lat_min <= lat <= lat_max and lon_min <= lon <= lon_max):
+                continue
+            points[pincode].append((lat, lon))
+            district = row.get("district") or row.get("districtname", "")
+            state = row.get("statename") or row.get("state", "")
+            names.setdefault(pincode, ", ".join(part.title() for part in (district, state) if part))
+
+    return {
+        pincode: {
+            "lat": sum(p[0] for p in coords) / len(coords),
+            "lon": sum(p[1] for p in coords) / len(coords),
+            "name": names[pincode],
+        }
+        for pincode, coords in points.items()
+    }
+
+
+def _read_service_centers() -> Dict[int, dict]:
+    """Development seed: centroids of the service centers bundled with the app."""
+    with open(SERVICE_CENTERS_PATH, "r", encoding="utf-8") as f:
+        centers = json.load(f)
+
+    grouped: Dict[int, list] = defaultdict(list)
+    for center in centers:
+        if center.get("pincode", "").isdigit() and center.get("latitude") is not None:
+            grouped[int(center["pincode"])].append(center)
+
+    return {
+        pincode: {
+            "lat": sum(c["latitude"] for c in group) / len(group),
+            "lon": sum(c["longitude"] for c in group) / len(group),
+            "name": group[0]["address"].split(",")[-1].strip(),
+        }
+        for pincode, group in grouped.items()
+    }
+
+
+def write_table(entries: Dict[int, dict], path: Path = TABLE_PATH):
+    """Write entries {pincode: {"lat", "lon", "name"}} in the binary layout (atomically)."""
+    names: List[str] = []
+    name_index: Dict[str, int] = {}
+    records = bytearray()
+
+    for pincode in sorted(entries):
+        entry = entries[pincode]
+        name = entry["name"].replace("\n", " ")
+        if name not in name_index:
+            name_index[name] = len(names)
+            names.append(name)
+        records += RECORD.pack(
+            pincode,
+            round(entry["lat"] * COORD_SCALE),
+            round(entry["lon"] * COORD_SCALE),
+            name_index[name],
+        )
+
+    names_offset = HEADER.size + len(records)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries), names_offset))
+        f.write(records)
+        f.write("\n".join(names).encode("utf-8"))
+    os.replace(tmp_path, path)
+    print(f"[Pincode Table] Wrote {len(entries)} pincodes, {len(names)} names to {path.name}")
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Build or query the pincode centroid table")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build data/pincode_centroids.bin")
+    build.add_argument("--csv", type=Path, help="India Post pincode directory CSV")
+    lookup = subparsers.add_parser("lookup", help="Look up one pincode")
+    lookup.add_argument("pincode")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        entries = _read_directory_csv(args.csv) if args.csv else _read_service_centers()
+        write_table(entries)
+    else:
+        print(lookup_pincode(args.pincode) or "Not in table")
+
+
+if __name__ == "__main__":
+    _main()
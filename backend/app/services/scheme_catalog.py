@@ -0,0 +1,171 @@
+"""
+Scheme Catalog for GovConnect
+
+Loads data/schemes.json once and keeps everything the scheme endpoints
+need in memory:
+- Pre-built Scheme models
+- id -> scheme lookup
+- category -> scheme ids index
+- Pre-rendered AI context text (all schemes and per category)
+- BM25 search index used to shortlist schemes for the AI
+- Compiled eligibility rules from data/scheme_rules.json
+
+The catalog is immutable. When schemes.json changes on disk a new
+catalog is built and swapped in, so requests never see a half-loaded one.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.models.schemas import Scheme
+from app.services.eligibility_rules import RULES_PATH, EligibilityRuleEngine
+from app.services.scheme_retrieval import SchemeSearchIndex
+
+
+SCHEMES_PATH = Path(__file__).parent.parent / "data" / "schemes.json"
+
+
+def render_scheme_context(scheme: Scheme) -> str:
+    """Render one scheme the way SCHEME_SEARCH_PROMPT expects it."""
+    return (
+        f"ID: {scheme.id}\n"
+        f"  Name: {scheme.name}\n"
+        f"  Category: {scheme.category}\n"
+        f"  Description: {scheme.description}\n"
+        f"  Benefit: {scheme.benefit}\n"
+        f"  Eligibility: {', '.join(scheme.eligibility)}\n"
+    )
+
+
+class SchemeCatalog:
+    """In-memory, indexed snapshot of schemes.json."""
+
+    def __init__(self, path: Path = SCHEMES_PATH, rules_path: Path = RULES_PATH):
+        self.path = path
+        self.rules_path = rules_path
+
+        with open(path, "rb") as f:
+            raw_bytes = f.read()
+
+        stat = os.stat(path)
+        self.mtime = stat.st_mtime
+        self.content_hash = hashlib.sha256(raw_bytes).hexdigest()
+
+        raw_schemes = json.loads(raw_bytes.decode("utf-8"))
+
+        self.schemes: List[Scheme] = [
+            Scheme(
+                id=s["id"],
+                name=s["name"],
+                category=s["category"],
+                description=s["description"],
+                benefit=s["benefit"],
+                eligibility=s.get("eligibility", []),
+                documents=s.get("documents", []),
+                relevance_reason=None
+            )
+            for s in raw_schemes
+        ]
+
+        self.by_id: Dict[str, Scheme] = {s.id: s for s in self.schemes}
+
+        self.by_category: Dict[str, List[str]] = {}
+        for s in self.schemes:
+            self.by_category.setdefault(s.category.lower(), []).append(s.id)
+
+        self._context_blocks: Dict[str, str] = {
+            s.id: render_scheme_context(s) for s in self.schemes
+        }
+        self.schemes_context = "\n".join(self._context_blocks[s.id] for s in self.schemes)
+        self._category_context: Dict[str, str] = {
+            category: "\n".join(self._context_blocks[i] for i in ids)
+            for category, ids in self.by_category.items()
+        }
+
+        self.search_index = SchemeSearchIndex(self.schemes)
+
+        self.rules_mtime = _mtime(rules_path)
+        self.rules = EligibilityRuleEngine.from_file(rules_path)
+
+        print(f"[Scheme Catalog] Loaded {len(self.schemes)} schemes from {path.name}")
+
+    def get(self, scheme_id: str) -> Optional[Scheme]:
+        """O(1) lookup of the shared (read-only) Scheme model."""
+        return self.by_id.get(scheme_id)
+
+    def list(self, category: Optional[str] = None) -> List[Scheme]:
+        """
+        Return per-request copies of schemes, optionally filtered by category.
+
+        Copies are shallow and skip validation; callers may set
+        relevance_reason without touching the shared models.
+        """
+        if category and category != "All":
+            ids = self.by_category.get(category.lower(), [])
+            return [self.by_id[i].model_copy() for i in ids]
+        return [s.model_copy() for s in self.schemes]
+
+    def context(self, category: Optional[str] = None) -> str:
+        """Pre-rendered AI context for all schemes or one category."""
+        if category and category != "All":
+            return self._category_context.get(category.lower(), "")
+        return self.schemes_context
+
+    def context_for(self, scheme_ids: List[str]) -> str:
+        """Pre-rendered AI context for an arbitrary subset of schemes."""
+        return "\n".join(self._context_blocks[i] for i in scheme_ids if i in self._context_blocks)
+
+    def is_stale(self) -> bool:
+        """Check whether schemes.json or the rules file changed since this snapshot."""
+        return (
+            _mtime(self.path) not in (None, self.mtime)
+            or _mtime(self.rules_path) != self.rules_mtime
+        )
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+# Global instance
+_catalog: Optional[SchemeCatalog] = None
+
+
+def get_scheme_catalog() -> SchemeCatalog:
+    """Get the current catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = SchemeCatalog()
+    return _catalog
+
+
+def reload_scheme_catalog_if_changed() -> bool:
+    """Swap in a fresh catalog if schemes.json changed. Returns True on reload."""
+    global _catalog
+    current = get_scheme_catalog()
+    if not current.is_stale():
+        return False
+
+    try:
+        _catalog = SchemeCatalog(current.path, current.rules_path)
+        return True
+    except Exception as e:
+        # Keep serving the previous snapshot if the new file is broken,
+        # and don't retry until the file changes again
+        print(f"[Scheme Catalog] Reload failed, keeping previous version: {e}")
+        current.mtime = _mtime(current.path)
+        current.rules_mtime = _mtime(current.rules_path)
+        return False
+
+
+async def watch_scheme_catalog(interval: float = 5.0):
+    """Background task: poll schemes.json and reload on change."""
+    while True:
+        await asyncio.sleep(interval)
+        reload_scheme_catalog_if_changed()
@@ -0,0 +1,176 @@
+"""
+Scheme Retrieval for GovConnect
+
+Local BM25 index over the scheme catalog. Used to:
+1. Shortlist the top-K schemes before the AI search prompt is built,
+   so prompt size stays flat as the catalog grows
+2. Answer searches on its own when the AI service is unavailable
+
+Pure Python, built once per catalog snapshot in well under a millisecond
+for hundreds of schemes.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from app.models.schemas import Scheme
+
+
+# Standard BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# Repeat tokens from strong fields so they weigh more (BM25F-lite)
+FIELD_WEIGHTS = {
+    "name": 3,
+    "category": 2,
+    "eligibility": 2,
+    "description": 1,
+    "benefit": 1,
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our", "per", "that",
+    "the", "their", "this", "to", "was", "we", "with", "who", "you", "your", "am",
+    "want", "need", "looking", "scheme", "schemes", "help", "get", "any", "some",
+}
+
+# Everyday words users type -> vocabulary used in schemes.json
+SYNONYMS = {
+    "kisan": "farmer",
+    "farming": "farmer",
+    "agriculture": "farmer",
+    "crop": "farmer",
+    "hospital": "health",
+    "medical": "health",
+    "treatment": "health",
+    "college": "education",
+    "school": "education",
+    "study": "education",
+    "studying": "education",
+    "poor": "poverty",
+    "bpl": "poverty",
+    "house": "housing",
+    "home": "housing",
+    "job": "employability",
+    "jobless": "employability",
+    "unemployed": "employability",
+    "employment": "employability",
+    "startup": "business",
+    "shop": "business",
+    "entrepreneur": "business",
+    "old": "pension",
+    "elderly": "pension",
+    "senior": "pension",
+    "retirement": "pension",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    """Very small suffix stripper, enough to fold farmer/farmers, loans/loan."""
+    for suffix in ("ing", "ies", "es", "s"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            if suffix == "ies":
+                return token[:-3] + "y"
+            return token[: -len(suffix)]
+    return token
+
+
+def _normalize(word: str) -> Optional[str]:
+    """Map one lowercase word to its index term, or None for stopwords."""
+    if word in STOPWORDS or len(word) < 2:
+        return None
+    return _stem(SYNONYMS.get(word, word))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split, drop stopwords, map synonyms and stem."""
+    return [t for t in map(_normalize, _TOKEN_RE.findall(text.lower())) if t]
+
+
+@dataclass
+class SearchHit:
+    """One ranked scheme with the query words that matched it."""
+    scheme_id: str
+    score: float
+    matched_terms: List[str] = field(default_factory=list)
+
+
+class SchemeSearchIndex:
+    """BM25 inverted index over scheme text fields."""
+
+    def __init__(self, schemes: Iterable[Scheme]):
+        self.order: List[str] = []
+        self.doc_len: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+
+        for scheme in schemes:
+            counts = Counter(self._document_tokens(scheme))
+            self.order.append(scheme.id)
+            self.doc_len[scheme.id] = sum(counts.values())
+            for term, tf in counts.items():
+                self.postings.setdefault(term, {})[scheme.id] = tf
+
+        self.doc_count = len(self.order)
+        self.avg_len = (sum(self.doc_len.values()) / self.doc_count) if self.doc_count else 0.0
+        self.idf: Dict[str, float] = {
+            term: math.log(1 + (self.doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    @staticmethod
+    def _document_tokens(scheme: Scheme) -> List[str]:
+        fields = {
+            "name": scheme.name,
+            "category": scheme.category,
+            "eligibility": " ".join(scheme.eligibility),
+            "description": scheme.description,
+            "benefit": scheme.benefit,
+        }
+        tokens = []
+        for name, text in fields.items():
+            tokens.extend(tokenize(text) * FIELD_WEIGHTS[name])
+        return tokens
+
+    def search(
+        self,
+        query: str,
+        candidate_ids: Optional[List[str]] = None,
+        top_k: Optional[int] = None,
+    ) -> List[SearchHit]:
+        """
+        Rank candidate schemes for a free-text query.
+
+        Every candidate is returned (zero-score ones last, in catalog
+        order) so callers can take a fixed-size shortlist.
+        """
+        candidates = candidate_ids if candidate_ids is not None else self.order
+        hits = {sid: SearchHit(scheme_id=sid, score=0.0) for sid in candidates}
+
+        # index term -> first query word that produced it (for explanations)
+        query_terms: Dict[str, str] = {}
+        for word in _TOKEN_RE.findall(query.lower()):
+            term = _normalize(word)
+            if term:
+                query_terms.setdefault(term, word)
+
+        for term, word in query_terms.items():
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf[term]
+            for sid, tf in docs.items():
+                hit = hits.get(sid)
+                if hit is None:
+                    continue
+                norm = K1 * (1 - B + B * self.doc_len[sid] / self.avg_len)
+                hit.score += idf * tf * (K1 + 1) / (tf + norm)
+                hit.matched_terms.append(word)
+
+        ranked = sorted(hits.values(), key=lambda h: h.score, reverse=True)
+        return ranked[:top_k] if top_k else ranked
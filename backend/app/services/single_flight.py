@@ -0,0 +1,77 @@
+"""
+Single-Flight Request Coalescing for GovConnect
+
+When several coroutines ask for the same key at the same time, only the
+first one runs the underlying call; the rest wait for its result.
+Each waiter receives its own copy, so callers can mutate results freely.
+
+The shared call runs as an independent task: one waiter disconnecting
+does not cancel it for the others. It is cancelled only when every
+waiter has gone away.
+"""
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """One in-flight upstream call and the coroutines waiting on it."""
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+        self.total_waiters = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() once per key among concurrent callers and share the result."""
+        call = self._calls.get(key)
+
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.upstream_calls += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        call.total_waiters += 1
+
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is left to use the result
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+
+        call.waiters -= 1
+
+        if call.total_waiters > 1:
+            return copy.deepcopy(result)
+        return result
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        """Counters for health reporting."""
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
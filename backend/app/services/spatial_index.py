@@ -0,0 +1,136 @@
+"""
+Spatial Index for GovConnect
+
+A grid index over points (cells of SPATIAL_CELL_DEGREES, ~5.5 km) with
+radius and k-nearest queries. Candidate points come from the cells
+around the query, and their distances are computed in one vectorized
+haversine pass with NumPy (in requirements.txt; a pure-Python loop is
+kept for installs without it).
+
+The service locator keeps one index over data/service_centers.json,
+built at startup, so bundled centers are found without any network call.
+OSM elements are not put in this index: the Overpass tile cache is
+already a grid over them (only the tiles around the search are read)
+and ranks its candidates with the same haversine_km.
+"""
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# NumPy gives vectorized distances; fall back to plain Python without it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+SERVICE_CENTERS_PATH = Path(__file__).parent.parent / "data" / "service_centers.json"
+
+EARTH_RADIUS_KM = 6371.0
+SPATIAL_CELL_DEGREES = 0.05
+KM_PER_DEGREE = 111.32
+
+
+def haversine_km(lat: float, lon: float, lats: Sequence[float], lons: Sequence[float]) -> List[float]:
+    """Distances in km from (lat, lon) to every (lats[i], lons[i])."""
+    if not len(lats):
+        return []
+    if NUMPY_AVAILABLE:
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        lat2, lon2 = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lons, dtype=float))
+        a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))).tolist()
+
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    cos_lat1 = math.cos(lat1)
+    distances = []
+    for other_lat, other_lon in zip(lats, lons):
+        lat2, lon2 = math.radians(other_lat), math.radians(other_lon)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a)))
+    return distances
+
+
+class SpatialIndex:
+    """Grid index over items carrying "lat" and "lon"."""
+
+    def __init__(self, items: List[dict], cell_degrees: float = SPATIAL_CELL_DEGREES):
+        self.items = items
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for index, item in enumerate(items):
+            self._cells.setdefault(self._cell(item["lat"], item["lon"]), []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[dict, float]]:
+        """(item, distance km) for every item within radius_km, nearest first."""
+        candidates = self._candidates(lat, lon, radius_km)
+        distances = haversine_km(
+            lat, lon,
+            [self.items[i]["lat"] for i in candidates],
+            [self.items[i]["lon"] for i in candidates],
+        )
+        hits = [(self.items[i], d) for i, d in zip(candidates, distances) if d <= radius_km]
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+    def nearest(self, lat: float, lon: float, k: int, max_radius_km: float = 50.0) -> List[Tuple[dict, float]]:
+        """The k nearest items within max_radius_km, nearest first."""
+        # Everything within r is exact, so once r holds k items those are the k nearest
+        radius_km = self.cell_degrees * KM_PER_DEGREE
+        while radius_km < max_radius_km:
+            hits = self.within(lat, lon, radius_km)
+            if len(hits) >= k:
+                return hits[:k]
+            radius_km *= 2
+        return self.within(lat, lon, max_radius_km)[:k]
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> List[int]:
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        row_min, col_min = self._cell(lat - dlat, lon - dlon)
+        row_max, col_max = self._cell(lat + dlat, lon + dlon)
+
+        # A huge radius over a sparse grid: walking the occupied cells is cheaper
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cells):
+            return [
+                i for (row, col), members in self._cells.items()
+                if row_min <= row <= row_max and col_min <= col <= col_max
+                for i in members
+            ]
+        candidates = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                candidates.extend(self._cells.get((row, col), ()))
+        return candidates
+
+
+# Global instance
+_service_center_index: Optional[SpatialIndex] = None
+
+
+def get_service_center_index() -> SpatialIndex:
+    """Index over data/service_centers.json (built once per worker)."""
+    global _service_center_index
+    if _service_center_index is None:
+        try:
+            with open(SERVICE_CENTERS_PATH, "r", encoding="utf-8") as f:
+                centers = json.load(f)
+        except Exception as e:
+            print(f"[Spatial Index] Could not read {SERVICE_CENTERS_PATH.name}: {e}")
+            centers = []
+        items = [
+            {**center, "lat": center["latitude"], "lon": center["longitude"]}
+            for center in centers
+            if center.get("latitude") is not None and center.get("longitude") is not None
+        ]
+        _service_center_index = SpatialIndex(items)
+        print(f"[Spatial Index] Indexed {len(items)} service centers (NumPy: {'on' if NUMPY_AVAILABLE else 'off'})")
+    return _service_center_index
@@ -0,0 +1,72 @@
+"""
+Translation Cache for GovConnect
+
+Stores finished translations (English -> target language) in a
+TieredCache: a bounded in-memory LRU per worker in front of a SQLite
+file shared by every worker on the host, so a translation produced by
+one worker is a hit for all of them and survives restarts.
+
+Keys are BLAKE2 hashes of (source language, target language, content),
+identical across processes unlike Python's randomized hash().
+
+Invalidate from the command line:
+    python -m app.services.translation_cache --clear [target_language]
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.services.cache import TieredCache, stable_hash
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "translation_cache.sqlite3"
+
+TRANSLATION_TTL = 30 * 24 * 3600
+
+
+def make_translation_key(content: Any, target_language: str, source_language: str = "en") -> str:
+    """Stable key for one piece of content (string or JSON structure)."""
+    return stable_hash("translation", source_language, target_language, content)
+
+
+# Global cache instance
+_translation_cache: Optional[TieredCache] = None
+
+
+def get_translation_cache() -> Optional[TieredCache]:
+    """Get or create the translation cache. Returns None when disabled."""
+    global _translation_cache
+    settings = get_settings()
+    if not settings.translation_cache_enabled:
+        return None
+
+    if _translation_cache is None:
+        db_path = Path(settings.translation_cache_path) if settings.translation_cache_path else DEFAULT_DB_PATH
+        _translation_cache = TieredCache(
+            name="translation",
+            db_path=db_path,
+            max_memory_entries=settings.translation_cache_memory_entries,
+            max_disk_entries=settings.translation_cache_disk_entries,
+            default_ttl=TRANSLATION_TTL,
+        )
+    return _translation_cache
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Clear the translation cache")
+    parser.add_argument("--clear", nargs="?", const="*", metavar="LANGUAGE", required=True,
+                        help="Clear all entries, or only one target language")
+    args = parser.parse_args()
+
+    cache = get_translation_cache()
+    if cache is None:
+        print("[Translation Cache] Caching is disabled (TRANSLATION_CACHE_ENABLED=false)")
+        return
+
+    asyncio.run(cache.invalidate(None if args.clear == "*" else args.clear))
+
+
+if __name__ == "__main__":
+    _main()
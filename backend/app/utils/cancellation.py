@@ -0,0 +1,80 @@
+"""
+Request cancellation on client disconnect.
+
+Starlette keeps running a handler after the client has gone away, so an
+abandoned request would still hold an LLM slot until Groq answers. This
+ASGI middleware watches the connection and cancels the handler task as
+soon as the client disconnects, which aborts any in-flight AI call.
+"""
+import asyncio
+
+
+class CancelOnDisconnectMiddleware:
+    """Cancel the request handler when the HTTP client disconnects."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # After the body, the only message left is http.disconnect
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        response_done = False
+        watcher = None
+
+        async def send_wrapper(message):
+            nonlocal response_done
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_done = True
+            await send(message)
+
+        async def watch_disconnect():
+            # Relay what the server sends next; it only reports
+            # http.disconnect once the peer has left.
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not response_done and not app_task.done():
+                        print(f"[Request] Client disconnected, cancelling {scope.get('path')}")
+                        app_task.cancel()
+                    try:
+                        queue.put_nowait(message)
+                    except asyncio.QueueFull:
+                        pass
+                    return
+                await queue.put(message)
+
+        def start_watcher():
+            nonlocal watcher
+            if watcher is None:
+                watcher = asyncio.ensure_future(watch_disconnect())
+
+        async def app_receive():
+            # The body is read only when the app asks for it, so uploads
+            # keep the server's backpressure; watching starts after the last chunk.
+            if watcher is not None:
+                return await queue.get()
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                start_watcher()
+            return message
+
+        app_task = asyncio.ensure_future(self.app(scope, app_receive, send_wrapper))
+
+        headers = dict(scope.get("headers", []))
+        if headers.get(b"content-length", b"0") == b"0" and b"transfer-encoding" not in headers:
+            # No body to wait for (GET and friends): watch from the start
+            start_watcher()
+
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            # Re-raise if we were cancelled from outside, not by the watcher
+            if watcher is None or not watcher.done():
+                raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
@@ -327,11 +327,31 @@ Respond with ONLY this JSON:
 }
 """
 
-TRANSLATE_FROM_EN = """
-Translate the following JSON VALUES to {{language}}.
-Do NOT translate keys, only values.
-Return the same JSON structure with translated values.
+TRANSLATE_FIELDS_TO_EN = """
+Translate each value in the following JSON object to English.
+Keep the keys unchanged. Preserve the meaning exactly.
 
 JSON:
 {{json}}
+
+Respond with ONLY this JSON:
+{
+  "translations": {
+    "<key>": "<translated value in English>"
+  }
+}
+"""
+
+TRANSLATE_BATCH_FROM_EN = """
+Translate each numbered English text below to {{language}}.
+Each text is written as a JSON string. Translate them independently.
+Keep numbers, amounts (₹), dates, URLs and acronyms unchanged.
+
+Texts:
+{{texts}}
+
+Respond with ONLY this JSON, one translation per text, in the same order:
+{
+  "translations": ["<translation of text 1>", "<translation of text 2>"]
+}
 """
@@ -4,10 +4,40 @@ Uses Groq AI for translation.
 
 IMPORTANT: This module provides graceful fallback.
 If translation fails, original content is returned.
+
+Short, well-known values (state names, social categories, common
+occupations) are resolved from data/local_terms.json without any AI call.
+Fixed English strings going out are served from the offline glossary
+(data/glossary/<lang>.json) or the shared translation cache; only
+strings never seen before are sent to the AI, in small concurrent batches.
 """
-from app.utils.prompts import TRANSLATE_TO_EN, TRANSLATE_FROM_EN
+from app.utils.prompts import TRANSLATE_TO_EN, TRANSLATE_BATCH_FROM_EN, TRANSLATE_FIELDS_TO_EN
 from app.ai.base import get_ai_client
+from app.config import get_settings
+from app.services.glossary import get_glossary, needs_translation
+from app.services.translation_cache import get_translation_cache, make_translation_key
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
 import json
+import re
+import unicodedata
+
+
+LOCAL_TERMS_PATH = Path(__file__).parent.parent / "data" / "local_terms.json"
+
+# Values under these keys are identifiers or machine-readable, never translated
+NON_TRANSLATABLE_KEYS = {
+    "id", "scheme_id", "schemeId", "form_id", "formId", "file",
+    "link", "url", "href", "website", "email", "phone", "pincode", "priority",
+}
+
+# URLs, e-mail addresses and paths are kept as-is
+_LITERAL_RE = re.compile(r"^\s*(https?://|www\.|/|[\w.+-]+@[\w-]+\.)\S*\s*$")
+
+# Keys a to_english reply may put the translation under
+TO_ENGLISH_KEYS = ("translation", "text", "english", "result", "translated_text")
 
 
 async def to_english(text: str, lang: str) -> str:
@@ -25,6 +55,10 @@ async def to_english(text: str, lang: str) -> str:
     if not text or lang == "en":
         return text or ""
 
+    local = _local_to_english(text, lang)
+    if local is not None:
+        return local
+
     ai_client = get_ai_client()
     if not ai_client.is_configured:
         print("[Translator] AI not configured, returning original text")
@@ -32,11 +66,14 @@ async def to_english(text: str, lang: str) -> str:
 
     try:
         prompt = TRANSLATE_TO_EN.replace("{{text}}", text)
-        result = await ai_client.generate(prompt)
+        result = await ai_client.generate(
+            prompt, cache_namespace="translation",
+            validate=lambda r: any(r.get(key) for key in TO_ENGLISH_KEYS)
+        )
         
         if result and isinstance(result, dict):
             # Try various keys that might contain the translation
-            for key in ["translation", "text", "english", "result", "translated_text"]:
+            for key in TO_ENGLISH_KEYS:
                 if key in result and result[key]:
                     return str(result[key])
         
@@ -48,10 +85,74 @@ async def to_english(text: str, lang: str) -> str:
         return text  # Fallback to original
 
 
+async def fields_to_english(fields: Dict[str, str], lang: str) -> Dict[str, str]:
+    """
+    Translate several short fields to English with at most ONE AI call.
+    
+    Values found in the local dictionary (or already in Latin script)
+    are resolved instantly; the rest go out in a single batched prompt.
+    
+    Args:
+        fields: Mapping of field name -> text (any language)
+        lang: Language code (en, te, hi, etc.)
+    
+    Returns:
+        Mapping with the same keys and English values
+        (originals are kept for anything that fails)
+    """
+    result = {key: value or "" for key, value in fields.items()}
+    if lang == "en":
+        return result
+
+    pending = {}
+    for key, value in result.items():
+        if not value:
+            continue
+        # Profile values in Latin script (e.g. "Telangana" typed in Telugu mode)
+        # are kept. Only here: romanized free text ("kisan yojana") needs the AI.
+        local = value.strip() if value.strip().isascii() else _local_to_english(value, lang)
+        if local is not None:
+            result[key] = local
+        else:
+            pending[key] = value
+
+    if not pending:
+        return result
+
+    ai_client = get_ai_client()
+    if not ai_client.is_configured:
+        print("[Translator] AI not configured, returning original fields")
+        return result
+
+    try:
+        prompt = TRANSLATE_FIELDS_TO_EN.replace("{{json}}", json.dumps(pending, ensure_ascii=False))
+        response = await ai_client.generate(
+            prompt, cache_namespace="translation",
+            validate=lambda r: isinstance(r.get("translations", r), dict)
+        )
+        
+        translations = response.get("translations", response) if isinstance(response, dict) else None
+        if isinstance(translations, dict):
+            for key in pending:
+                value = translations.get(key)
+                if isinstance(value, str) and value.strip():
+                    result[key] = value
+        else:
+            print(f"[Translator] Unexpected response format: {response}")
+    
+    except Exception as e:
+        print(f"[Translator] fields_to_english error: {e}")
+
+    return result
+
+
 async def from_english(data: dict, lang: str) -> dict:
     """
     Translate dict values from English to target language.
     
+    Strings (or sentences within them) found in the language glossary
+    are translated locally; only the remaining text goes to the AI.
+    
     Args:
         data: Dictionary with English values
         lang: Target language code (en, te, hi, etc.)
@@ -63,27 +164,208 @@ async def from_english(data: dict, lang: str) -> dict:
     if not data or lang == "en":
         return data or {}
 
+    return await translate_value(data, lang)
+
+
+async def translate_value(value: Any, lang: str) -> Any:
+    """Translate every string inside a str/dict/list from English (see translate_value_complete)."""
+    translated, _ = await translate_value_complete(value, lang)
+    return translated
+
+
+async def translate_value_complete(value: Any, lang: str) -> Tuple[Any, bool]:
+    """
+    Translate every string inside a str/dict/list from English.
+    
+    1. Walk the structure and collect translatable leaf strings
+       (ids, links and similar keys are skipped)
+    2. Serve glossary hits locally, per string or per sentence
+    3. Look the remaining unique strings up in the translation cache
+    4. Send only the misses to the AI in size-bounded, concurrent chunks
+    5. Rebuild the original structure
+    
+    Keys and non-string values are kept. Untranslated strings fall
+    back to the English original.
+
+    Returns (translated value, complete); complete is False when any
+    string fell back to English, so the result must not be cached.
+    """
+    if lang == "en":
+        return value, True
+
+    glossary = get_glossary(lang)
+    residue: Dict[str, None] = {}  # insertion-ordered set of texts for the AI
+
+    def plan(text: str):
+        if not needs_translation(text) or _LITERAL_RE.match(text):
+            return text
+        if glossary is not None:
+            hit = glossary.lookup(text)
+            if hit is not None:
+                return hit
+            parts = glossary.segment(text)
+            if any(dst is not None and dst != piece for piece, dst in parts):
+                if all(dst is not None for _, dst in parts):
+                    return "".join(dst for _, dst in parts)
+                # Known sentences stay local, only the rest goes to the AI
+                pieces = []
+                for piece, dst in parts:
+                    if dst is None:
+                        residue[piece] = None
+                        pieces.append(_Residue(piece))
+                    else:
+                        pieces.append(dst)
+                return _Pending(pieces)
+        residue[text] = None
+        return _Pending([_Residue(text)])
+
+    planned = _walk(value, plan)
+    if not residue:
+        return planned, True
+
+    translations = await translate_strings(list(residue), lang)
+    complete = all(text in translations for text in residue)
+
+    def assemble(item):
+        if not isinstance(item, _Pending):
+            return item
+        return "".join(
+            translations.get(p.text, p.text) if isinstance(p, _Residue) else p
+            for p in item.pieces
+        )
+
+    return _walk(planned, assemble), complete
+
+
+async def translate_strings(texts: List[str], lang: str) -> Dict[str, str]:
+    """
+    Translate unique English strings, using the per-string cache first.
+    
+    Returns {text: translation} for every string that could be
+    translated; callers keep the original for anything missing.
+    """
+    cache = get_translation_cache()
+    translations: Dict[str, str] = {}
+    keys = {text: make_translation_key(text, lang) for text in texts}
+
+    misses = texts
+    if cache is not None:
+        cached = await asyncio.gather(*(cache.get(keys[t]) for t in texts))
+        misses = []
+        for text, hit in zip(texts, cached):
+            if isinstance(hit, str):
+                translations[text] = hit
+            else:
+                misses.append(text)
+
+    if not misses:
+        return translations
+
     ai_client = get_ai_client()
     if not ai_client.is_configured:
         print("[Translator] AI not configured, returning original data")
-        return data
+        return translations
+
+    chunks = _chunk(misses)
+    results = await asyncio.gather(*(_translate_chunk(chunk, lang) for chunk in chunks))
+
+    for chunk_result in results:
+        translations.update(chunk_result)
+        if cache is not None:
+            for text, translated in chunk_result.items():
+                await cache.set(keys[text], translated, namespace=lang)
 
+    return translations
+
+
+def _chunk(texts: List[str]) -> List[List[str]]:
+    """Split texts into chunks bounded by item count and total characters."""
+    settings = get_settings()
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        if current and (
+            len(current) >= settings.translation_batch_max_items
+            or size + len(text) > settings.translation_batch_max_chars
+        ):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _translate_chunk(texts: List[str], lang: str) -> Dict[str, str]:
+    """
+    Translate one chunk as a numbered list. Results are matched by
+    position, so the model never has to echo keys back; a chunk whose
+    answer has the wrong length is split in half and retried.
+    """
     try:
-        prompt = TRANSLATE_FROM_EN \
+        numbered = "\n".join(f"{i}. {json.dumps(t, ensure_ascii=False)}" for i, t in enumerate(texts, 1))
+        prompt = TRANSLATE_BATCH_FROM_EN \
             .replace("{{language}}", _get_language_name(lang)) \
-            .replace("{{json}}", json.dumps(data, ensure_ascii=False))
+            .replace("{{texts}}", numbered)
+
+        result = await get_ai_client().generate(
+            prompt, cache_namespace="translation",
+            validate=lambda r: isinstance(r.get("translations"), list) and len(r["translations"]) == len(texts)
+        )
+        translated = result.get("translations") if isinstance(result, dict) else None
+
+        if isinstance(translated, list) and len(translated) == len(texts):
+            return {
+                text: value.strip()
+                for text, value in zip(texts, translated)
+                if isinstance(value, str) and value.strip()
+            }
+
+        print(f"[Translator] Chunk of {len(texts)} came back malformed")
 
-        result = await ai_client.generate(prompt)
-        
-        if result and isinstance(result, dict):
-            return result
-        
-        print(f"[Translator] Unexpected response format: {result}")
-        return data  # Fallback
-        
     except Exception as e:
         print(f"[Translator] from_english error: {e}")
-        return data  # Fallback to original
+        return {}  # Fallback to original
+
+    if len(texts) == 1:
+        return {}
+    middle = len(texts) // 2
+    halves = await asyncio.gather(
+        _translate_chunk(texts[:middle], lang),
+        _translate_chunk(texts[middle:], lang),
+    )
+    return {**halves[0], **halves[1]}
+
+
+class _Residue:
+    """Placeholder for a piece of text waiting on the AI."""
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Pending:
+    """A string assembled from glossary pieces and _Residue placeholders."""
+    __slots__ = ("pieces",)
+
+    def __init__(self, pieces: list):
+        self.pieces = pieces
+
+
+def _walk(value: Any, fn: Callable, key: Optional[str] = None) -> Any:
+    """Rebuild a dict/list structure with fn applied to every translatable leaf string."""
+    if key in NON_TRANSLATABLE_KEYS:
+        return value
+    if isinstance(value, (str, _Pending)):
+        return fn(value)
+    if isinstance(value, list):
+        return [_walk(v, fn, key) for v in value]
+    if isinstance(value, dict):
+        return {k: _walk(v, fn, k) for k, v in value.items()}
+    return value
 
 
 def _get_language_name(lang_code: str) -> str:
@@ -95,7 +377,38 @@ def _get_language_name(lang_code: str) -> str:
         "ta": "Tamil",
         "kn": "Kannada",
         "bn": "Bengali",
+        "ml": "Malayalam",
         "mr": "Marathi",
-        "gu": "Gujarati"
+        "gu": "Gujarati",
+        "pa": "Punjabi"
     }
     return names.get(lang_code, lang_code)
+
+
+@lru_cache(maxsize=1)
+def _load_local_terms() -> Dict[str, Dict[str, str]]:
+    """Load data/local_terms.json into {lang: {normalized term: English}}."""
+    try:
+        with open(LOCAL_TERMS_PATH, "r", encoding="utf-8") as f:
+            sections = json.load(f)
+    except Exception as e:
+        print(f"[Translator] Local terms unavailable: {e}")
+        return {}
+
+    terms: Dict[str, Dict[str, str]] = {}
+    for by_lang in sections.values():
+        for lang, entries in by_lang.items():
+            for term, english in entries.items():
+                terms.setdefault(lang, {})[_normalize_term(term)] = english
+    return terms
+
+
+def _normalize_term(text: str) -> str:
+    """Normalize for dictionary lookup: NFC, no spaces or zero-width joiners."""
+    text = unicodedata.normalize("NFC", text).lower()
+    return "".join(ch for ch in text if not ch.isspace() and ch not in "\u200c\u200d.")
+
+
+def _local_to_english(text: str, lang: str) -> Optional[str]:
+    """Resolve text without AI when possible, else None."""
+    return _load_local_terms().get(lang, {}).get(_normalize_term(text.strip()))
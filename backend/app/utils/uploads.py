@@ -0,0 +1,169 @@
+"""
+Streaming upload handling for GovConnect.
+
+Uploaded forms can be large, and several can arrive at once, so they are
+never held in memory as a whole:
+- UploadSizeLimitMiddleware answers an oversized body with 413, from its
+  Content-Length or as soon as the streamed body crosses the limit,
+  before the multipart parser buffers it
+- spool_upload() copies the upload in chunks, hashing as it goes (the
+  SHA-256 is the OCR cache key, so a cached document skips OCR without
+  being read again), and keeps small files in memory while larger ones
+  go to a temporary file that the extractors memory-map
+"""
+import hashlib
+import os
+import tempfile
+from typing import Optional, Union
+
+from fastapi import HTTPException, UploadFile
+
+
+CHUNK_SIZE = 1024 * 1024
+
+# Multipart boundaries and the other form fields come on top of the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Reject request bodies above max_bytes on the given path prefixes."""
+
+    def __init__(self, app, max_bytes: int, paths: tuple):
+        self.app = app
+        self.max_bytes = max_bytes + MULTIPART_OVERHEAD
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if rejected:
+                return  # The 413 has been sent; drop whatever the app answers
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        async def limited_receive():
+            # Chunked bodies: stop once the limit is crossed. The 413 is sent
+            # here, and the app sees a disconnect so it stops reading.
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    print(f"[Uploads] Streamed body crossed {self.max_bytes} bytes")
+                    if not response_started:
+                        await self._reject(send)
+                    rejected = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # The app failing on the cut-off body (ClientDisconnect) is expected
+            if not rejected:
+                raise
+
+    async def _reject(self, send):
+        print(f"[Uploads] Rejected body larger than {self.max_bytes} bytes")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"File too large"}'})
+
+
+class SpooledUpload:
+    """
+    An uploaded file copied out of the request.
+
+    `source` is what the document analyzer takes: the bytes for a small
+    file, or the path of the spool file for a large one.
+    """
+
+    def __init__(self, sha256: str, size: int, data: Optional[bytes] = None, path: Optional[str] = None):
+        self.sha256 = sha256
+        self.size = size
+        self.data = data
+        self.path = path
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        return self.data if self.data is not None else self.path
+
+    def close(self):
+        """Delete the spool file, if there is one."""
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+async def spool_upload(file: UploadFile, max_bytes: int, memory_bytes: int) -> SpooledUpload:
+    """
+    Copy an upload in chunks, hashing it and enforcing max_bytes.
+
+    Files up to memory_bytes stay in memory; larger ones are written to a
+    temporary file. Raises HTTPException 413 (too large) or 400 (empty).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+    spool = None
+
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB"
+                )
+            digest.update(chunk)
+
+            if spool is None and size > memory_bytes:
+                spool = tempfile.NamedTemporaryFile(prefix="govconnect-upload-", delete=False)
+                spool.write(buffer)
+                buffer = bytearray()
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                buffer.extend(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+        raise
+    finally:
+        # Release Starlette's own copy of the upload right away
+        await file.close()
+
+    if size == 0:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+    if spool is None:
+        return SpooledUpload(digest.hexdigest(), size, data=bytes(buffer))
+    spool.close()
+    return SpooledUpload(digest.hexdigest(), size, path=spool.name)
@@ -18,6 +18,16 @@ interface FieldGuidance {
     example?: string
 }
 
+interface AnalysisJob {
+    job_id: string
+    status: 'queued' | 'running' | 'done' | 'failed'
+    stage: string
+    progress: number
+    message: string | null
+    result: AnalysisResult | null
+    error: string | null
+}
+
 interface AnalysisResult {
     analysis_method: string
     guidance: {
@@ -34,6 +44,8 @@ export default function CustomUploadPage() {
     const [purpose, setPurpose] = useState('')
     const [isAnalyzing, setIsAnalyzing] = useState(false)
     const [analysis, setAnalysis] = useState<AnalysisResult | null>(null)
+    const [progress, setProgress] = useState<{ percent: number, message: string } | null>(null)
+    const [error, setError] = useState<string | null>(null)
 
     const handleFileUpload = (e: React.ChangeEvent<HTMLInputElement>) => {
         if (e.target.files && e.target.files[0]) {
@@ -52,23 +64,46 @@ export default function CustomUploadPage() {
 
         setIsAnalyzing(true)
         setAnalysis(null)
+        setError(null)
+        setProgress({ percent: 0, message: 'Uploading...' })
 
         try {
             const formData = new FormData()
             formData.append('file', uploadedFile)
             formData.append('purpose', purpose)
 
+            // The upload returns a job id; the analysis runs in the background
             const res = await fetch(`${getApiBaseUrl()}/api/forms/upload`, {
                 method: 'POST',
                 body: formData
             })
-
             const data = await res.json()
-            setAnalysis(data)
+            if (!res.ok) throw new Error(data.detail || `Upload failed (${res.status})`)
+
+            const job = await pollAnalysisJob(data.job_id)
+            if (job.status === 'failed' || !job.result) {
+                throw new Error(job.error || 'Analysis failed')
+            }
+            setAnalysis(job.result)
         } catch (error) {
             console.error('Failed to analyze form:', error)
+            setError(error instanceof Error ? error.message : 'Failed to analyze form')
         } finally {
             setIsAnalyzing(false)
+            setProgress(null)
+        }
+    }
+
+    const pollAnalysisJob = async (jobId: string): Promise<AnalysisJob> => {
+        while (true) {
+            const res = await fetch(`${getApiBaseUrl()}/api/forms/jobs/${jobId}`)
+            if (!res.ok) throw new Error(`Could not fetch analysis status (${res.status})`)
+
+            const job: AnalysisJob = await res.json()
+            setProgress({ percent: job.progress, message: job.message || 'Analyzing...' })
+            if (job.status === 'done' || job.status === 'failed') return job
+
+            await new Promise((resolve) => setTimeout(resolve, 1000))
         }
     }
 
@@ -155,6 +190,22 @@ export default function CustomUploadPage() {
                                             </>
                                         ) : 'Analyze & Get Guidance'}
                                     </Button>
+
+                                    {progress && (
+                                        <div className="space-y-1">
+                                            <div className="h-2 w-full rounded-full bg-muted overflow-hidden">
+                                                <div
+                                                    className="h-full bg-primary transition-all duration-500"
+                                                    style={{ width: `${progress.percent}%` }}
+                                                />
+                                            </div>
+                                            <p className="text-xs text-muted-foreground">{progress.message}</p>
+                                        </div>
+                                    )}
+
+                                    {error && (
+                                        <p className="text-sm text-destructive">{error}</p>
+                                    )}
                                 </CardContent>
                             </Card>
 
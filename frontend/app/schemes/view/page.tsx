@@ -45,13 +45,10 @@ function SchemeDetailContent() {
         return
       }
       try {
-        // Since backend doesn't support GET /api/schemes/{id}, we fetch all and filter
-        const data = await postToBackend<{ schemes: any[] }>('/api/schemes', {
-          query: '',
-          language: language
-        })
-        const found = data.schemes.find((s: any) => s.id === schemeId)
-        setScheme(found || null)
+        const data = await fetchFromBackend<any>(
+          `/api/schemes/${encodeURIComponent(schemeId)}?language=${encodeURIComponent(language)}`
+        )
+        setScheme(data || null)
       } catch (error) {
         console.error('Failed to fetch scheme:', error)
       } finally {